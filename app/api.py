@@ -1,17 +1,43 @@
-from fastapi import Depends, FastAPI, HTTPException
+import asyncio
+import json
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import quote
+
+from fastapi import Body, Depends, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import ValidationError
 
+from app.concurrency import StageExecutor
 from app.config import Settings, get_settings
+from app.lifecycle import ServiceState, warmup
+from app.metrics import REGISTRY, RequestTimings, span, track_request
 from app.models.schemas import (
+    CacheStats,
+    EmbeddingStats,
     GeneralInfoRequest,
     GeneralInfoResponse,
     HealthResponse,
+    KitchenTicket,
+    LLMBackendStats,
+    LLMSchedulerStats,
     MenuAnswer,
     MenuQuery,
+    OrderBatchResponse,
+    OrderBatchResult,
+    OrderJournalStats,
     OrderRequest,
     OrderResponse,
+    ReadinessResponse,
     ReservationRequest,
+    ReservationBatchResponse,
+    ReservationBatchResult,
     ReservationResponse,
+    SlotAvailability,
+    TTSCacheStats,
+    TTSPoolStats,
     VoiceRequest,
     VoiceResponse,
 )
@@ -22,37 +48,159 @@ from app.orchestration.agents import (
     OrderAgent,
     ReservationAgent,
 )
-from app.orchestration.llm import get_chat_model
+from app.orchestration.classifier import CentroidIntentClassifier, load_examples
+from app.orchestration.client import ModelOverloadedError
+from app.orchestration.llm import build_llm, count_llm_calls
+from app.orchestration.orders import OrderJournal
+from app.orchestration.providers import ModelRouter
+from app.orchestration.reservations import ReservationStore
 from app.orchestration.router import IntentRouter
-from app.rag.ingest import load_retriever
+from app.orchestration.scheduler import LLMScheduler
+from app.rag.cache import AnswerCache, normalize_question
+from app.rag.context import ContextBuilder
+from app.rag.embeddings import build_embeddings, loaded_embedding_service
+from app.rag.ingest import load_lexical_index, load_retriever, store_version
+from app.speech.cache import CachedTTS
 from app.speech.factory import build_stt, build_tts
-from app.speech.stt import decode_audio
-from app.speech.tts import encode_audio
+from app.speech.pool import SynthesisPool
+from app.speech.stt import decode_audio, wav_from_l16
+from app.speech.tts import SentenceChunker, convert_audio, encode_audio
+from app.speech.vad import SpeechSegmenter
+
+state = ServiceState()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Bootstrap and warm every service before the worker accepts traffic, so no
+    request pays for model loading. Runs in a thread to keep the loop free.
+    """
+    settings = get_settings()
+    await asyncio.to_thread(state.ensure, lambda s: bootstrap(settings, s))
+    if settings.api.warmup:
+        await asyncio.to_thread(warmup, state, settings.speech.sample_rate)
+    else:
+        state.warmed = True
+    yield
+    if state.services:
+        # Worker processes and the journal writer do not outlive the app;
+        # the next startup rebuilds.
+        _, _, order_agent, _, _, tts, _ = state.services
+        pool = getattr(tts, "backend", tts)
+        if isinstance(pool, SynthesisPool):
+            pool.close()
+        order_agent.journal.close()
+        state.reset()
+    if hasattr(get_executor, "_executor"):
+        get_executor._executor.shutdown(wait=False)
+        del get_executor._executor
+
 
-app = FastAPI(title="Voice-Enabled GenAI Restaurant Assistant")
+app = FastAPI(title="Voice-Enabled GenAI Restaurant Assistant", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Transcript", "X-Reply-Text", "X-Intent", "X-LLM-Calls"],
 )
 
 
-def bootstrap(settings: Settings):
+@app.exception_handler(ModelOverloadedError)
+async def model_overloaded(request: Request, exc: ModelOverloadedError):
+    # Shed load quickly; clients and load balancers retry after the hint.
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def build_answer_cache(settings: Settings, retriever) -> Optional[AnswerCache]:
+    if settings.rag.answer_cache_size <= 0:
+        return None
+    embeddings = getattr(retriever, "embeddings", None)
+    return AnswerCache(
+        max_entries=settings.rag.answer_cache_size,
+        ttl_seconds=settings.rag.answer_cache_ttl_seconds,
+        similarity_threshold=settings.rag.answer_cache_similarity,
+        embed_fn=embeddings.embed_query if embeddings else None,
+        version_fn=lambda: store_version(settings.rag.vector_store_path),
+        version_check_seconds=settings.rag.answer_cache_version_check_seconds,
+    )
+
+
+def build_intent_classifier(settings: Settings) -> CentroidIntentClassifier:
+    examples = load_examples(settings.router.examples_path)
+    return CentroidIntentClassifier(build_embeddings(settings)).fit(examples)
+
+
+def bootstrap(settings: Settings, service_state: Optional[ServiceState] = None):
+    service_state = service_state or ServiceState()
     llm_model = None
-    try:
-        llm_model = get_chat_model(settings)
-    except Exception as exc:
+    retriever = None
+    lexical_index = None
+    stt = None
+    tts = None
+    # A failing component is logged and recorded for /ready; the rest still load.
+    with service_state.timed("llm"):
         # LLM may be optional during local development
-        print(f"[bootstrap] LLM unavailable: {exc}")
+        llm_model = build_llm(settings)
+    with service_state.timed("retriever"):
+        retriever = load_retriever(settings)
+    with service_state.timed("lexical_index"):
+        lexical_index = load_lexical_index(settings)
 
-    retriever = load_retriever(settings)
-    menu_tool = MenuQATool(retriever, llm_model) if retriever and llm_model else None
-    reservation_agent = ReservationAgent()
-    order_agent = OrderAgent()
+    menu_tool = None
+    if retriever and llm_model:
+        menu_tool = MenuQATool(
+            retriever,
+            llm_model,
+            cache=build_answer_cache(settings, retriever),
+            lexical_index=lexical_index,
+            lexical_min_coverage=settings.rag.lexical_min_coverage,
+            context_builder=ContextBuilder(
+                max_tokens=settings.rag.context_max_tokens,
+                duplicate_threshold=settings.rag.context_duplicate_threshold,
+            ),
+        )
+    slots = dict(
+        seats_per_slot=settings.reservations.seats_per_slot,
+        slot_minutes=settings.reservations.slot_minutes,
+        dining_minutes=settings.reservations.dining_minutes,
+    )
+    reservation_agent = None
+    with service_state.timed("reservations"):
+        reservation_agent = ReservationAgent(ReservationStore(settings.reservations.db_path, **slots))
+    if reservation_agent is None:
+        # Unopenable database: book in memory; /ready reports the failure.
+        reservation_agent = ReservationAgent(ReservationStore(**slots))
+    order_agent = None
+    with service_state.timed("order_journal"):
+        order_agent = OrderAgent(
+            OrderJournal(
+                settings.orders.journal_path,
+                snapshot_every=settings.orders.snapshot_every,
+                commit_window_ms=settings.orders.commit_window_ms,
+                fsync=settings.orders.fsync,
+            )
+        )
+    if order_agent is None:
+        # Unusable journal: keep orders in memory; /ready reports the failure.
+        order_agent = OrderAgent(OrderJournal())
     general_tool = GeneralInfoTool()
-    router = IntentRouter(llm_model)
+    classifier = None
+    if settings.router.classifier_enabled:
+        with service_state.timed("intent_classifier"):
+            classifier = build_intent_classifier(settings)
+    router = IntentRouter(
+        llm_model,
+        classifier=classifier,
+        min_confidence=settings.router.min_confidence,
+        combined=settings.router.combined_llm,
+    )
     orchestrator = AssistantOrchestrator(
         router=router,
         model=llm_model,
@@ -61,16 +209,23 @@ def bootstrap(settings: Settings):
         order_agent=order_agent,
         general_tool=general_tool,
     )
-    stt = build_stt(settings)
-    tts = build_tts(settings)
+    with service_state.timed("stt"):
+        stt = build_stt(settings)
+    with service_state.timed("tts"):
+        tts = build_tts(settings)
     return orchestrator, reservation_agent, order_agent, general_tool, stt, tts, llm_model
 
 
 def get_services(settings: Settings = Depends(get_settings)):
-    # Lazy singleton via function attribute
-    if not hasattr(get_services, "_services"):
-        get_services._services = bootstrap(settings)
-    return get_services._services
+    # Normally built by the lifespan handler; lazily built (once) otherwise.
+    return state.ensure(lambda s: bootstrap(settings, s))
+
+
+def get_executor(settings: Settings = Depends(get_settings)) -> StageExecutor:
+    # Shared per-stage thread pools; blocking work must not run on the event loop
+    if not hasattr(get_executor, "_executor"):
+        get_executor._executor = StageExecutor(settings)
+    return get_executor._executor
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -78,51 +233,624 @@ async def health():
     return HealthResponse()
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready(settings: Settings = Depends(get_settings)):
+    """
+    Readiness probe: 200 once services are bootstrapped and warmed, 503 before
+    or while a required component has failed. Reports per-component
+    load/warmup times and failures.
+    """
+    readiness = state.readiness(settings.api.required_components)
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=readiness.model_dump())
+    return readiness
+
+
+async def _timed(executor: StageExecutor, stage: str, fn, *args):
+    """
+    Run a speech stage on its executor inside a timing span; the span
+    includes time queued for a worker.
+    """
+    with span(stage):
+        return await executor.run(stage, fn, *args)
+
+
+async def _speak(executor: StageExecutor, tts, text: str) -> Optional[bytes]:
+    """
+    Synthesize a reply, or None when there is no TTS or it fails (worker
+    crash, timeout, full queue); the caller still has the reply text.
+    """
+    if not tts:
+        return None
+    try:
+        return await _timed(executor, "tts", tts.synthesize, text)
+    except Exception as exc:
+        print(f"[tts] synthesis failed, replying with text only: {exc!r}")
+        return None
+
+
+def _timing_headers(timings: RequestTimings, settings: Settings) -> Dict[str, str]:
+    return {"Server-Timing": timings.server_timing()} if settings.api.timing_debug else {}
+
+
 @app.post("/voice", response_model=VoiceResponse)
 async def voice(
     payload: VoiceRequest,
+    response: Response,
+    settings: Settings = Depends(get_settings),
     services=Depends(get_services),
+    executor: StageExecutor = Depends(get_executor),
 ):
     orchestrator, _, _, _, stt, tts, _ = services
 
+    with track_request("/voice") as timings:
+        text_input = payload.text
+        if not text_input and payload.audio_base64:
+            audio_bytes = decode_audio(payload.audio_base64)
+            text_input = await _timed(executor, "stt", stt.transcribe, audio_bytes)
+
+        if not text_input:
+            raise HTTPException(status_code=400, detail="No audio or text provided.")
+
+        with count_llm_calls() as usage:
+            reply, intent = await executor.run("llm", orchestrator.handle, text_input)
+        timings.intent = intent or ""
+        audio_bytes = await _speak(executor, tts, reply)
+
+    response.headers.update(_timing_headers(timings, settings))
+    return VoiceResponse(
+        text=reply,
+        audio_base64=encode_audio(audio_bytes),
+        intent=intent,
+        llm_calls=usage.calls,
+        timings_ms=timings.milliseconds() if settings.api.timing_debug else None,
+    )
+
+
+async def _read_audio_body(request: Request) -> tuple:
+    """
+    Audio and optional text from a multipart form (`audio` file, `text`
+    field) or from a raw `audio/*` / octet-stream body. `audio/L16` must
+    carry its `rate` (and optionally `channels`) parameter.
+    """
+    content_type = request.headers.get("content-type", "")
+    media_type, *params = [part.strip() for part in content_type.split(";")]
+    if media_type.lower() == "audio/l16":
+        options = dict(param.lower().split("=", 1) for param in params if "=" in param)
+        try:
+            rate, channels = int(options["rate"]), int(options.get("channels", "1"))
+        except (KeyError, ValueError):
+            raise HTTPException(
+                status_code=415, detail="audio/L16 needs integer rate (and channels) parameters."
+            ) from None
+        if rate <= 0 or channels <= 0:
+            raise HTTPException(status_code=415, detail="audio/L16 rate and channels must be positive.")
+        return wav_from_l16(await request.body(), rate, channels), None
+    if content_type.startswith("multipart/form-data"):
+        try:
+            form = await request.form()
+        except AssertionError:
+            raise HTTPException(
+                status_code=415, detail="Multipart uploads need python-multipart; send a raw audio/* body."
+            ) from None
+        upload = form.get("audio")
+        audio = await upload.read() if hasattr(upload, "read") else b""
+        return audio, form.get("text") or None
+    if content_type.startswith(("audio/", "application/octet-stream")):
+        return await request.body(), None
+    raise HTTPException(status_code=415, detail="Send multipart/form-data or an audio/* body.")
+
+
+@app.post("/voice/audio", response_class=Response)
+async def voice_audio(
+    request: Request,
+    format: Optional[str] = None,
+    sample_rate: Optional[int] = None,
+    settings: Settings = Depends(get_settings),
+    services=Depends(get_services),
+    executor: StageExecutor = Depends(get_executor),
+):
+    """
+    Binary variant of /voice: audio in the body, reply audio as the body.
+
+    `format` (wav|pcm) and `sample_rate` override SPEECH_OUTPUT_FORMAT and
+    SPEECH_OUTPUT_SAMPLE_RATE. Transcript, reply text, intent and LLM call
+    count travel in URL-encoded `X-*` headers.
+    """
+    orchestrator, _, _, _, stt, tts, _ = services
+    output_format = (format or settings.speech.output_format).lower()
+    if output_format not in ("wav", "pcm"):
+        raise HTTPException(status_code=400, detail="format must be 'wav' or 'pcm'.")
+
+    audio_in, text_input = await _read_audio_body(request)
+    with track_request("/voice/audio") as timings:
+        if not text_input and audio_in:
+            text_input = await _timed(executor, "stt", stt.transcribe, audio_in)
+        if not text_input:
+            raise HTTPException(status_code=400, detail="No audio or text provided.")
+
+        with count_llm_calls() as usage:
+            reply, intent = await executor.run("llm", orchestrator.handle, text_input)
+        timings.intent = intent or ""
+        audio_out = await _speak(executor, tts, reply)
+    body, media_type = convert_audio(
+        audio_out or b"",
+        sample_rate or settings.speech.output_sample_rate,
+        pcm=output_format == "pcm",
+    )
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={
+            "X-Transcript": quote(text_input),
+            "X-Reply-Text": quote(reply),
+            "X-Intent": intent or "",
+            "X-LLM-Calls": str(usage.calls),
+            **_timing_headers(timings, settings),
+        },
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _voice_events(
+    text_input: str, orchestrator, tts, executor: StageExecutor
+) -> AsyncIterator[str]:
+    """
+    Emit `intent`, then `token` events as the reply is generated and `audio`
+    events one sentence at a time (`audio_base64` null when synthesis
+    failed), finishing with a `done` VoiceResponse.
+    An overloaded model ends the stream with an `error` event instead.
+    """
+    with track_request("/voice/stream") as timings, count_llm_calls() as usage:
+        try:
+            # Routing may already call the model, so overload can hit here.
+            intent, fragments = await executor.run("llm", orchestrator.stream, text_input)
+        except ModelOverloadedError as exc:
+            yield _sse("error", {"detail": str(exc), "retry_after": exc.retry_after})
+            return
+        timings.intent = intent or ""
+        yield _sse("intent", {"intent": intent, "text": text_input})
+
+        chunker = SentenceChunker()
+        pending: deque = deque()
+        parts: list[str] = []
+        index = 0
+
+        def schedule(sentences: list[str]) -> None:
+            nonlocal index
+            for sentence in sentences:
+                task = asyncio.ensure_future(_speak(executor, tts, sentence))
+                pending.append((index, sentence, task))
+                index += 1
+
+        async def drain(wait: bool) -> AsyncIterator[str]:
+            # Audio is emitted in sentence order, as soon as the head is ready.
+            while pending and (wait or pending[0][2].done()):
+                position, sentence, task = pending.popleft()
+                audio = await task
+                yield _sse(
+                    "audio",
+                    {"index": position, "text": sentence, "audio_base64": encode_audio(audio)},
+                )
+
+        while True:
+            try:
+                fragment = await executor.run("llm", next, fragments, None)
+            except ModelOverloadedError as exc:
+                yield _sse("error", {"detail": str(exc), "retry_after": exc.retry_after})
+                return
+            if fragment is None:
+                break
+            parts.append(fragment)
+            yield _sse("token", {"text": fragment})
+            if tts:
+                schedule(chunker.feed(fragment))
+                async for event in drain(wait=False):
+                    yield event
+
+        if tts:
+            schedule(chunker.flush())
+            async for event in drain(wait=True):
+                yield event
+
+    final = VoiceResponse(text="".join(parts), intent=intent, llm_calls=usage.calls)
+    yield _sse("done", final.model_dump())
+
+
+@app.post("/voice/stream")
+async def voice_stream(
+    payload: VoiceRequest,
+    services=Depends(get_services),
+    executor: StageExecutor = Depends(get_executor),
+):
+    """
+    Server-sent events variant of `/voice` with incremental TTS.
+    """
+    orchestrator, _, _, _, stt, tts, _ = services
+
     text_input = payload.text
     if not text_input and payload.audio_base64:
         audio_bytes = decode_audio(payload.audio_base64)
-        text_input = stt.transcribe(audio_bytes)
+        text_input = await _timed(executor, "stt", stt.transcribe, audio_bytes)
 
     if not text_input:
         raise HTTPException(status_code=400, detail="No audio or text provided.")
 
-    reply, intent = orchestrator.handle(text_input)
-    audio_bytes = tts.synthesize(reply) if tts else None
+    return StreamingResponse(
+        _voice_events(text_input, orchestrator, tts, executor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
-    return VoiceResponse(
-        text=reply, audio_base64=encode_audio(audio_bytes), intent=intent
+
+def build_segmenter(settings: Settings) -> SpeechSegmenter:
+    return SpeechSegmenter(
+        sample_rate=settings.speech.sample_rate,
+        threshold=settings.speech.vad_threshold,
+        silence_ms=settings.speech.vad_silence_ms,
+        min_speech_ms=settings.speech.vad_min_speech_ms,
+        partial_interval_ms=settings.speech.partial_interval_ms,
     )
 
 
+async def _finish_utterance(
+    websocket: WebSocket, audio: bytes, partial: str, orchestrator, stt, tts, executor: StageExecutor
+) -> None:
+    """
+    Final transcript, intent and reply for one utterance. Routing starts on
+    the latest partial transcript while the final pass is still running and
+    is reused when the final text matches it.
+    """
+    with track_request("/voice/ws") as timings:
+        with count_llm_calls() as usage:
+            speculative = (
+                asyncio.ensure_future(executor.run("llm", orchestrator.router.route, partial))
+                if partial
+                else None
+            )
+            try:
+                text = await _timed(executor, "stt", stt.transcribe, audio)
+                await websocket.send_json({"type": "final", "text": text})
+                if not text.strip():
+                    return
+                reused = speculative is not None and normalize_question(text) == normalize_question(partial)
+                if reused:
+                    routed = await speculative
+                else:
+                    _discard(speculative)
+                    routed = await executor.run("llm", orchestrator.router.route, text)
+                reply, intent = await executor.run("llm", orchestrator.handle, text, routed=routed)
+            finally:
+                _discard(speculative)
+        timings.intent = intent or ""
+        await websocket.send_json(
+            {
+                "type": "reply",
+                "text": reply,
+                "intent": intent,
+                "llm_calls": usage.calls,
+                "speculative_route": reused,
+            }
+        )
+        audio_out = await _speak(executor, tts, reply)
+        if audio_out:
+            await websocket.send_bytes(audio_out)
+
+
+def _discard(task: Optional[asyncio.Future]) -> None:
+    # Cancel an unused speculative task, or consume its error if it already
+    # failed, so it never surfaces as "Task exception was never retrieved".
+    if task is None:
+        return
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+
+@app.websocket("/voice/ws")
+async def voice_ws(
+    websocket: WebSocket,
+    settings: Settings = Depends(get_settings),
+    services=Depends(get_services),
+    executor: StageExecutor = Depends(get_executor),
+):
+    """
+    Streaming voice input. The client sends binary frames of 16-bit mono PCM
+    at `SPEECH_SAMPLE_RATE` (and may send `{"type": "end"}` to close an
+    utterance early). The server answers with `speech_start`, rolling
+    `partial` transcripts, then `final` and `reply` JSON messages followed by
+    the reply audio as a binary frame.
+    """
+    orchestrator, _, _, _, stt, tts, _ = services
+    segmenter = build_segmenter(settings)
+    partial = ""
+    partial_task: Optional[asyncio.Future] = None
+
+    async def transcribe_partial(audio: bytes) -> None:
+        nonlocal partial
+        text = await executor.run("stt", stt.transcribe, audio)
+        if text and segmenter.in_speech:
+            partial = text
+            await websocket.send_json({"type": "partial", "text": text})
+
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                events = segmenter.feed(message["bytes"])
+            elif json.loads(message.get("text") or "{}").get("type") == "end":
+                events = segmenter.flush()
+            else:
+                continue
+            for event in events:
+                if event == "start":
+                    partial = ""
+                    await websocket.send_json({"type": "speech_start"})
+                elif event == "partial" and (partial_task is None or partial_task.done()):
+                    # At most one partial pass in flight; STT is the scarce resource.
+                    partial_task = asyncio.ensure_future(
+                        transcribe_partial(segmenter.utterance_wav())
+                    )
+                elif event == "end":
+                    # The final pass supersedes any partial still running.
+                    _discard(partial_task)
+                    partial_task = None
+                    await _finish_utterance(
+                        websocket,
+                        segmenter.take_utterance(),
+                        partial,
+                        orchestrator,
+                        stt,
+                        tts,
+                        executor,
+                    )
+                    partial = ""
+    except WebSocketDisconnect:
+        pass
+    except ModelOverloadedError as exc:
+        await websocket.send_json(
+            {"type": "error", "detail": str(exc), "retry_after": exc.retry_after}
+        )
+        await websocket.close(code=1013)  # try again later
+    finally:
+        _discard(partial_task)
+
+
 @app.post("/reservation", response_model=ReservationResponse)
 async def reservation(
     payload: ReservationRequest, services=Depends(get_services)
 ):
     _, reservation_agent, _, _, _, _, _ = services
-    return reservation_agent.book(payload)
+    # SQLite may wait on another writer's lock; keep that off the event loop.
+    return await asyncio.to_thread(reservation_agent.book, payload)
+
+
+def _validate_batch(model, items: List[Dict[str, Any]], settings: Settings) -> tuple:
+    """
+    Validate each item on its own, so one bad entry is reported instead of
+    failing the whole batch. Returns ([(index, model)], {index: error}).
+    """
+    if len(items) > settings.api.max_batch_items:
+        raise HTTPException(
+            status_code=413, detail=f"At most {settings.api.max_batch_items} items per batch."
+        )
+    valid, errors = [], {}
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(item)))
+        except ValidationError as exc:
+            errors[index] = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+            )
+    return valid, errors
+
+
+@app.post("/reservation/batch", response_model=ReservationBatchResponse)
+async def reservation_batch(
+    items: List[Dict[str, Any]] = Body(...),
+    settings: Settings = Depends(get_settings),
+    services=Depends(get_services),
+):
+    """
+    Book a list of reservations in one transaction. Items that fail
+    validation or do not fit are reported per index; the rest are booked.
+    """
+    _, reservation_agent, _, _, _, _, _ = services
+    valid, errors = _validate_batch(ReservationRequest, items, settings)
+    responses = await asyncio.to_thread(reservation_agent.book_many, [payload for _, payload in valid])
+    results = [
+        ReservationBatchResult(index=index, ok=False, error=error) for index, error in errors.items()
+    ]
+    results += [
+        ReservationBatchResult(
+            index=index,
+            ok=response.confirmed,
+            result=response,
+            error=None if response.confirmed else response.message,
+        )
+        for (index, _), response in zip(valid, responses)
+    ]
+    results.sort(key=lambda result: result.index)
+    succeeded = sum(result.ok for result in results)
+    return ReservationBatchResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@app.get("/reservation/availability", response_model=SlotAvailability)
+async def reservation_availability(
+    date: str, time: str, guests: int = 1, services=Depends(get_services)
+):
+    """
+    Whether `guests` more fit at `date` `time` (e.g. "room for 6 at 19:30?").
+    """
+    _, reservation_agent, _, _, _, _, _ = services
+    try:
+        return await asyncio.to_thread(reservation_agent.store.availability, date, time, guests)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Use date=YYYY-MM-DD and time=HH:MM.") from None
 
 
 @app.post("/order", response_model=OrderResponse)
 async def order(payload: OrderRequest, services=Depends(get_services)):
     _, _, order_agent, _, _, _, _ = services
-    return order_agent.place_order(payload)
+    # Blocks until the order's journal record is fsynced.
+    return await asyncio.to_thread(order_agent.place_order, payload)
+
+
+@app.post("/order/batch", response_model=OrderBatchResponse)
+async def order_batch(
+    items: List[Dict[str, Any]] = Body(...),
+    settings: Settings = Depends(get_settings),
+    services=Depends(get_services),
+):
+    """
+    Journal a list of orders with one commit; invalid items are reported
+    per index and the rest are placed.
+    """
+    _, _, order_agent, _, _, _, _ = services
+    valid, errors = _validate_batch(OrderRequest, items, settings)
+    responses = await asyncio.to_thread(order_agent.place_orders, [payload for _, payload in valid])
+    results = [OrderBatchResult(index=index, ok=False, error=error) for index, error in errors.items()]
+    results += [
+        OrderBatchResult(index=index, ok=True, result=response)
+        for (index, _), response in zip(valid, responses)
+    ]
+    results.sort(key=lambda result: result.index)
+    return OrderBatchResponse(succeeded=len(valid), failed=len(errors), results=results)
+
+
+@app.get("/kitchen/queue", response_model=List[KitchenTicket])
+async def kitchen_queue(services=Depends(get_services)):
+    """
+    Open orders, oldest first.
+    """
+    _, _, order_agent, _, _, _, _ = services
+    return order_agent.journal.queue()
+
+
+@app.get("/kitchen/dishes", response_model=Dict[str, int])
+async def kitchen_dishes(services=Depends(get_services)):
+    """
+    Open item count per dish, most requested first.
+    """
+    _, _, order_agent, _, _, _, _ = services
+    return order_agent.journal.open_by_dish()
+
+
+@app.get("/kitchen/tables", response_model=Dict[str, int])
+async def kitchen_tables(services=Depends(get_services)):
+    _, _, order_agent, _, _, _, _ = services
+    return order_agent.journal.open_by_table()
+
+
+@app.post("/kitchen/{reference}/done", response_model=KitchenTicket)
+async def kitchen_done(reference: str, services=Depends(get_services)):
+    """
+    Mark an order served; it leaves the queue and the open counts.
+    """
+    _, _, order_agent, _, _, _, _ = services
+    ticket = await asyncio.to_thread(order_agent.journal.complete, reference)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail=f"No open order {reference}.")
+    return ticket
+
+
+@app.get("/orders/journal", response_model=OrderJournalStats)
+async def order_journal_stats(services=Depends(get_services)):
+    _, _, order_agent, _, _, _, _ = services
+    return order_agent.journal.stats()
 
 
 @app.post("/menu/qa", response_model=MenuAnswer)
-async def menu_qa(payload: MenuQuery, services=Depends(get_services)):
+async def menu_qa(
+    payload: MenuQuery,
+    services=Depends(get_services),
+    executor: StageExecutor = Depends(get_executor),
+):
     orchestrator, _, _, _, _, _, _ = services
     if not orchestrator.menu_tool:
         raise HTTPException(
             status_code=503, detail="Menu knowledge base not initialized."
         )
-    return orchestrator.menu_tool.answer(payload)
+    return await executor.run("llm", orchestrator.menu_tool.answer, payload)
+
+
+@app.get("/menu/cache", response_model=CacheStats)
+async def menu_cache_stats(services=Depends(get_services)):
+    orchestrator, _, _, _, _, _, _ = services
+    cache = orchestrator.menu_tool.cache if orchestrator.menu_tool else None
+    if not cache:
+        raise HTTPException(status_code=404, detail="Menu answer cache disabled.")
+    return cache.stats()
+
+
+@app.get("/embeddings/stats", response_model=EmbeddingStats)
+async def embedding_stats():
+    service = loaded_embedding_service()
+    if not service:
+        raise HTTPException(status_code=404, detail="Embedding model not loaded.")
+    return service.stats()
+
+
+@app.get("/llm/stats", response_model=LLMSchedulerStats)
+async def llm_stats(services=Depends(get_services)):
+    """
+    Queue depth, wait times and batching of the LLM scheduler.
+    """
+    _, _, _, _, _, _, llm_model = services
+    if not isinstance(llm_model, LLMScheduler):
+        raise HTTPException(status_code=404, detail="LLM scheduler disabled.")
+    return llm_model.stats()
+
+
+@app.get("/llm/backends", response_model=List[LLMBackendStats])
+async def llm_backends(services=Depends(get_services)):
+    """
+    Rolling latency, error rate and hedge wins per LLM provider.
+    """
+    _, _, _, _, _, _, llm_model = services
+    # The router sits under the scheduler when both are enabled.
+    router = getattr(llm_model, "model", llm_model)
+    if not isinstance(router, ModelRouter):
+        raise HTTPException(status_code=404, detail="No fallback LLM providers configured.")
+    return router.stats()
+
+
+@app.get("/tts/cache", response_model=TTSCacheStats)
+async def tts_cache_stats(services=Depends(get_services)):
+    """
+    Hit rate of the synthesized-audio cache.
+    """
+    _, _, _, _, _, tts, _ = services
+    if not isinstance(tts, CachedTTS):
+        raise HTTPException(status_code=404, detail="TTS cache disabled.")
+    return tts.stats()
+
+
+@app.get("/tts/pool", response_model=TTSPoolStats)
+async def tts_pool_stats(services=Depends(get_services)):
+    """
+    Busy/waiting workers, timeouts and restarts of the TTS process pool.
+    """
+    _, _, _, _, _, tts, _ = services
+    pool = getattr(tts, "backend", tts)
+    if not isinstance(pool, SynthesisPool):
+        raise HTTPException(status_code=404, detail="TTS process pool disabled.")
+    return pool.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Per-stage and end-to-end latency histograms in the Prometheus text format.
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/info", response_model=GeneralInfoResponse)
@@ -0,0 +1,42 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from app.config import Settings
+
+T = TypeVar("T")
+
+STAGES = ("stt", "llm", "tts")
+
+
+class StageExecutor:
+    """
+    Bounded thread pools, one per pipeline stage, so blocking STT/LLM/TTS calls
+    run off the event loop and a slow stage cannot starve the others.
+    """
+
+    def __init__(self, settings: Settings):
+        sizes = {
+            "stt": settings.workers.stt_workers,
+            "llm": settings.workers.llm_workers,
+            "tts": settings.workers.tts_workers,
+        }
+        self._pools: Dict[str, ThreadPoolExecutor] = {
+            stage: ThreadPoolExecutor(max_workers=size, thread_name_prefix=f"{stage}-worker")
+            for stage, size in sizes.items()
+        }
+
+    async def run(self, stage: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if stage not in self._pools:
+            raise ValueError(f"Unknown stage '{stage}', expected one of {STAGES}")
+        loop = asyncio.get_running_loop()
+        # Carry context variables (request-scoped state) into the worker thread.
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, fn, *args, **kwargs)
+        return await loop.run_in_executor(self._pools[stage], call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
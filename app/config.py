@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +21,67 @@ class LLMSettings(BaseModel):
     )
     temperature: float = Field(default=0.2, ge=0.0, le=1.0, alias="LLM_TEMPERATURE")
     max_tokens: int = Field(default=512, ge=64, le=4096, alias="LLM_MAX_TOKENS")
+    keep_alive: str = Field(
+        default="30m",
+        description="How long Ollama keeps the model loaded after a call",
+        alias="LLM_KEEP_ALIVE",
+    )
+    scheduler_enabled: bool = Field(
+        default=True,
+        description="Queue model calls through the LLM scheduler",
+        alias="LLM_SCHEDULER_ENABLED",
+    )
+    max_parallel: int = Field(
+        default=4, ge=1, description="Model calls in flight at once", alias="LLM_MAX_PARALLEL"
+    )
+    batch_window_ms: float = Field(
+        default=10.0,
+        ge=0.0,
+        description="How long to collect prompts for one batched call (batching providers only)",
+        alias="LLM_BATCH_WINDOW_MS",
+    )
+    max_batch: int = Field(default=8, ge=1, alias="LLM_MAX_BATCH")
+    request_timeout_seconds: float = Field(
+        default=60.0, gt=0, description="HTTP timeout of one model call", alias="LLM_REQUEST_TIMEOUT_SECONDS"
+    )
+    max_concurrency: int = Field(
+        default=4, ge=1, description="Hard cap on in-flight calls per provider", alias="LLM_MAX_CONCURRENCY"
+    )
+    max_queue: int = Field(
+        default=32,
+        ge=0,
+        description="Calls allowed to wait for a slot before new ones are rejected with 503",
+        alias="LLM_MAX_QUEUE",
+    )
+    queue_timeout_seconds: float = Field(
+        default=10.0, gt=0, description="Longest wait for a slot", alias="LLM_QUEUE_TIMEOUT_SECONDS"
+    )
+    pool_maxsize: int = Field(
+        default=8, ge=1, description="Keep-alive connections kept per Ollama host", alias="LLM_POOL_MAXSIZE"
+    )
+    retry_after_seconds: int = Field(default=2, ge=1, alias="LLM_RETRY_AFTER_SECONDS")
+    fallback_providers: str = Field(
+        default="",
+        description="Comma-separated provider[:model] backups, e.g. 'google:gemini-1.5-flash'",
+        alias="LLM_FALLBACK_PROVIDERS",
+    )
+    hedge_enabled: bool = Field(
+        default=False,
+        description="Send a second request to the next backend when the first is slow",
+        alias="LLM_HEDGE_ENABLED",
+    )
+    hedge_percentile: float = Field(default=95.0, gt=0, le=100, alias="LLM_HEDGE_PERCENTILE")
+    hedge_min_delay_ms: float = Field(default=100.0, ge=0, alias="LLM_HEDGE_MIN_DELAY_MS")
+    max_error_rate: float = Field(
+        default=0.5,
+        gt=0,
+        le=1,
+        description="Recent error rate at which a backend is skipped",
+        alias="LLM_MAX_ERROR_RATE",
+    )
+    unhealthy_cooldown_seconds: float = Field(
+        default=30.0, ge=0, alias="LLM_UNHEALTHY_COOLDOWN_SECONDS"
+    )
 
 
 class SpeechSettings(BaseModel):
@@ -28,7 +89,76 @@ class SpeechSettings(BaseModel):
 
     stt_provider: str = Field(default="dummy", alias="SPEECH_STT_PROVIDER")
     tts_provider: str = Field(default="pyttsx3", alias="SPEECH_TTS_PROVIDER")
+    tts_voice: Optional[str] = Field(
+        default=None, description="pyttsx3 voice id; engine default when unset", alias="SPEECH_TTS_VOICE"
+    )
+    output_sample_rate: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Rate of audio returned by /voice/audio; synthesizer's own rate when unset",
+        alias="SPEECH_OUTPUT_SAMPLE_RATE",
+    )
+    output_format: str = Field(
+        default="wav",
+        description="Audio returned by /voice/audio: 'wav' or 'pcm' (headerless big-endian 16-bit mono)",
+        alias="SPEECH_OUTPUT_FORMAT",
+    )
+    tts_workers: int = Field(
+        default=2,
+        ge=0,
+        description="pyttsx3 worker processes, each with its own engine (0 = one in-process engine)",
+        alias="SPEECH_TTS_WORKERS",
+    )
+    tts_queue_size: int = Field(
+        default=32, ge=0, description="Syntheses allowed to wait for a free worker", alias="SPEECH_TTS_QUEUE_SIZE"
+    )
+    tts_timeout_seconds: float = Field(
+        default=15.0,
+        gt=0,
+        description="Longest wait for a worker, and for one synthesis, before giving up",
+        alias="SPEECH_TTS_TIMEOUT_SECONDS",
+    )
+    tts_cache_size: int = Field(
+        default=512, ge=0, description="Synthesized clips kept in memory (0 disables the TTS cache)", alias="SPEECH_TTS_CACHE_SIZE"
+    )
+    tts_cache_dir: Path = Field(
+        default=Path("data/tts_cache"),
+        description="On-disk clip cache shared across restarts and workers",
+        alias="SPEECH_TTS_CACHE_DIR",
+    )
+    tts_cache_disk_mb: float = Field(
+        default=256,
+        ge=0,
+        description="Size cap of the on-disk clip cache; least recently used clips are pruned (0 disables it)",
+        alias="SPEECH_TTS_CACHE_DISK_MB",
+    )
     sample_rate: int = Field(default=16000, alias="SPEECH_SAMPLE_RATE")
+    whisper_model: str = Field(
+        default="base", description="Whisper model size, e.g. tiny, base, small", alias="SPEECH_WHISPER_MODEL"
+    )
+    whisper_threads: int = Field(default=4, ge=1, alias="SPEECH_WHISPER_THREADS")
+    whisper_compute_type: str = Field(
+        default="int8",
+        description="faster-whisper compute type (int8, int8_float16, float16, float32); "
+        "openai-whisper only distinguishes float16 from the rest",
+        alias="SPEECH_WHISPER_COMPUTE_TYPE",
+    )
+    vad_threshold: float = Field(
+        default=0.01, gt=0, description="Minimum frame RMS (0-1) counted as speech", alias="SPEECH_VAD_THRESHOLD"
+    )
+    vad_silence_ms: int = Field(
+        default=500, ge=100, description="Trailing silence that ends an utterance", alias="SPEECH_VAD_SILENCE_MS"
+    )
+    vad_min_speech_ms: int = Field(default=200, ge=0, alias="SPEECH_VAD_MIN_SPEECH_MS")
+    partial_interval_ms: int = Field(
+        default=700, ge=100, description="Speech between partial transcripts", alias="SPEECH_PARTIAL_INTERVAL_MS"
+    )
+    stt_queue_size: int = Field(
+        default=16,
+        ge=1,
+        description="Transcriptions allowed to wait before new ones get a 503",
+        alias="SPEECH_STT_QUEUE_SIZE",
+    )
 
 
 class RAGSettings(BaseModel):
@@ -38,13 +168,140 @@ class RAGSettings(BaseModel):
     vector_store_path: Path = Field(
         default=Path("data/vector_store"), alias="RAG_VECTOR_STORE_PATH"
     )
+    vector_backend: str = Field(
+        default="chroma",
+        description="Vector index backend: 'chroma' or 'numpy' (memory-mapped exact search)",
+        alias="RAG_VECTOR_BACKEND",
+    )
+    embedding_model: str = Field(
+        default="sentence-transformers/all-MiniLM-L6-v2", alias="RAG_EMBEDDING_MODEL"
+    )
+    embedding_cache_size: int = Field(default=4096, ge=0, alias="RAG_EMBEDDING_CACHE_SIZE")
+    embedding_batch_window_ms: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Coalesce query embeddings arriving within this window (0 disables)",
+        alias="RAG_EMBEDDING_BATCH_WINDOW_MS",
+    )
+    embedding_max_batch: int = Field(default=32, ge=1, alias="RAG_EMBEDDING_MAX_BATCH")
     chunk_size: int = Field(default=750, alias="RAG_CHUNK_SIZE")
     chunk_overlap: int = Field(default=100, alias="RAG_CHUNK_OVERLAP")
+    ingest_workers: int = Field(default=4, ge=1, alias="RAG_INGEST_WORKERS")
+    embed_batch_size: int = Field(default=256, ge=1, alias="RAG_EMBED_BATCH_SIZE")
+    lexical_enabled: bool = Field(default=True, alias="RAG_LEXICAL_ENABLED")
+    lexical_min_coverage: float = Field(
+        default=0.75,
+        ge=0.0,
+        le=1.0,
+        description="Share of query terms the top BM25 hit must contain to skip dense retrieval",
+        alias="RAG_LEXICAL_MIN_COVERAGE",
+    )
+    context_max_tokens: int = Field(
+        default=600,
+        ge=64,
+        description="Token budget for retrieved context in the menu QA prompt",
+        alias="RAG_CONTEXT_MAX_TOKENS",
+    )
+    context_duplicate_threshold: float = Field(
+        default=0.85,
+        gt=0.0,
+        le=1.0,
+        description="Drop a passage when this share of its words already appears in a kept one",
+        alias="RAG_CONTEXT_DUPLICATE_THRESHOLD",
+    )
+    answer_cache_size: int = Field(default=256, ge=0, alias="RAG_ANSWER_CACHE_SIZE")
+    answer_cache_ttl_seconds: float = Field(
+        default=3600.0, gt=0, alias="RAG_ANSWER_CACHE_TTL_SECONDS"
+    )
+    answer_cache_similarity: float = Field(
+        default=0.92, ge=0.0, le=1.0, alias="RAG_ANSWER_CACHE_SIMILARITY"
+    )
+    answer_cache_version_check_seconds: float = Field(
+        default=1.0,
+        ge=0,
+        description="How often lookups re-read the vector store version to catch re-ingestion",
+        alias="RAG_ANSWER_CACHE_VERSION_CHECK_SECONDS",
+    )
+
+
+class RouterSettings(BaseModel):
+    model_config = SettingsConfigDict(populate_by_name=True)
+
+    classifier_enabled: bool = Field(default=True, alias="ROUTER_CLASSIFIER_ENABLED")
+    examples_path: Path = Field(
+        default=Path("data/intents/examples.jsonl"), alias="ROUTER_EXAMPLES_PATH"
+    )
+    min_confidence: float = Field(
+        default=0.6,
+        ge=0.0,
+        le=1.0,
+        description="Classifier probability below which routing falls back to the LLM",
+        alias="ROUTER_MIN_CONFIDENCE",
+    )
+    combined_llm: bool = Field(
+        default=True,
+        description="Have the routing LLM call also draft the reply (one call instead of two)",
+        alias="ROUTER_COMBINED_LLM",
+    )
+
+
+class ReservationSettings(BaseModel):
+    model_config = SettingsConfigDict(populate_by_name=True)
+
+    db_path: Path = Field(default=Path("data/reservations.db"), alias="RESERVATION_DB_PATH")
+    seats_per_slot: int = Field(default=40, ge=1, alias="RESERVATION_SEATS_PER_SLOT")
+    slot_minutes: int = Field(default=30, ge=5, le=240, alias="RESERVATION_SLOT_MINUTES")
+    dining_minutes: int = Field(
+        default=90,
+        ge=5,
+        description="How long a booking holds its seats; it counts against every slot it overlaps",
+        alias="RESERVATION_DINING_MINUTES",
+    )
+
+
+class OrderSettings(BaseModel):
+    model_config = SettingsConfigDict(populate_by_name=True)
+
+    journal_path: Path = Field(default=Path("data/orders/orders.log"), alias="ORDER_JOURNAL_PATH")
+    commit_window_ms: float = Field(
+        default=2.0,
+        ge=0,
+        description="How long the journal writer gathers concurrent orders into one fsync",
+        alias="ORDER_COMMIT_WINDOW_MS",
+    )
+    snapshot_every: int = Field(
+        default=1000, ge=1, description="Journal records between kitchen-state snapshots", alias="ORDER_SNAPSHOT_EVERY"
+    )
+    fsync: bool = Field(default=True, alias="ORDER_FSYNC")
+
+
+class WorkerSettings(BaseModel):
+    model_config = SettingsConfigDict(populate_by_name=True)
+
+    stt_workers: int = Field(default=2, ge=1, alias="WORKERS_STT")
+    llm_workers: int = Field(default=4, ge=1, alias="WORKERS_LLM")
+    tts_workers: int = Field(default=2, ge=1, alias="WORKERS_TTS")
 
 
 class APISettings(BaseModel):
+    model_config = SettingsConfigDict(populate_by_name=True)
+
     host: str = Field(default="0.0.0.0", alias="API_HOST")
     port: int = Field(default=8000, alias="API_PORT")
+    warmup: bool = Field(default=True, alias="API_WARMUP")
+    max_batch_items: int = Field(
+        default=500, ge=1, description="Largest list accepted by the /batch endpoints", alias="API_MAX_BATCH_ITEMS"
+    )
+    timing_debug: bool = Field(
+        default=False,
+        description="Return per-stage timings (Server-Timing header, VoiceResponse.timings_ms) on voice endpoints",
+        alias="API_TIMING_DEBUG",
+    )
+    required_components: List[str] = Field(
+        default=["llm", "retriever", "stt", "tts"],
+        description="Components whose load or warmup failure keeps /ready at 503; others only degrade",
+        alias="API_REQUIRED_COMPONENTS",
+    )
 
 
 class Settings(BaseSettings):
@@ -62,6 +319,10 @@ class Settings(BaseSettings):
     llm: LLMSettings = LLMSettings()
     speech: SpeechSettings = SpeechSettings()
     rag: RAGSettings = RAGSettings()
+    router: RouterSettings = RouterSettings()
+    reservations: ReservationSettings = ReservationSettings()
+    orders: OrderSettings = OrderSettings()
+    workers: WorkerSettings = WorkerSettings()
     api: APISettings = APISettings()
 
     google_api_key: Optional[str] = Field(default=None, alias="GOOGLE_API_KEY")
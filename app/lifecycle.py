@@ -0,0 +1,106 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from app.models.schemas import ComponentStatus, ReadinessResponse
+from app.speech.cache import CachedTTS
+from app.speech.stt import silence_wav
+
+WARMUP_TEXT = "Warming up."
+
+
+class ServiceState:
+    """
+    Process-wide holder for bootstrapped services, with per-component load and
+    warmup timings so `/ready` can tell a load balancer when a worker is warm.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.services: Optional[tuple] = None
+        self.warmed = False
+        self.load_seconds: Dict[str, float] = {}
+        self.warmup_seconds: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    def ensure(self, build: Callable[["ServiceState"], tuple]) -> tuple:
+        # Double-checked so concurrent first requests bootstrap exactly once.
+        if self.services is None:
+            with self.lock:
+                if self.services is None:
+                    self.services = build(self)
+        return self.services
+
+    @contextmanager
+    def timed(self, component: str, phase: str = "load") -> Iterator[None]:
+        target = self.load_seconds if phase == "load" else self.warmup_seconds
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            self.errors[component] = f"{phase} failed: {exc}"
+            print(f"[{phase}] {component} failed: {exc}")
+        finally:
+            target[component] = time.perf_counter() - started
+
+    def readiness(self, required: Iterable[str] = ()) -> ReadinessResponse:
+        """
+        Ready once bootstrapped and warmed, unless a `required` component
+        failed; failures elsewhere (e.g. a memory-only fallback) still show
+        in `components` but do not take the worker out of rotation.
+        """
+        names = list(dict.fromkeys([*self.load_seconds, *self.warmup_seconds, *self.errors]))
+        return ReadinessResponse(
+            ready=self.services is not None
+            and self.warmed
+            and not any(name in self.errors for name in required),
+            components={
+                name: ComponentStatus(
+                    ok=name not in self.errors,
+                    load_seconds=self.load_seconds.get(name),
+                    warmup_seconds=self.warmup_seconds.get(name),
+                    detail=self.errors.get(name),
+                )
+                for name in names
+            },
+        )
+
+    def reset(self) -> None:
+        with self.lock:
+            self.services = None
+            self.warmed = False
+            self.load_seconds.clear()
+            self.warmup_seconds.clear()
+            self.errors.clear()
+
+
+def warmup(state: ServiceState, sample_rate: int) -> None:
+    """
+    Exercise every component once so the first real request does not pay for
+    lazy model loading: one embedding, one LLM call (which also keeps Ollama's
+    model resident), one STT and one TTS run. The TTS cache is then filled with
+    every canned reply.
+    """
+    if state.warmed:
+        return
+    orchestrator, _, _, _, stt, tts, llm_model = state.services
+    menu_tool = orchestrator.menu_tool
+    embeddings: Any = getattr(menu_tool.retriever, "embeddings", None) if menu_tool else None
+
+    if embeddings is not None:
+        with state.timed("embeddings", "warmup"):
+            embeddings.embed_query(WARMUP_TEXT)
+    if llm_model is not None:
+        with state.timed("llm", "warmup"):
+            llm_model.invoke("Reply with OK.")
+    if stt is not None:
+        with state.timed("stt", "warmup"):
+            stt.transcribe(silence_wav(0.5, sample_rate))
+    if tts is not None:
+        with state.timed("tts", "warmup"):
+            tts.synthesize(WARMUP_TEXT)
+    if isinstance(tts, CachedTTS):
+        with state.timed("tts_cache", "warmup"):
+            tts.prewarm(orchestrator.static_replies())
+    state.warmed = True
@@ -0,0 +1,157 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Seconds; spans from sub-millisecond routing up to slow LLM generations.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus data model. One observe is a
+    bisect and three additions under a lock.
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (+Inf last), sum, count.
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {labels: (list(s[0]), s[1], s[2]) for labels, s in self._series.items()}
+        for labels, (counts, total, count) in sorted(snapshot.items()):
+            base = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            running = 0
+            for bound, bucket in zip((*self.buckets, float("inf")), counts):
+                running += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{base}{"," if base else ""}le="{le}"}} {running}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.histograms: List[Histogram] = []
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...]) -> Histogram:
+        histogram = Histogram(name, help, labelnames)
+        self.histograms.append(histogram)
+        return histogram
+
+    def render(self) -> str:
+        return "\n".join(line for h in self.histograms for line in h.render()) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.histogram(
+    "assistant_stage_seconds",
+    "Time spent in one pipeline stage (stt, route, retrieve, llm, tts).",
+    ("stage", "intent", "provider", "path"),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "assistant_request_seconds",
+    "End-to-end time of a voice request.",
+    ("endpoint", "intent"),
+)
+
+
+@dataclass
+class RequestTimings:
+    endpoint: str
+    intent: str = ""
+    spans: List[Tuple[str, str, str, float]] = field(default_factory=list)
+    closed: bool = False
+
+    def milliseconds(self) -> Dict[str, float]:
+        """
+        Total time per stage, in milliseconds, for debug output.
+        """
+        totals: Dict[str, float] = {}
+        for stage, _, _, seconds in self.spans:
+            totals[stage] = totals.get(stage, 0.0) + seconds * 1000
+        return {stage: round(ms, 2) for stage, ms in totals.items()}
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{stage};dur={ms}" for stage, ms in self.milliseconds().items())
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+class span:
+    """
+    Time a block as one pipeline stage. Inside `track_request` the span is
+    held until the request's intent is known; otherwise it is recorded at
+    once. `provider` and `path` (e.g. keyword vs llm routing) may be set on
+    the span before it closes.
+    """
+
+    __slots__ = ("stage", "provider", "path", "_started")
+
+    def __init__(self, stage: str, provider: str = "", path: str = ""):
+        self.stage = stage
+        self.provider = provider
+        self.path = path
+
+    def __enter__(self) -> "span":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        seconds = time.perf_counter() - self._started
+        timings = _timings.get()
+        if timings is not None and not timings.closed:
+            timings.spans.append((self.stage, self.provider, self.path, seconds))
+        else:
+            STAGE_SECONDS.observe(seconds, self.stage, "", self.provider, self.path)
+
+
+@contextmanager
+def track_request(endpoint: str) -> Iterator[RequestTimings]:
+    """
+    Collect the spans of one request (including ones run in executor threads,
+    which inherit the context) and record them labelled with the request's
+    intent once it finishes. Set `intent` on the yielded object.
+    """
+    timings = RequestTimings(endpoint=endpoint)
+    token = _timings.set(timings)
+    started = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+        timings.closed = True
+        for stage, provider, path, seconds in timings.spans:
+            STAGE_SECONDS.observe(seconds, stage, timings.intent, provider, path)
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint, timings.intent)
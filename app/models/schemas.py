@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -9,6 +9,18 @@ class HealthResponse(BaseModel):
     message: str = "Service healthy"
 
 
+class ComponentStatus(BaseModel):
+    ok: bool = True
+    load_seconds: Optional[float] = None
+    warmup_seconds: Optional[float] = None
+    detail: Optional[str] = None
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    components: Dict[str, ComponentStatus] = {}
+
+
 class VoiceRequest(BaseModel):
     audio_base64: Optional[str] = Field(
         default=None,
@@ -23,13 +35,19 @@ class VoiceResponse(BaseModel):
     text: str
     audio_base64: Optional[str] = None
     intent: Optional[str] = None
+    llm_calls: Optional[int] = Field(
+        default=None, description="Model calls made to produce this reply."
+    )
+    timings_ms: Optional[Dict[str, float]] = Field(
+        default=None, description="Milliseconds per pipeline stage (API_TIMING_DEBUG only)."
+    )
 
 
 class ReservationRequest(BaseModel):
     name: str
     date: str = Field(description="Date in YYYY-MM-DD format")
     time: str = Field(description="Time in HH:MM format")
-    guests: int
+    guests: int = Field(ge=1)
     special_requests: Optional[str] = None
 
 
@@ -39,6 +57,27 @@ class ReservationResponse(BaseModel):
     message: str
 
 
+class ReservationBatchResult(BaseModel):
+    index: int = Field(description="Position of the item in the submitted list")
+    ok: bool
+    result: Optional[ReservationResponse] = None
+    error: Optional[str] = None
+
+
+class ReservationBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[ReservationBatchResult]
+
+
+class SlotAvailability(BaseModel):
+    date: str
+    slot: str = Field(description="Start (HH:MM) of the slot the requested time falls in")
+    guests: int
+    available: bool
+    remaining: int = Field(description="Seats still free across the slots a booking would hold")
+
+
 class OrderItem(BaseModel):
     item: str
     quantity: int = Field(default=1, ge=1)
@@ -55,6 +94,37 @@ class OrderResponse(BaseModel):
     summary: str
     total_items: int
     message: str
+    reference: Optional[str] = None
+
+
+class OrderBatchResult(BaseModel):
+    index: int = Field(description="Position of the item in the submitted list")
+    ok: bool
+    result: Optional[OrderResponse] = None
+    error: Optional[str] = None
+
+
+class OrderBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[OrderBatchResult]
+
+
+class KitchenTicket(BaseModel):
+    reference: str
+    table: Optional[str] = None
+    items: List[OrderItem]
+    placed_at: float
+
+
+class OrderJournalStats(BaseModel):
+    records: int
+    batches: int
+    fsyncs: int
+    open_orders: int
+    snapshot_seq: int
+    recovered_records: int
+    recovery_seconds: float
 
 
 class MenuQuery(BaseModel):
@@ -64,6 +134,84 @@ class MenuQuery(BaseModel):
 class MenuAnswer(BaseModel):
     answer: str
     sources: List[str] = []
+    retrieval: Optional[str] = Field(
+        default=None,
+        description="Path that served the context: lexical, hybrid, dense or cache.",
+    )
+    prompt_tokens: Optional[int] = Field(
+        default=None, description="Estimated prompt tokens sent to the model (0 on cache hits)."
+    )
+
+
+class CacheStats(BaseModel):
+    size: int
+    hits: int
+    semantic_hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    hit_rate: float
+
+
+class TTSCacheStats(BaseModel):
+    size: int
+    bytes: int
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    disk_bytes: int
+    disk_evictions: int
+    prewarmed: int
+    hit_rate: float
+
+
+class TTSPoolStats(BaseModel):
+    workers: int
+    busy: int
+    waiting: int
+    completed: int
+    failed: int
+    rejected: int
+    timeouts: int
+    restarts: int
+
+
+class EmbeddingStats(BaseModel):
+    size: int
+    hits: int
+    misses: int
+    hit_rate: float
+    batches: int
+    mean_batch_size: float
+    max_batch_size: int
+
+
+class LLMSchedulerStats(BaseModel):
+    batching: bool
+    max_parallel: int
+    queue_depth: int
+    max_queue_depth: int
+    in_flight: int
+    submitted: int
+    completed: int
+    failed: int
+    rejected: int
+    batches: int
+    mean_batch_size: float
+    mean_wait_ms: float
+    p95_wait_ms: float
+    max_wait_ms: float
+
+
+class LLMBackendStats(BaseModel):
+    name: str
+    healthy: bool
+    calls: int
+    error_rate: float
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    hedges_won: int = 0
 
 
 class GeneralInfoRequest(BaseModel):
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from collections import Counter
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 from langchain.prompts import PromptTemplate
+from langchain.schema import Document
 from langchain.schema.language_model import BaseLanguageModel
 
+from app.metrics import span
 from app.models.schemas import (
     GeneralInfoResponse,
     MenuAnswer,
@@ -15,74 +18,138 @@ from app.models.schemas import (
     ReservationRequest,
     ReservationResponse,
 )
+from app.orchestration.orders import OrderJournal
+from app.orchestration.reservations import Booking, ReservationStore
+from app.orchestration.router import IntentResult
+from app.rag.context import MENU_QA_PREFIX, ContextBuilder, estimate_tokens
+
+# Fixed replies, spoken often enough that their audio is synthesized once and
+# cached (see AssistantOrchestrator.static_replies).
+RESERVATION_DETAILS_REPLY = "I can start your reservation. Please share name, date, time, and guests."
+ORDER_DETAILS_REPLY = "Happy to take your order. Please list items and quantities."
+MENU_NOT_READY_REPLY = "Menu knowledge base is not ready. Please run ingestion first."
+MENU_NOT_INGESTED_REPLY = "Menu knowledge base not ready. Please run the ingestion script."
+GENERAL_DEFAULT_REPLY = (
+    "We are here to help with hours, location, and specials. What would you like to know?"
+)
+FALLBACK_REPLY = "I'm here to help with reservations, orders, or menu questions."
 
 
 class ReservationAgent:
-    def __init__(self):
-        self._reservations: List[ReservationResponse] = []
+    def __init__(self, store: Optional[ReservationStore] = None):
+        self.store = store or ReservationStore()
 
     def book(self, payload: ReservationRequest) -> ReservationResponse:
-        ref = f"RSV-{len(self._reservations)+1:04d}"
+        try:
+            booking = self.store.book(payload)
+        except ValueError:
+            booking = None
+        return self._response(payload, booking)
+
+    def book_many(self, payloads: List[ReservationRequest]) -> List[ReservationResponse]:
+        bookings = self.store.book_many(payloads)
+        return [self._response(payload, booking) for payload, booking in zip(payloads, bookings)]
+
+    @staticmethod
+    def _response(payload: ReservationRequest, booking: Optional[Booking]) -> ReservationResponse:
+        if booking is None:
+            return ReservationResponse(
+                confirmed=False,
+                reference="RSV-INVALID",
+                message="Please give the date as YYYY-MM-DD, the time as HH:MM and at least one guest.",
+            )
+        if not booking.confirmed:
+            return ReservationResponse(
+                confirmed=False,
+                reference="RSV-FULL",
+                message=(
+                    f"Sorry, we only have room for {max(booking.remaining, 0)} more guests "
+                    f"on {payload.date} at {payload.time}."
+                ),
+            )
         message = (
             f"Booked {payload.guests} guests for {payload.name} on "
             f"{payload.date} at {payload.time}."
         )
         if payload.special_requests:
             message += f" Notes: {payload.special_requests}."
-        response = ReservationResponse(confirmed=True, reference=ref, message=message)
-        self._reservations.append(response)
-        return response
+        return ReservationResponse(confirmed=True, reference=booking.reference, message=message)
+
+    def freeform_prompt(self, text: str) -> str:
+        prompt = PromptTemplate.from_template(
+            "Extract a reservation intent. Reply with a short confirmation.\n"
+            "User: {text}"
+        )
+        return prompt.format(text=text)
 
     def handle_freeform(
-        self, text: str, model: Optional[BaseLanguageModel] = None
+        self,
+        text: str,
+        model: Optional[BaseLanguageModel] = None,
+        reply: Optional[str] = None,
     ) -> ReservationResponse:
         """
         Quick reservation from natural language; if an LLM is available we ask it
         to extract structured fields, otherwise we acknowledge the request.
+        A `reply` already drafted while routing is used as is.
         """
-        if model:
-            prompt = PromptTemplate.from_template(
-                "Extract a reservation intent. Reply with a short confirmation.\n"
-                "User: {text}"
-            )
-            message = model.invoke(prompt.format(text=text)).content
+        if reply or model:
+            message = reply or model.invoke(self.freeform_prompt(text)).content
             return ReservationResponse(
                 confirmed=True, reference="RSV-PENDING", message=message
             )
         return ReservationResponse(
             confirmed=False,
             reference="RSV-PENDING",
-            message="I can start your reservation. Please share name, date, time, and guests.",
+            message=RESERVATION_DETAILS_REPLY,
         )
 
 
 class OrderAgent:
-    def __init__(self):
-        self._orders: List[OrderResponse] = []
+    def __init__(self, journal: Optional[OrderJournal] = None):
+        self.journal = journal or OrderJournal()
 
     def place_order(self, payload: OrderRequest) -> OrderResponse:
+        return self.place_orders([payload])[0]
+
+    def place_orders(self, payloads: List[OrderRequest]) -> List[OrderResponse]:
+        """
+        Journal a batch of orders with a single commit.
+        """
+        tickets = self.journal.place_many([(payload.table, payload.items) for payload in payloads])
+        return [self._response(payload, ticket.reference) for payload, ticket in zip(payloads, tickets)]
+
+    @staticmethod
+    def _response(payload: OrderRequest, reference: str) -> OrderResponse:
         total_items = sum(item.quantity for item in payload.items)
         summary = "; ".join(
             f"{item.quantity}x {item.item}" + (f" ({item.notes})" if item.notes else "")
             for item in payload.items
         )
-        ref = f"ORD-{len(self._orders)+1:04d}"
         message = f"Order received{f' for table {payload.table}' if payload.table else ''}: {summary}"
-        resp = OrderResponse(
-            confirmed=True, summary=summary, total_items=total_items, message=message
+        return OrderResponse(
+            confirmed=True,
+            summary=summary,
+            total_items=total_items,
+            message=message,
+            reference=reference,
+        )
+
+    def freeform_prompt(self, text: str) -> str:
+        prompt = PromptTemplate.from_template(
+            "Summarize this order request and confirm politely in one sentence.\n"
+            "Order: {text}"
         )
-        self._orders.append(resp)
-        return resp
+        return prompt.format(text=text)
 
     def handle_freeform(
-        self, text: str, model: Optional[BaseLanguageModel] = None
+        self,
+        text: str,
+        model: Optional[BaseLanguageModel] = None,
+        reply: Optional[str] = None,
     ) -> OrderResponse:
-        if model:
-            prompt = PromptTemplate.from_template(
-                "Summarize this order request and confirm politely in one sentence.\n"
-                "Order: {text}"
-            )
-            message = model.invoke(prompt.format(text=text)).content
+        if reply or model:
+            message = reply or model.invoke(self.freeform_prompt(text)).content
             return OrderResponse(
                 confirmed=True, summary=text, total_items=1, message=message
             )
@@ -90,32 +157,142 @@ class OrderAgent:
             confirmed=False,
             summary=text,
             total_items=0,
-            message="Happy to take your order. Please list items and quantities.",
+            message=ORDER_DETAILS_REPLY,
         )
 
 
 class MenuQATool:
-    def __init__(self, retriever, model: BaseLanguageModel):
+    def __init__(
+        self,
+        retriever,
+        model: BaseLanguageModel,
+        cache=None,
+        lexical_index=None,
+        lexical_min_coverage: float = 0.75,
+        k: int = 4,
+        context_builder: Optional[ContextBuilder] = None,
+    ):
         self.retriever = retriever
         self.model = model
+        self.cache = cache
+        self.lexical_index = lexical_index
+        self.lexical_min_coverage = lexical_min_coverage
+        self.k = k
+        self.context_builder = context_builder or ContextBuilder()
+        self.retrieval_counts: Counter = Counter()
+
+    def retrieve(self, question: str, hits: Optional[list] = None) -> tuple[List[Document], str]:
+        """
+        Pick context chunks and report the path used. A confident BM25 hit skips
+        the embedding model entirely; weak lexical evidence is fused with dense
+        results, and no lexical evidence falls back to dense search alone.
+        `hits` reuses a BM25 search the caller already ran.
+        """
+        with span("retrieve") as timing:
+            if hits is None:
+                hits = self.lexical_hits(question)
+            if self.lexical_only(hits):
+                docs, path = [hit.document for hit in hits], "lexical"
+            elif hits:
+                dense = self.retriever.similarity_search(question, k=self.k)
+                docs, path = _reciprocal_rank_fusion([hit.document for hit in hits], dense)[: self.k], "hybrid"
+            else:
+                docs, path = self.retriever.similarity_search(question, k=self.k), "dense"
+            timing.path = path
+        self.retrieval_counts[path] += 1
+        return docs, path
+
+    def lexical_hits(self, question: str) -> list:
+        return self.lexical_index.search(question, k=self.k) if self.lexical_index else []
+
+    def lexical_only(self, hits: list) -> bool:
+        return bool(hits) and hits[0].coverage >= self.lexical_min_coverage
+
+    def build_prompt(
+        self, payload: MenuQuery, hits: Optional[list] = None
+    ) -> tuple[str, List[str], str, int]:
+        """
+        Retrieve context for the question and return the QA prompt with its
+        sources, the retrieval path that served it and its estimated tokens.
+        Context is merged, deduplicated and trimmed to the token budget.
+        """
+        docs, path = self.retrieve(payload.question, hits)
+        context = self.context_builder.build(docs)
+        qa_prompt = PromptTemplate.from_template(
+            MENU_QA_PREFIX + "Context:\n{context}\n\nQuestion: {question}\nAnswer:"
+        )
+        prompt_text = qa_prompt.format(context=context.text, question=payload.question)
+        sources = list(
+            dict.fromkeys(doc.metadata.get("source", "menu_doc") for doc in context.documents)
+        )
+        return prompt_text, sources, path, estimate_tokens(prompt_text)
+
+    def cached_answer(self, payload: MenuQuery, semantic: bool = True) -> Optional[MenuAnswer]:
+        cached = self.cache.get(payload.question, semantic=semantic) if self.cache else None
+        if not cached:
+            return None
+        self.retrieval_counts["cache"] += 1
+        return cached.model_copy(update={"retrieval": "cache", "prompt_tokens": 0})
 
     def answer(self, payload: MenuQuery) -> MenuAnswer:
         if not self.retriever:
             return MenuAnswer(
-                answer="Menu knowledge base not ready. Please run the ingestion script.",
+                answer=MENU_NOT_INGESTED_REPLY,
                 sources=[],
             )
-        docs = self.retriever.similarity_search(payload.question, k=4)
-        context = "\n\n".join(doc.page_content for doc in docs)
-        qa_prompt = PromptTemplate.from_template(
-            "You are a restaurant assistant. Use the context to answer clearly.\n"
-            "Question: {question}\n"
-            "Context: {context}"
-        )
-        prompt_text = qa_prompt.format(question=payload.question, context=context)
+        # Semantic cache lookups and stores embed the question, so they only
+        # run when retrieval embeds it anyway (the vector is then shared).
+        hits = self.lexical_hits(payload.question)
+        cached = self.cached_answer(payload, semantic=not self.lexical_only(hits))
+        if cached:
+            return cached
+        prompt_text, sources, path, tokens = self.build_prompt(payload, hits)
         result = self.model.invoke(prompt_text)
-        sources = [doc.metadata.get("source", "menu_doc") for doc in docs]
-        return MenuAnswer(answer=result.content if hasattr(result, "content") else str(result), sources=sources)
+        answer = MenuAnswer(
+            answer=result.content if hasattr(result, "content") else str(result),
+            sources=sources,
+            retrieval=path,
+            prompt_tokens=tokens,
+        )
+        if self.cache:
+            self.cache.put(payload.question, answer, embed=path != "lexical")
+        return answer
+
+    def stream_answer(self, payload: MenuQuery) -> Iterator[str]:
+        """
+        Stream the answer text; served from the cache when possible and stored in
+        it once the stream completes.
+        """
+        hits = self.lexical_hits(payload.question)
+        cached = self.cached_answer(payload, semantic=not self.lexical_only(hits))
+        if cached:
+            yield cached.answer
+            return
+        prompt_text, sources, path, tokens = self.build_prompt(payload, hits)
+        parts: List[str] = []
+        for chunk in self.model.stream(prompt_text):
+            content = chunk.content if hasattr(chunk, "content") else str(chunk)
+            if content:
+                parts.append(content)
+                yield content
+        if self.cache:
+            self.cache.put(
+                payload.question,
+                MenuAnswer(
+                    answer="".join(parts), sources=sources, retrieval=path, prompt_tokens=tokens
+                ),
+                embed=path != "lexical",
+            )
+
+
+def _reciprocal_rank_fusion(*rankings: List[Document], k: int = 60) -> List[Document]:
+    scores: dict = {}
+    docs: dict = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking):
+            scores[doc.page_content] = scores.get(doc.page_content, 0.0) + 1 / (k + rank + 1)
+            docs.setdefault(doc.page_content, doc)
+    return [docs[key] for key in sorted(scores, key=scores.get, reverse=True)]
 
 
 class GeneralInfoTool:
@@ -132,9 +309,7 @@ class GeneralInfoTool:
         for key, value in self.info_map.items():
             if key in lower:
                 return GeneralInfoResponse(answer=value)
-        return GeneralInfoResponse(
-            answer="We are here to help with hours, location, and specials. What would you like to know?"
-        )
+        return GeneralInfoResponse(answer=GENERAL_DEFAULT_REPLY)
 
 
 class AssistantOrchestrator:
@@ -154,23 +329,27 @@ class AssistantOrchestrator:
         self.order_agent = order_agent
         self.general_tool = general_tool
 
-    def handle(self, text: str) -> tuple[str, str]:
-        intent = self.router.route(text).intent
+    def handle(
+        self, text: str, intent: Optional[str] = None, routed: Optional[IntentResult] = None
+    ) -> tuple[str, str]:
+        # `routed` is a routing result computed ahead of time (streaming input).
+        # A reply drafted by a combined routing call saves a second LLM call.
+        reply = None
+        if not intent:
+            routed = routed or self.router.route(text)
+            intent, reply = routed.intent, routed.reply
 
         if intent == "reservation":
-            response = self.reservation_agent.handle_freeform(text, self.model)
+            response = self.reservation_agent.handle_freeform(text, self.model, reply)
             return response.message, intent
 
         if intent == "order":
-            response = self.order_agent.handle_freeform(text, self.model)
+            response = self.order_agent.handle_freeform(text, self.model, reply)
             return response.message, intent
 
         if intent == "menu":
             if not self.menu_tool:
-                return (
-                    "Menu knowledge base is not ready. Please run ingestion first.",
-                    intent,
-                )
+                return MENU_NOT_READY_REPLY, intent
             answer = self.menu_tool.answer(MenuQuery(question=text))
             return answer.answer, intent
 
@@ -179,11 +358,65 @@ class AssistantOrchestrator:
             return answer.answer, intent
 
         # fallback
+        if reply:
+            message = reply
+        elif self.model:
+            message = self.model.invoke(self._fallback_prompt(text)).content
+        else:
+            message = FALLBACK_REPLY
+        return message, intent
+
+    def stream(self, text: str) -> tuple[str, Iterator[str]]:
+        """
+        Streaming variant of `handle`: returns the intent and an iterator of reply
+        fragments. LLM-backed replies are streamed token by token; static replies
+        are yielded in one piece.
+        """
+        routed = self.router.route(text)
+        intent = routed.intent
+
+        if routed.reply:
+            return intent, iter([routed.reply])
+
+        if intent == "reservation" and self.model:
+            return intent, self._stream_model(self.reservation_agent.freeform_prompt(text))
+
+        if intent == "order" and self.model:
+            return intent, self._stream_model(self.order_agent.freeform_prompt(text))
+
+        if intent == "menu" and self.menu_tool and self.menu_tool.retriever:
+            return intent, self.menu_tool.stream_answer(MenuQuery(question=text))
+
+        if intent == "fallback" and self.model:
+            return intent, self._stream_model(self._fallback_prompt(text))
+
+        # Everything else resolves without a streaming LLM call
+        message, intent = self.handle(text, intent)
+        return intent, iter([message])
+
+    def static_replies(self) -> List[str]:
+        """
+        Every reply that does not depend on the user's words.
+        """
+        return [
+            RESERVATION_DETAILS_REPLY,
+            ORDER_DETAILS_REPLY,
+            MENU_NOT_READY_REPLY,
+            MENU_NOT_INGESTED_REPLY,
+            GENERAL_DEFAULT_REPLY,
+            FALLBACK_REPLY,
+            *self.general_tool.info_map.values(),
+        ]
+
+    def _stream_model(self, prompt: str) -> Iterator[str]:
+        for chunk in self.model.stream(prompt):
+            content = chunk.content if hasattr(chunk, "content") else str(chunk)
+            if content:
+                yield content
+
+    @staticmethod
+    def _fallback_prompt(text: str) -> str:
         fallback_prompt = (
             "You are a concise restaurant assistant. Provide a brief helpful reply."
         )
-        if self.model:
-            message = self.model.invoke(f"{fallback_prompt}\nUser: {text}").content
-        else:
-            message = "I'm here to help with reservations, orders, or menu questions."
-        return message, intent
+        return f"{fallback_prompt}\nUser: {text}"
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from langchain.schema.embeddings import Embeddings
+
+# Candidate softmax temperatures; the one with the lowest training NLL wins.
+_TEMPERATURES = (0.01, 0.02, 0.03, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3)
+
+
+def load_examples(path: Path) -> List[Tuple[str, str]]:
+    """
+    Read labeled utterances from a JSONL file of {"text": ..., "intent": ...}.
+    """
+    examples = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                examples.append((record["text"], record["intent"]))
+    return examples
+
+
+class CentroidIntentClassifier:
+    """
+    Nearest-centroid intent classifier over sentence embeddings.
+
+    Each intent is the normalized mean of its example embeddings. Cosine
+    similarities to the centroids go through a softmax whose temperature is
+    fitted on the training examples, so the scores behave like probabilities
+    and can be compared with a fixed confidence threshold.
+    """
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+        self.labels: List[str] = []
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        self.temperature = 0.05
+
+    def fit(self, examples: Sequence[Tuple[str, str]]) -> "CentroidIntentClassifier":
+        texts = [text for text, _ in examples]
+        targets = [label for _, label in examples]
+        vectors = _normalize(np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32))
+        self.labels = sorted(set(targets))
+        self.centroids = _normalize(
+            np.stack(
+                [vectors[[t == label for t in targets]].mean(axis=0) for label in self.labels]
+            )
+        )
+        similarities = vectors @ self.centroids.T
+        target_index = np.array([self.labels.index(t) for t in targets])
+        self.temperature = min(
+            _TEMPERATURES,
+            key=lambda temp: _nll(similarities / temp, target_index),
+        )
+        return self
+
+    def predict(self, text: str) -> Dict[str, float]:
+        vector = _normalize(np.asarray(self.embeddings.embed_query(text), dtype=np.float32))
+        probabilities = _softmax((self.centroids @ vector) / self.temperature)
+        return {label: float(p) for label, p in zip(self.labels, probabilities)}
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+def _nll(logits: np.ndarray, targets: np.ndarray) -> float:
+    probabilities = _softmax(logits)
+    return float(-np.log(probabilities[np.arange(len(targets)), targets] + 1e-12).mean())
@@ -0,0 +1,198 @@
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+from langchain_community.chat_models import ChatOllama
+from langchain_community.llms.ollama import OllamaEndpointNotFoundError
+from langchain_core.runnables import Runnable
+from requests.adapters import HTTPAdapter
+
+from app.metrics import span
+
+
+class ModelOverloadedError(RuntimeError):
+    """
+    Raised instead of queueing when the model has no capacity left; the API
+    turns it into a 503 with a Retry-After header.
+    """
+
+    def __init__(self, message: str, retry_after: int = 2):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def supports_batching(model: Any) -> bool:
+    """
+    True when the client overrides `batch` with something better than
+    LangChain's default one-thread-per-prompt fan-out. Wrappers answer for
+    the provider client(s) they forward to via `native_batch`.
+    """
+    native = getattr(model, "native_batch", None)
+    if native is not None:
+        return native
+    batch = getattr(type(model), "batch", None)
+    return batch is not None and batch is not Runnable.batch
+
+
+class GuardedChatModel:
+    """
+    Chat model client with a hard cap on in-flight calls and a bounded wait
+    queue. A caller that finds `max_queue` others already waiting, or that
+    waits longer than `queue_timeout` seconds for a slot, gets a
+    ModelOverloadedError at once instead of piling up behind a saturated
+    provider.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_concurrency: int = 4,
+        max_queue: int = 32,
+        queue_timeout: float = 10.0,
+        retry_after: int = 2,
+        provider: str = "",
+    ):
+        self.model = model
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.rejected = 0
+
+    def invoke(self, prompt: Any, **kwargs: Any) -> Any:
+        self._acquire()
+        try:
+            with span("llm", provider=self.provider):
+                return self.model.invoke(prompt, **kwargs)
+        finally:
+            self._slots.release()
+
+    def stream(self, prompt: Any, **kwargs: Any) -> Iterator[Any]:
+        self._acquire()
+        try:
+            with span("llm", provider=self.provider):
+                yield from self.model.stream(prompt, **kwargs)
+        finally:
+            self._slots.release()
+
+    @property
+    def native_batch(self) -> bool:
+        return supports_batching(self.model)
+
+    def batch(self, prompts: List[Any], config: Any = None, **kwargs: Any) -> List[Any]:
+        # One provider call, so one slot.
+        self._acquire()
+        try:
+            with span("llm", provider=self.provider):
+                return self.model.batch(prompts, config=config, **kwargs)
+        finally:
+            self._slots.release()
+
+    def _acquire(self) -> None:
+        if self._slots.acquire(blocking=False):
+            return
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise ModelOverloadedError(
+                    f"LLM queue full ({self.waiting} waiting)", self.retry_after
+                )
+            self.waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        if not acquired:
+            with self._lock:
+                self.rejected += 1
+            raise ModelOverloadedError(
+                f"No LLM slot within {self.queue_timeout:.0f}s", self.retry_after
+            )
+
+
+_sessions: Dict[tuple, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def pooled_session(base_url: str, pool_maxsize: int) -> requests.Session:
+    """
+    One keep-alive session per Ollama host, shared by every client in the
+    process.
+    """
+    key = (base_url, pool_maxsize)
+    with _sessions_lock:
+        if key not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return _sessions[key]
+
+
+class PooledChatOllama(ChatOllama):
+    """
+    ChatOllama posting through a pooled `requests.Session`; the stock client
+    calls `requests.post`, which opens a new connection for every call.
+    """
+
+    pool_maxsize: int = 8
+    timeout: Optional[float] = None
+
+    def _create_stream(
+        self,
+        api_url: str,
+        payload: Any,
+        stop: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        # Same request as ChatOllama._create_stream (langchain-community 0.2.10).
+        if self.stop is not None and stop is not None:
+            raise ValueError("`stop` found in both the input and default params.")
+        stop = self.stop if self.stop is not None else stop
+        params = self._default_params
+        for key in self._default_params:
+            if key in kwargs:
+                params[key] = kwargs[key]
+        if "options" in kwargs:
+            params["options"] = kwargs["options"]
+        else:
+            params["options"] = {
+                **params["options"],
+                "stop": stop,
+                **{k: v for k, v in kwargs.items() if k not in self._default_params},
+            }
+        if payload.get("messages"):
+            request_payload = {"messages": payload.get("messages", []), **params}
+        else:
+            request_payload = {
+                "prompt": payload.get("prompt"),
+                "images": payload.get("images", []),
+                **params,
+            }
+        response = pooled_session(self.base_url, self.pool_maxsize).post(
+            url=api_url,
+            headers={
+                "Content-Type": "application/json",
+                **(self.headers if isinstance(self.headers, dict) else {}),
+            },
+            json=request_payload,
+            stream=True,
+            timeout=self.timeout,
+        )
+        response.encoding = "utf-8"
+        if response.status_code == 404:
+            raise OllamaEndpointNotFoundError(
+                f"Ollama call failed with status code 404. Maybe you need to `ollama pull {self.model}`."
+            )
+        if response.status_code != 200:
+            raise ValueError(
+                f"Ollama call failed with status code {response.status_code}. "
+                f"Details: {response.text}"
+            )
+        return response.iter_lines(decode_unicode=True)
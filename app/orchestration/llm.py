@@ -1,35 +1,107 @@
-from typing import Any
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional
 
+from langchain.callbacks.base import BaseCallbackHandler
 from langchain.schema.language_model import BaseLanguageModel
 
 from app.config import Settings
+from app.orchestration.client import GuardedChatModel
 
 
-def get_chat_model(settings: Settings) -> BaseLanguageModel:
+@dataclass
+class LLMUsage:
+    calls: int = 0
+
+
+_usage: ContextVar[Optional[LLMUsage]] = ContextVar("llm_usage", default=None)
+
+
+def current_llm_usage() -> Optional[LLMUsage]:
+    return _usage.get()
+
+
+@contextmanager
+def count_llm_calls() -> Iterator[LLMUsage]:
+    """
+    Count model calls made in this context, including from worker threads that
+    copy it (see StageExecutor.run).
+    """
+    usage = LLMUsage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+class LLMCallCounter(BaseCallbackHandler):
+    """
+    Callback attached to every chat model; bumps the current LLMUsage, if any.
+    """
+
+    def on_llm_start(self, serialized, prompts, **kwargs: Any) -> None:
+        self._count(kwargs.get("metadata"))
+
+    def on_chat_model_start(self, serialized, messages, **kwargs: Any) -> None:
+        self._count(kwargs.get("metadata"))
+
+    @staticmethod
+    def _count(metadata: Optional[dict]) -> None:
+        # Batched calls run off the caller's context and carry its usage in
+        # the run metadata instead.
+        usage = (metadata or {}).get("llm_usage") or _usage.get()
+        if usage is not None:
+            usage.calls += 1
+
+
+def get_chat_model(
+    settings: Settings, provider: Optional[str] = None, model_name: Optional[str] = None
+) -> GuardedChatModel:
     """
-    Build a chat model client based on settings.
+    Build a chat model client based on settings (or an explicit provider and
+    model), capped at `LLM_MAX_CONCURRENCY` in-flight calls with a bounded
+    wait queue.
 
     Providers:
-    - ollama: local models via Ollama daemon.
+    - ollama: local models via Ollama daemon, over pooled keep-alive connections.
     - google: Gemini via Google Generative AI.
     Fallback: simple stub model for tests/dev.
     """
-    provider = settings.llm.provider.lower()
-    model_name = settings.llm.model
+    provider = (provider or settings.llm.provider).lower()
+    return GuardedChatModel(
+        _provider_model(settings, provider, model_name or settings.llm.model),
+        max_concurrency=settings.llm.max_concurrency,
+        max_queue=settings.llm.max_queue,
+        queue_timeout=settings.llm.queue_timeout_seconds,
+        retry_after=settings.llm.retry_after_seconds,
+        provider=provider,
+    )
+
+
+def _provider_model(settings: Settings, provider: str, model_name: str) -> BaseLanguageModel:
     common_kwargs: dict[str, Any] = {
         "temperature": settings.llm.temperature,
         "max_tokens": settings.llm.max_tokens,
+        "callbacks": [LLMCallCounter()],
     }
 
     if provider == "ollama":
         try:
-            from langchain_community.chat_models import ChatOllama
+            from app.orchestration.client import PooledChatOllama
         except Exception as exc:  # pragma: no cover - import guard
             raise RuntimeError(
                 "ChatOllama is not available. Install langchain-community."
             ) from exc
 
-        return ChatOllama(model=model_name, **common_kwargs)
+        return PooledChatOllama(
+            model=model_name,
+            keep_alive=settings.llm.keep_alive,
+            timeout=settings.llm.request_timeout_seconds,
+            pool_maxsize=settings.llm.pool_maxsize,
+            **common_kwargs,
+        )
 
     if provider == "google":
         try:
@@ -43,17 +115,66 @@ def get_chat_model(settings: Settings) -> BaseLanguageModel:
             model=model_name,
             google_api_key=settings.google_api_key,
             convert_system_message_to_human=True,
+            timeout=settings.llm.request_timeout_seconds,
             **common_kwargs,
         )
 
     # Lightweight stub for tests or unsupported providers
     try:
-        from langchain.chat_models.fake import FakeListChatModel
-        from langchain.schema import AIMessage
+        from langchain_community.chat_models.fake import FakeListChatModel
     except Exception:
         raise RuntimeError("LangChain is required for the fallback stub model.")
 
     return FakeListChatModel(
-        responses=[AIMessage(content="Hello from the fallback assistant.")],
-        **common_kwargs,
+        responses=["Hello from the fallback assistant."],
+        callbacks=common_kwargs["callbacks"],
+    )
+
+
+def parse_providers(spec: str) -> List[tuple[str, Optional[str]]]:
+    """
+    "google:gemini-1.5-flash, ollama" -> [("google", "gemini-1.5-flash"), ("ollama", None)]
+    """
+    providers = []
+    for item in spec.split(","):
+        if item.strip():
+            provider, _, model_name = item.strip().partition(":")
+            providers.append((provider.strip().lower(), model_name.strip() or None))
+    return providers
+
+
+def build_llm(settings: Settings) -> Any:
+    """
+    The chat model the agents use: `get_chat_model` behind the LLM scheduler.
+    With `LLM_FALLBACK_PROVIDERS` set, the scheduler drives a ModelRouter over
+    the primary and backup providers instead.
+    """
+    model: Any = get_chat_model(settings)
+    fallbacks = parse_providers(settings.llm.fallback_providers)
+    if fallbacks:
+        from app.orchestration.providers import ModelBackend, ModelRouter
+
+        backends = [ModelBackend(settings.llm.provider.lower(), model)]
+        for provider, model_name in fallbacks:
+            name = f"{provider}:{model_name}" if model_name else provider
+            backends.append(ModelBackend(name, get_chat_model(settings, provider, model_name)))
+        model = ModelRouter(
+            backends,
+            hedge=settings.llm.hedge_enabled,
+            hedge_percentile=settings.llm.hedge_percentile,
+            hedge_min_delay_ms=settings.llm.hedge_min_delay_ms,
+            max_error_rate=settings.llm.max_error_rate,
+            cooldown_seconds=settings.llm.unhealthy_cooldown_seconds,
+        )
+    if not settings.llm.scheduler_enabled:
+        return model
+    from app.orchestration.scheduler import LLMScheduler
+
+    return LLMScheduler(
+        model,
+        max_parallel=settings.llm.max_parallel,
+        batch_window_ms=settings.llm.batch_window_ms,
+        max_batch=settings.llm.max_batch,
+        max_queue=settings.llm.max_queue,
+        retry_after=settings.llm.retry_after_seconds,
     )
@@ -0,0 +1,339 @@
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from app.models.schemas import KitchenTicket, OrderItem, OrderJournalStats
+
+
+def dish_key(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+class KitchenState:
+    """
+    Live view of open orders, folded from journal records: the kitchen queue
+    (oldest first) and open item counts per dish and per table. Every record
+    changes it in O(items), so reads never touch the log.
+    """
+
+    def __init__(self):
+        self.queue: "OrderedDict[str, dict]" = OrderedDict()
+        self.dishes: Counter = Counter()
+        self.tables: Counter = Counter()
+
+    def apply(self, record: dict) -> None:
+        if record["type"] == "placed":
+            ticket = record["ticket"]
+            self.queue[ticket["reference"]] = ticket
+            self._count(ticket, 1)
+        elif record["type"] == "done":
+            ticket = self.queue.pop(record["reference"], None)
+            if ticket:
+                self._count(ticket, -1)
+
+    def _count(self, ticket: dict, sign: int) -> None:
+        for item in ticket["items"]:
+            _bump(self.dishes, dish_key(item["item"]), sign * item["quantity"])
+            if ticket.get("table"):
+                _bump(self.tables, ticket["table"], sign * item["quantity"])
+
+    def to_dict(self) -> dict:
+        return {"queue": list(self.queue.values())}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "KitchenState":
+        state = cls()
+        for ticket in data.get("queue", []):
+            state.apply({"type": "placed", "ticket": ticket})
+        return state
+
+
+def _bump(counter: Counter, key: str, delta: int) -> None:
+    counter[key] += delta
+    if counter[key] <= 0:
+        # Only open work is listed.
+        del counter[key]
+
+
+class OrderJournal:
+    """
+    Durable, append-only order log (JSON lines) with group commit.
+
+    Callers hand records to a single writer thread and block until their
+    record is on disk. The writer takes everything that queued up within
+    `commit_window_ms` and writes it with one fsync, so concurrent orders
+    share the cost of durability. Committed records are folded into
+    KitchenState in log order.
+
+    Every `snapshot_every` records the state is written to a snapshot
+    together with the log offset it covers. Startup loads the snapshot and
+    replays only the tail of the log. Without a `path` the journal is
+    memory-only.
+
+    A batch whose write or fsync fails is cut off the log again, so later
+    records never follow a torn line; if that fails too, the journal refuses
+    further writes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        snapshot_every: int = 1000,
+        commit_window_ms: float = 2.0,
+        fsync: bool = True,
+    ):
+        self.path = Path(path) if path else None
+        self.snapshot_path = self.path.with_name(self.path.name + ".snapshot") if self.path else None
+        self.snapshot_every = snapshot_every
+        self.commit_window = commit_window_ms / 1000
+        self.fsync = fsync
+        self.state = KitchenState()
+        self._state_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[dict, Future]] = []
+        # References with a "done" record queued but not yet committed.
+        self._completing: set = set()
+        self._closed = False
+        self._failed: Optional[BaseException] = None
+        self.seq = 0
+        self.next_order = 1
+        self.batches = 0
+        self.fsyncs = 0
+        self.snapshot_seq = 0
+        self.recovered_records = 0
+        self.recovery_seconds = 0.0
+        self._file = None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._recover()
+            self._file = open(self.path, "ab")
+            self._writer = threading.Thread(target=self._run, name="order-journal", daemon=True)
+            self._writer.start()
+
+    def place(self, table: Optional[str], items: List[OrderItem]) -> KitchenTicket:
+        return self.place_many([(table, items)])[0]
+
+    def place_many(self, orders: List[Tuple[Optional[str], List[OrderItem]]]) -> List[KitchenTicket]:
+        """
+        Journal several orders as one contiguous group: they are queued
+        together, so they land in the same write and fsync.
+        """
+        tickets, futures = [], []
+        with self._cond:
+            for table, items in orders:
+                ticket = {
+                    "reference": f"ORD-{self.next_order:04d}",
+                    "table": table,
+                    "items": [item.model_dump() for item in items],
+                    "placed_at": time.time(),
+                }
+                self.next_order += 1
+                tickets.append(ticket)
+                futures.append(self._submit({"type": "placed", "ticket": ticket}))
+        for future in futures:
+            future.result()
+        return [KitchenTicket(**ticket) for ticket in tickets]
+
+    def complete(self, reference: str) -> Optional[KitchenTicket]:
+        """
+        Mark an open order served; None if it is unknown, already done, or
+        being completed by a concurrent call.
+        """
+        with self._cond:
+            with self._state_lock:
+                ticket = self.state.queue.get(reference)
+                if ticket is None or reference in self._completing:
+                    return None
+                self._completing.add(reference)
+            future = self._submit({"type": "done", "reference": reference})
+        future.result()
+        return KitchenTicket(**ticket)
+
+    def queue(self) -> List[KitchenTicket]:
+        with self._state_lock:
+            return [KitchenTicket(**ticket) for ticket in self.state.queue.values()]
+
+    def open_by_dish(self) -> dict:
+        with self._state_lock:
+            return dict(self.state.dishes.most_common())
+
+    def open_by_table(self) -> dict:
+        with self._state_lock:
+            return dict(self.state.tables)
+
+    def stats(self) -> OrderJournalStats:
+        with self._state_lock:
+            open_orders = len(self.state.queue)
+        return OrderJournalStats(
+            records=self.seq,
+            batches=self.batches,
+            fsyncs=self.fsyncs,
+            open_orders=open_orders,
+            snapshot_seq=self.snapshot_seq,
+            recovered_records=self.recovered_records,
+            recovery_seconds=self.recovery_seconds,
+        )
+
+    def close(self) -> None:
+        if not self._file:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        self._file.close()
+        self._file = None
+
+    def _submit(self, record: dict) -> Future:
+        # Called with _cond held, so sequence numbers follow log order.
+        if self._closed:
+            raise RuntimeError("Order journal is closed")
+        if self._failed:
+            with self._state_lock:
+                self._completing.discard(record.get("reference"))
+            raise RuntimeError(f"Order journal is unwritable: {self._failed}")
+        self.seq += 1
+        record["seq"] = self.seq
+        future: Future = Future()
+        if not self.path:
+            with self._state_lock:
+                self._apply(record)
+            future.set_result(record)
+            return future
+        self._pending.append((record, future))
+        self._cond.notify()
+        return future
+
+    def _run(self) -> None:
+        batch: List[Tuple[dict, Future]] = []
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._closed:
+                        self._cond.wait()
+                    if not self._pending:
+                        return
+                    # Let concurrent requests join this commit.
+                    deadline = time.monotonic() + self.commit_window
+                    while not self._closed and time.monotonic() < deadline:
+                        self._cond.wait(deadline - time.monotonic())
+                    batch, self._pending = self._pending, []
+                self._commit(batch)
+        except BaseException as exc:
+            # Without a writer nobody would resolve a future again: fail the
+            # waiting callers and refuse new writes.
+            print(f"[orders] journal writer died: {exc!r}")
+            with self._cond:
+                self._failed = exc
+                pending, self._pending = self._pending, []
+            self._fail([item for item in batch + pending if not item[1].done()], exc)
+
+    def _commit(self, batch: List[Tuple[dict, Future]]) -> None:
+        if self._failed:
+            self._fail(batch, RuntimeError(f"Order journal is unwritable: {self._failed}"))
+            return
+        offset = self._file.tell()
+        try:
+            self._file.write(b"".join(_encode(record) for record, _ in batch))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+                self.fsyncs += 1
+            self.batches += 1
+        except Exception as exc:
+            self._rollback(offset)
+            self._fail(batch, exc)
+            return
+        with self._state_lock:
+            for record, _ in batch:
+                self._apply(record)
+        for record, future in batch:
+            future.set_result(record)
+        last = batch[-1][0]["seq"]
+        if last - self.snapshot_seq >= self.snapshot_every:
+            try:
+                self._snapshot(last)
+            except Exception as exc:
+                # The log is still complete; recovery just replays more of it.
+                print(f"[orders] snapshot at seq {last} failed: {exc}")
+
+    def _apply(self, record: dict) -> None:
+        # Called with _state_lock held.
+        self.state.apply(record)
+        if record["type"] == "done":
+            self._completing.discard(record["reference"])
+
+    def _fail(self, batch: List[Tuple[dict, Future]], exc: BaseException) -> None:
+        with self._state_lock:
+            for record, _ in batch:
+                if record["type"] == "done":
+                    self._completing.discard(record["reference"])
+        for _, future in batch:
+            future.set_exception(exc)
+
+    def _rollback(self, offset: int) -> None:
+        # Drop whatever part of the failed batch reached the file (or is still
+        # buffered), so the next batch starts on a clean line.
+        try:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            os.truncate(self.path, offset)
+            self._file = open(self.path, "ab")
+        except OSError as exc:
+            with self._cond:
+                self._failed = exc
+            print(f"[orders] journal disabled, cannot roll back failed write: {exc}")
+
+    def _snapshot(self, seq: int) -> None:
+        with self._state_lock:
+            data = {
+                "seq": seq,
+                "offset": self._file.tell(),
+                "next_order": self.next_order,
+                "state": self.state.to_dict(),
+            }
+        tmp = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, self.snapshot_path)
+        self.snapshot_seq = seq
+
+    def _recover(self) -> None:
+        started = time.perf_counter()
+        offset = 0
+        if self.snapshot_path.exists():
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            self.state = KitchenState.from_dict(data["state"])
+            self.seq = self.snapshot_seq = data["seq"]
+            self.next_order = data["next_order"]
+            offset = data["offset"]
+        if self.path.exists():
+            with open(self.path, "rb+") as handle:
+                handle.seek(offset)
+                good = offset
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn write from a crash: the rest is unacknowledged
+                    good += len(line)
+                    if record["seq"] <= self.seq:
+                        continue
+                    self.state.apply(record)
+                    self.seq = record["seq"]
+                    if record["type"] == "placed":
+                        number = int(record["ticket"]["reference"].split("-")[1])
+                        self.next_order = max(self.next_order, number + 1)
+                    self.recovered_records += 1
+                handle.truncate(good)
+        self.recovery_seconds = time.perf_counter() - started
+
+
+def _encode(record: dict) -> bytes:
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
@@ -0,0 +1,240 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Iterator, List, Optional
+
+from app.models.schemas import LLMBackendStats
+from app.orchestration.client import supports_batching
+
+_WINDOW = 200
+_MIN_SAMPLES = 20
+
+
+class ModelBackend:
+    """
+    One provider client plus a rolling window of its recent latencies and
+    failures.
+    """
+
+    def __init__(self, name: str, model: Any, window: int = _WINDOW):
+        self.name = name
+        self.model = model
+        self._latencies: deque = deque(maxlen=window)
+        self._outcomes: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.last_failure: Optional[float] = None
+        self.calls = 0
+        self.hedges_won = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append(seconds)
+            else:
+                self.last_failure = time.monotonic()
+
+    def won_hedge(self) -> None:
+        with self._lock:
+            self.hedges_won += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[int(q / 100 * (len(ordered) - 1))]
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    def healthy(self, max_error_rate: float, cooldown: float) -> bool:
+        # A failing backend is retried once its cooldown has passed.
+        if self.error_rate < max_error_rate or self.last_failure is None:
+            return True
+        return time.monotonic() - self.last_failure >= cooldown
+
+    def stats(self, max_error_rate: float, cooldown: float) -> LLMBackendStats:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return LLMBackendStats(
+            name=self.name,
+            healthy=self.healthy(max_error_rate, cooldown),
+            calls=self.calls,
+            error_rate=self.error_rate,
+            p50_ms=p50 * 1000 if p50 is not None else None,
+            p95_ms=p95 * 1000 if p95 is not None else None,
+            hedges_won=self.hedges_won,
+        )
+
+
+class ModelRouter:
+    """
+    Sends each call to the fastest healthy backend (by rolling p50), failing
+    over down the list on errors.
+
+    With hedging on, an `invoke` that has not answered within the primary's
+    `hedge_percentile` latency fires the same prompt at the runner-up and
+    returns whichever finishes first. The runner-up is the next healthy
+    backend; with none, the call is not hedged. The loser is cancelled if it
+    has not started; a call already on the wire runs to completion (a
+    blocking HTTP request cannot be interrupted) and its result only feeds
+    the latency window. Every hedge therefore costs one extra full request:
+    at the default p95 trigger, roughly 5% more load on the runner-up.
+    Backends without measured latency rank after measured ones, in
+    configuration order, and hedging waits for `_MIN_SAMPLES` measurements.
+    """
+
+    def __init__(
+        self,
+        backends: List[ModelBackend],
+        hedge: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_delay_ms: float = 100.0,
+        max_error_rate: float = 0.5,
+        cooldown_seconds: float = 30.0,
+    ):
+        if not backends:
+            raise ValueError("ModelRouter needs at least one backend")
+        self.backends = backends
+        self.hedge = hedge and len(backends) > 1
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay_ms / 1000
+        self.max_error_rate = max_error_rate
+        self.cooldown = cooldown_seconds
+        self._pool = ThreadPoolExecutor(
+            max_workers=4 * len(backends), thread_name_prefix="llm-backend"
+        )
+        self.hedged = 0
+        self._lock = threading.Lock()
+
+    def ranked(self) -> List[ModelBackend]:
+        def key(item):
+            position, backend = item
+            p50 = backend.percentile(50)
+            return (
+                not backend.healthy(self.max_error_rate, self.cooldown),
+                p50 if p50 is not None else float("inf"),
+                position,
+            )
+
+        return [backend for _, backend in sorted(enumerate(self.backends), key=key)]
+
+    def invoke(self, prompt: Any, **kwargs: Any) -> Any:
+        ranked = self.ranked()
+        if self.hedge:
+            delay = self.hedge_delay(ranked[0])
+            backup = next(
+                (b for b in ranked[1:] if b.healthy(self.max_error_rate, self.cooldown)), None
+            )
+            if delay is not None and backup is not None:
+                return self._hedged(prompt, ranked[0], backup, delay, kwargs)
+        last_error: Optional[Exception] = None
+        for backend in ranked:
+            try:
+                return self._call(backend, prompt, kwargs)
+            except Exception as exc:
+                last_error = exc
+        raise last_error
+
+    def stream(self, prompt: Any, **kwargs: Any) -> Iterator[Any]:
+        # Fails over only before the first chunk; a half-sent reply is final.
+        last_error: Optional[Exception] = None
+        for backend in self.ranked():
+            started = time.perf_counter()
+            chunks = iter(backend.model.stream(prompt, **kwargs))
+            try:
+                first = next(chunks)
+            except StopIteration:
+                backend.record(time.perf_counter() - started, True)
+                return
+            except Exception as exc:
+                backend.record(time.perf_counter() - started, False)
+                last_error = exc
+                continue
+            backend.record(time.perf_counter() - started, True)
+            yield first
+            yield from chunks
+            return
+        raise last_error
+
+    def hedge_delay(self, backend: ModelBackend) -> Optional[float]:
+        if backend.samples < _MIN_SAMPLES:
+            return None
+        return max(self.hedge_min_delay, backend.percentile(self.hedge_percentile))
+
+    def stats(self) -> List[LLMBackendStats]:
+        return [backend.stats(self.max_error_rate, self.cooldown) for backend in self.backends]
+
+    @property
+    def native_batch(self) -> bool:
+        # Failover must not turn a batched call into a fan-out.
+        return all(supports_batching(backend.model) for backend in self.backends)
+
+    def batch(self, prompts: List[Any], config: Any = None, **kwargs: Any) -> List[Any]:
+        """
+        One batched call to the best backend, failing over down the list; not
+        hedged.
+        """
+        last_error: Optional[Exception] = None
+        for backend in self.ranked():
+            started = time.perf_counter()
+            try:
+                results = backend.model.batch(prompts, config=config, **kwargs)
+            except Exception as exc:
+                backend.record(time.perf_counter() - started, False)
+                last_error = exc
+                continue
+            backend.record(time.perf_counter() - started, True)
+            return results
+        raise last_error
+
+    def _call(self, backend: ModelBackend, prompt: Any, kwargs: dict) -> Any:
+        started = time.perf_counter()
+        try:
+            result = backend.model.invoke(prompt, **kwargs)
+        except Exception:
+            backend.record(time.perf_counter() - started, False)
+            raise
+        backend.record(time.perf_counter() - started, True)
+        return result
+
+    def _submit(self, backend: ModelBackend, prompt: Any, kwargs: dict) -> Future:
+        # Each attempt gets its own copy of the caller's context.
+        ctx = contextvars.copy_context()
+        return self._pool.submit(ctx.run, self._call, backend, prompt, kwargs)
+
+    def _hedged(
+        self, prompt: Any, primary: ModelBackend, backup: ModelBackend, delay: float, kwargs: dict
+    ) -> Any:
+        attempts = {self._submit(primary, prompt, kwargs): primary}
+        done, _ = wait(attempts, timeout=delay)
+        if not done:
+            with self._lock:
+                self.hedged += 1
+            attempts[self._submit(backup, prompt, kwargs)] = backup
+        errors: List[Exception] = []
+        pending = set(attempts)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    if len(attempts) > 1:
+                        attempts[future].won_hedge()
+                    return future.result()
+                errors.append(future.exception())
+            if not pending and len(attempts) == 1:
+                # Primary failed before the hedge fired: fail over now.
+                attempts[self._submit(backup, prompt, kwargs)] = backup
+                pending = {f for f, b in attempts.items() if b is backup}
+        raise errors[-1]
@@ -0,0 +1,202 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from app.models.schemas import ReservationRequest, SlotAvailability
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    reference TEXT UNIQUE,
+    name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    guests INTEGER NOT NULL,
+    special_requests TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reservations_date_slot ON reservations (date, slot);
+CREATE TABLE IF NOT EXISTS slot_counts (
+    date TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    booked INTEGER NOT NULL,
+    PRIMARY KEY (date, slot)
+) WITHOUT ROWID;
+"""
+
+
+@dataclass
+class Booking:
+    reference: Optional[str]
+    date: str
+    slot: str
+    remaining: int
+
+    @property
+    def confirmed(self) -> bool:
+        return self.reference is not None
+
+
+def _check_guests(guests: int) -> None:
+    if guests < 1:
+        raise ValueError(f"A booking needs at least one guest, got {guests}")
+
+
+class ReservationStore:
+    """
+    Reservations in SQLite (WAL mode, so readers never wait on a writer and
+    several API workers can share one file).
+
+    Time is cut into `slot_minutes` slots and a booking holds its table for
+    `dining_minutes`, i.e. every slot it overlaps. `slot_counts` keeps the
+    guests booked per (date, slot), updated in the same transaction as the
+    insert, so an availability check is a few primary-key lookups instead of
+    a scan. References come from the autoincrement row id, so they are unique
+    across threads and processes.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        seats_per_slot: int = 40,
+        slot_minutes: int = 30,
+        dining_minutes: int = 90,
+        busy_timeout: float = 5.0,
+    ):
+        self.path = str(path)
+        self.seats_per_slot = seats_per_slot
+        self.slot_minutes = slot_minutes
+        self.dining_slots = max(1, -(-dining_minutes // slot_minutes))
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        # An in-memory database exists per connection, so it gets exactly one.
+        self._shared: Optional[sqlite3.Connection] = None
+        self._shared_lock = threading.Lock()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def book(self, payload: ReservationRequest) -> Booking:
+        date, slots = self._slots(payload.date, payload.time)
+        with self._transaction() as conn:
+            return self._book(conn, payload, date, slots)
+
+    def book_many(self, payloads: List[ReservationRequest]) -> List[Optional[Booking]]:
+        """
+        Book a batch in one transaction (one lock, one commit). Each booking
+        sees the seats taken by the ones before it; malformed date/time or a
+        guest count below one gives None for that item and does not affect
+        the rest.
+        """
+        parsed = []
+        for payload in payloads:
+            try:
+                _check_guests(payload.guests)
+                parsed.append(self._slots(payload.date, payload.time))
+            except ValueError:
+                parsed.append(None)
+        with self._transaction() as conn:
+            return [
+                self._book(conn, payload, *slots) if slots else None
+                for payload, slots in zip(payloads, parsed)
+            ]
+
+    def _book(
+        self, conn: sqlite3.Connection, payload: ReservationRequest, date: str, slots: List[str]
+    ) -> Booking:
+        # A negative count would free seats in slot_counts.
+        _check_guests(payload.guests)
+        remaining = self._remaining(conn, date, slots)
+        if payload.guests > remaining:
+            return Booking(reference=None, date=date, slot=slots[0], remaining=remaining)
+        cursor = conn.execute(
+            "INSERT INTO reservations (name, date, slot, guests, special_requests, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (payload.name, date, slots[0], payload.guests, payload.special_requests, time.time()),
+        )
+        reference = f"RSV-{cursor.lastrowid:04d}"
+        conn.execute("UPDATE reservations SET reference = ? WHERE id = ?", (reference, cursor.lastrowid))
+        conn.executemany(
+            "INSERT INTO slot_counts (date, slot, booked) VALUES (?, ?, ?) "
+            "ON CONFLICT (date, slot) DO UPDATE SET booked = booked + excluded.booked",
+            [(date, slot, payload.guests) for slot in slots],
+        )
+        return Booking(reference=reference, date=date, slot=slots[0], remaining=remaining - payload.guests)
+
+    def availability(self, date: str, at: str, guests: int = 1) -> SlotAvailability:
+        date, slots = self._slots(date, at)
+        with self._connection() as conn:
+            remaining = self._remaining(conn, date, slots)
+        return SlotAvailability(
+            date=date, slot=slots[0], guests=guests, available=guests <= remaining, remaining=remaining
+        )
+
+    def count(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM reservations").fetchone()[0]
+
+    def _remaining(self, conn: sqlite3.Connection, date: str, slots: List[str]) -> int:
+        booked = 0
+        for slot in slots:
+            row = conn.execute(
+                "SELECT booked FROM slot_counts WHERE date = ? AND slot = ?", (date, slot)
+            ).fetchone()
+            booked = max(booked, row[0] if row else 0)
+        return self.seats_per_slot - booked
+
+    def _slots(self, date: str, at: str) -> tuple:
+        """
+        Normalize to (YYYY-MM-DD, [HH:MM slot starts the booking covers]);
+        raises ValueError on malformed input.
+        """
+        moment = datetime.strptime(f"{date} {at}", "%Y-%m-%d %H:%M")
+        minutes = moment.hour * 60 + moment.minute
+        first = minutes - minutes % self.slot_minutes
+        slots = []
+        for index in range(self.dining_slots):
+            start = first + index * self.slot_minutes
+            if start >= 24 * 60:
+                break
+            slots.append(f"{start // 60:02d}:{start % 60:02d}")
+        return moment.strftime("%Y-%m-%d"), slots
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        if self.path == ":memory:":
+            with self._shared_lock:
+                if self._shared is None:
+                    self._shared = self._connect()
+                yield self._shared
+            return
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        yield conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connection() as conn:
+            # IMMEDIATE takes the write lock up front, so the capacity check
+            # and the counter update cannot interleave with another booking.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
@@ -1,49 +1,140 @@
-from dataclasses import dataclass
+import json
+import re
+from dataclasses import dataclass, field
 from typing import Dict, Optional
 
 from langchain.schema.language_model import BaseLanguageModel
 
+from app.metrics import span
+
 
 INTENTS = ("reservation", "order", "menu", "general", "fallback")
 
+# Intents whose reply can come straight from the routing call; menu needs
+# retrieved context and general is answered from static info.
+REPLY_INTENTS = ("reservation", "order", "fallback")
+
+COMBINED_PROMPT = (
+    "You are a concise restaurant assistant. Classify the user request and reply "
+    "with a single JSON object and nothing else:\n"
+    '{{"intent": "reservation|order|menu|general|fallback", "reply": "..."}}\n'
+    "- reservation: confirm the reservation details in one short sentence.\n"
+    "- order: summarize the order and confirm politely in one sentence.\n"
+    "- menu or general: leave reply empty.\n"
+    "- anything else: intent fallback with a brief helpful reply.\n"
+    "User: {text}"
+)
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+_JSON_FIELD = r'"{name}"\s*:\s*"((?:[^"\\]|\\.)*)"'
+
 
 @dataclass
 class IntentResult:
     intent: str
     score: float
     reason: str = ""
+    scores: Dict[str, float] = field(default_factory=dict)
+    reply: Optional[str] = None
+
+
+def parse_route_reply(content: str) -> tuple[str, Optional[str]]:
+    """
+    Pull `(intent, reply)` out of a combined routing response. Tolerates code
+    fences, prose around the JSON object, truncated JSON and bare labels;
+    anything unrecognised is ("fallback", None).
+    """
+    text = content.strip()
+    data: dict = {}
+    match = _JSON_OBJECT.search(text)
+    if match:
+        try:
+            parsed = json.loads(match.group(0))
+            data = parsed if isinstance(parsed, dict) else {}
+        except ValueError:
+            data = {}
+    if not data:
+        for name in ("intent", "reply"):
+            found = re.search(_JSON_FIELD.format(name=name), text)
+            if found:
+                data[name] = json.loads(f'"{found.group(1)}"')
+    if not data and text:
+        data = {"intent": text.split()[0]}
+    label = str(data.get("intent") or "").strip().strip(".").lower()
+    if label not in INTENTS:
+        return "fallback", None
+    reply = data.get("reply")
+    reply = reply.strip() if isinstance(reply, str) and reply.strip() else None
+    return label, reply
 
 
 class IntentRouter:
     """
-    Lightweight intent classifier using heuristics with optional LLM fallback.
+    Lightweight intent classifier: keyword heuristics, then an optional
+    embedding classifier, with the LLM only as a last resort.
+
+    With `combined=True` the LLM call also drafts the reply, so the
+    orchestrator can answer reservation/order/fallback turns without a
+    second round trip.
     """
 
-    def __init__(self, model: Optional[BaseLanguageModel] = None):
+    def __init__(
+        self,
+        model: Optional[BaseLanguageModel] = None,
+        classifier=None,
+        min_confidence: float = 0.6,
+        combined: bool = False,
+    ):
         self.model = model
+        self.combined = combined
+        self.classifier = classifier
+        self.min_confidence = min_confidence
         self.keyword_map: Dict[str, set[str]] = {
             "reservation": {"reserve", "book", "table", "reservation", "booking"},
             "order": {"order", "takeaway", "delivery", "pickup", "dish"},
             "menu": {"menu", "ingredient", "allergen", "special", "promo"},
             "general": {"hours", "opening", "location", "address", "parking"},
         }
+        self._keyword_intent = {
+            kw: intent for intent, keywords in self.keyword_map.items() for kw in keywords
+        }
+        # One pass over the text; keywords must start a word ("book" matches
+        # "booking" but not "facebook"). Longest alternatives first.
+        alternatives = sorted(self._keyword_intent, key=len, reverse=True)
+        self._keyword_pattern = re.compile(
+            r"\b(" + "|".join(map(re.escape, alternatives)) + r")\w*", re.IGNORECASE
+        )
 
     def heuristic_route(self, text: str) -> IntentResult:
-        lower = text.lower()
         scores = {intent: 0 for intent in INTENTS}
-        for intent, keywords in self.keyword_map.items():
-            for kw in keywords:
-                if kw in lower:
-                    scores[intent] += 1
+        for kw in {m.lower() for m in self._keyword_pattern.findall(text)}:
+            scores[self._keyword_intent[kw]] += 1
         best_intent = max(scores, key=scores.get)
         max_score = scores[best_intent]
         if max_score == 0:
             return IntentResult(intent="fallback", score=0, reason="no keyword hit")
         return IntentResult(intent=best_intent, score=max_score, reason="keyword match")
 
+    def classifier_route(self, text: str) -> Optional[IntentResult]:
+        if not self.classifier:
+            return None
+        try:
+            scores = self.classifier.predict(text)
+        except Exception:
+            return None
+        best_intent = max(scores, key=scores.get)
+        return IntentResult(
+            intent=best_intent,
+            score=scores[best_intent],
+            reason="embedding classifier",
+            scores=scores,
+        )
+
     def llm_route(self, text: str) -> Optional[IntentResult]:
         if not self.model:
             return None
+        if self.combined:
+            return self.llm_route_and_reply(text)
         prompt = (
             "Classify the user request into one of: reservation, order, menu, general.\n"
             f"User: {text}\nReturn the intent only."
@@ -57,9 +148,29 @@ class IntentRouter:
         except Exception:
             return None
 
+    def llm_route_and_reply(self, text: str) -> Optional[IntentResult]:
+        try:
+            response = self.model.invoke(COMBINED_PROMPT.format(text=text))
+        except Exception:
+            return None
+        label, reply = parse_route_reply(response.content)
+        return IntentResult(
+            intent=label,
+            score=0.5,
+            reason="llm classification",
+            reply=reply if label in REPLY_INTENTS else None,
+        )
+
     def route(self, text: str) -> IntentResult:
-        heuristic = self.heuristic_route(text)
-        if heuristic.intent != "fallback":
-            return heuristic
-        llm_guess = self.llm_route(text)
-        return llm_guess or heuristic
+        # The span's path is the last tier that ran, i.e. what the call cost.
+        with span("route", path="heuristic") as timing:
+            heuristic = self.heuristic_route(text)
+            if heuristic.intent != "fallback":
+                return heuristic
+            timing.path = "classifier"
+            classified = self.classifier_route(text)
+            if classified and classified.score >= self.min_confidence:
+                return classified
+            timing.path = "llm"
+            llm_guess = self.llm_route(text)
+            return llm_guess or classified or heuristic
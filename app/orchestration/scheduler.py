@@ -0,0 +1,215 @@
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterator, List, Optional
+
+from app.models.schemas import LLMSchedulerStats
+from app.orchestration.client import ModelOverloadedError, supports_batching
+from app.orchestration.llm import current_llm_usage
+
+_WAIT_SAMPLES = 512
+
+
+@dataclass
+class _Ticket:
+    prompt: Any
+    stream: bool = False
+    kwargs: dict = field(default_factory=dict)
+    enqueued: float = field(default_factory=time.monotonic)
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+    future: Future = field(default_factory=Future)
+
+
+class LLMScheduler:
+    """
+    Sits between the agents and the chat model so a burst of requests reaches
+    the provider in arrival order and at a bounded rate.
+
+    Every `invoke`/`stream` becomes a ticket on one FIFO queue. A dispatcher
+    thread hands out at most `max_parallel` slots in that order. Providers with
+    a native `batch` get the prompts collected within `batch_window_ms` in a
+    single call (one slot). Others are pipelined, one prompt per slot. Streams
+    hold their slot until the caller has consumed them. Calls with keyword
+    arguments (stop sequences, ...) are forwarded as given and never batched,
+    since a batch shares one set of options. With `max_queue` set,
+    submissions beyond that backlog fail fast with ModelOverloadedError.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        max_parallel: int = 4,
+        batch_window_ms: float = 10.0,
+        max_batch: int = 8,
+        batching: Optional[bool] = None,
+        max_queue: Optional[int] = None,
+        retry_after: int = 2,
+    ):
+        self.model = model
+        self.max_parallel = max_parallel
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self.batching = supports_batching(model) if batching is None else batching
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._queue: "queue.Queue[_Ticket]" = queue.Queue()
+        self._slots = threading.BoundedSemaphore(max_parallel)
+        self._pool = ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix="llm-call")
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._waits: deque = deque(maxlen=_WAIT_SAMPLES)
+        self.queue_depth = 0  # submitted, not yet given a slot
+        self.max_queue_depth = 0
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_prompts = 0
+
+    def invoke(self, prompt: Any, **kwargs: Any) -> Any:
+        return self._submit(_Ticket(prompt, kwargs=kwargs)).result()
+
+    def stream(self, prompt: Any, **kwargs: Any) -> Iterator[Any]:
+        self._submit(_Ticket(prompt, stream=True)).result()  # wait for a slot
+        failed = 0
+        try:
+            yield from self.model.stream(prompt, **kwargs)
+        except Exception:
+            failed = 1
+            raise
+        finally:
+            self._finish(failed=failed)
+
+    def stats(self) -> LLMSchedulerStats:
+        with self._lock:
+            waits = sorted(self._waits)
+            return LLMSchedulerStats(
+                batching=self.batching,
+                max_parallel=self.max_parallel,
+                queue_depth=self.queue_depth,
+                max_queue_depth=self.max_queue_depth,
+                in_flight=self.in_flight,
+                submitted=self.submitted,
+                completed=self.completed,
+                failed=self.failed,
+                rejected=self.rejected,
+                batches=self.batches,
+                mean_batch_size=self.batched_prompts / self.batches if self.batches else 0.0,
+                mean_wait_ms=1000 * sum(waits) / len(waits) if waits else 0.0,
+                p95_wait_ms=1000 * waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                max_wait_ms=1000 * waits[-1] if waits else 0.0,
+            )
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)
+
+    def _submit(self, ticket: _Ticket) -> Future:
+        self._ensure_worker()
+        with self._lock:
+            if self.max_queue is not None and self.queue_depth >= self.max_queue:
+                self.rejected += 1
+                raise ModelOverloadedError(
+                    f"LLM queue full ({self.queue_depth} waiting)", self.retry_after
+                )
+            self.submitted += 1
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            self._queue.put(ticket)
+        return ticket.future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="llm-scheduler", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self) -> None:
+        held: Optional[_Ticket] = None
+        while True:
+            ticket = held or self._queue.get()
+            held = None
+            batch = [ticket]
+            if self.batching and not ticket.stream and not ticket.kwargs:
+                held = self._collect(batch)
+            self._slots.acquire()
+            self._started(batch)
+            if ticket.stream:
+                ticket.future.set_result(True)
+            elif len(batch) > 1:
+                self._pool.submit(self._call_batch, batch)
+            else:
+                self._pool.submit(self._call_one, ticket)
+
+    def _collect(self, batch: List[_Ticket]) -> Optional[_Ticket]:
+        # Returns a ticket that cannot join the batch (a stream, or a call
+        # with its own options) met while collecting; it is dispatched next.
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                ticket = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if ticket.stream or ticket.kwargs:
+                return ticket
+            batch.append(ticket)
+        return None
+
+    def _started(self, batch: List[_Ticket]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.queue_depth -= len(batch)
+            self.in_flight += 1
+            self.batches += 1
+            self.batched_prompts += len(batch)
+            self._waits.extend(now - ticket.enqueued for ticket in batch)
+
+    def _call_one(self, ticket: _Ticket) -> None:
+        try:
+            # Run in the caller's context so request-scoped state (LLM call
+            # counting, ...) sees this call.
+            result = ticket.context.run(self.model.invoke, ticket.prompt, **ticket.kwargs)
+        except Exception as exc:
+            ticket.future.set_exception(exc)
+            self._finish(failed=1)
+            return
+        ticket.future.set_result(result)
+        self._finish()
+
+    def _call_batch(self, batch: List[_Ticket]) -> None:
+        configs = [
+            {"metadata": {"llm_usage": ticket.context.run(current_llm_usage)}} for ticket in batch
+        ]
+        try:
+            results = self.model.batch(
+                [ticket.prompt for ticket in batch], config=configs, return_exceptions=True
+            )
+        except Exception as exc:
+            results = [exc] * len(batch)
+        failed = 0
+        for ticket, result in zip(batch, results):
+            if isinstance(result, Exception):
+                failed += 1
+                ticket.future.set_exception(result)
+            else:
+                ticket.future.set_result(result)
+        self._finish(done=len(batch), failed=failed)
+
+    def _finish(self, done: int = 1, failed: int = 0) -> None:
+        # Releases the slot of one dispatched call covering `done` prompts.
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += done
+            self.failed += failed
+        self._slots.release()
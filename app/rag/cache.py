@@ -0,0 +1,186 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app.models.schemas import CacheStats, MenuAnswer
+
+
+def normalize_question(question: str) -> str:
+    """
+    Case-fold, drop punctuation and collapse whitespace so trivially different
+    phrasings of the same question share a cache key.
+    """
+    cleaned = re.sub(r"[^\w\s]", " ", question.lower())
+    return " ".join(cleaned.split())
+
+
+@dataclass
+class _Entry:
+    answer: MenuAnswer
+    created: float
+    vector: Optional[np.ndarray] = field(default=None, repr=False)
+
+
+class AnswerCache:
+    """
+    Bounded LRU + TTL cache of menu answers.
+
+    Lookups match the normalized question first, then fall back to cosine
+    similarity between query embeddings when `embed_fn` is provided. The
+    normalized form is only the dict key; `embed_fn` gets the question as
+    asked, so a shared EmbeddingService caches the same vector retrieval uses. When
+    `version_fn` reports a new vector store version (e.g. after re-ingestion)
+    every entry is dropped. Lookups poll it at most every
+    `version_check_seconds`; `put` always re-checks and drops an answer whose
+    miss was looked up before the version changed, since it may have been
+    generated from the old store.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+        similarity_threshold: float = 0.92,
+        embed_fn: Optional[Callable[[str], List[float]]] = None,
+        version_fn: Optional[Callable[[], Optional[str]]] = None,
+        version_check_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embed_fn = embed_fn
+        self.version_fn = version_fn
+        self.version_check_seconds = version_check_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Generation (bumped on invalidation) at which each pending miss was
+        # looked up, so `put` can tell answers built from an old store.
+        self._misses: "OrderedDict[str, int]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._version = version_fn() if version_fn else None
+        self._version_checked = clock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, question: str, semantic: bool = True) -> Optional[MenuAnswer]:
+        """
+        Exact match on the normalized question, then (with `semantic` and an
+        `embed_fn`) the most similar cached question.
+        """
+        key = normalize_question(question)
+        self._check_version()
+        with self._lock:
+            entry = self._live_entry(key)
+            if entry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.answer
+            if not semantic or not self.embed_fn or not self._entries:
+                self._miss(key)
+                return None
+
+        vector = self._embed(question)
+        with self._lock:
+            match = self._nearest(vector)
+            if match:
+                self._entries.move_to_end(match)
+                self.semantic_hits += 1
+                return self._entries[match].answer
+            self._miss(key)
+            return None
+
+    def put(self, question: str, answer: MenuAnswer, embed: bool = True) -> None:
+        """
+        Store an answer; with `embed` false it can only be found by exact
+        match, but storing costs no embedding call.
+        """
+        if self.max_entries <= 0:
+            return
+        key = normalize_question(question)
+        vector = self._embed(question) if self.embed_fn and embed else None
+        self._check_version(force=True)
+        with self._lock:
+            if self._misses.pop(key, self._generation) != self._generation:
+                return
+            self._entries[key] = _Entry(answer=answer, created=self._clock(), vector=vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            lookups = self.hits + self.semantic_hits + self.misses
+            return CacheStats(
+                size=len(self._entries),
+                hits=self.hits,
+                semantic_hits=self.semantic_hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                invalidations=self.invalidations,
+                hit_rate=(self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+            )
+
+    def _miss(self, key: str) -> None:
+        self.misses += 1
+        self._misses[key] = self._generation
+        self._misses.move_to_end(key)
+        while len(self._misses) > self.max_entries:
+            self._misses.popitem(last=False)
+
+    def _check_version(self, force: bool = False) -> None:
+        # version_fn may read a file; keep it outside the lock and rate-limited.
+        if not self.version_fn:
+            return
+        now = self._clock()
+        with self._lock:
+            if not force and now - self._version_checked < self.version_check_seconds:
+                return
+            self._version_checked = now
+        version = self.version_fn()
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._generation += 1
+                if self._entries:
+                    self._entries.clear()
+                    self.invalidations += 1
+
+    def _live_entry(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry and self._clock() - entry.created > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        return entry
+
+    def _nearest(self, vector: np.ndarray) -> Optional[str]:
+        now = self._clock()
+        expired = [k for k, e in self._entries.items() if now - e.created > self.ttl_seconds]
+        for key in expired:
+            del self._entries[key]
+        keys = [k for k, e in self._entries.items() if e.vector is not None]
+        if not keys:
+            return None
+        matrix = np.stack([self._entries[k].vector for k in keys])
+        scores = matrix @ vector
+        best = int(np.argmax(scores))
+        return keys[best] if scores[best] >= self.similarity_threshold else None
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embed_fn(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
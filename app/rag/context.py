@@ -0,0 +1,136 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from langchain.schema import Document
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_WORD = re.compile(r"\w+")
+
+# Instructions first and byte-identical across requests, so a local model can
+# reuse the cached prefix; per-request context and question go last.
+MENU_QA_PREFIX = (
+    "You are a restaurant assistant. Answer the guest's question clearly and "
+    "briefly, using only the menu context below. If the context does not "
+    "contain the answer, say so.\n\n"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token count: words and punctuation marks, plus a third for sub-word
+    splits. A fast stand-in for the model's own tokenizer when budgeting.
+    """
+    pieces = len(_TOKEN.findall(text))
+    return pieces + (pieces + 2) // 3
+
+
+@dataclass
+class BuiltContext:
+    text: str
+    documents: List[Document] = field(default_factory=list)
+    tokens: int = 0
+
+
+class ContextBuilder:
+    """
+    Turn ranked retrieval hits into a compact context block.
+
+    Chunks from the same source (and page) that overlap or touch, going by
+    their `start_index`, are stitched back into one passage. Passages that
+    mostly repeat an earlier one are dropped, and the rest are added in rank
+    order until `max_tokens` is spent; the passage that crosses the budget is
+    cut at a word boundary.
+    """
+
+    def __init__(self, max_tokens: int = 600, duplicate_threshold: float = 0.85):
+        self.max_tokens = max_tokens
+        self.duplicate_threshold = duplicate_threshold
+
+    def build(self, docs: List[Document]) -> BuiltContext:
+        passages = self.merge(docs)
+        passages = self.deduplicate(passages)
+        kept: List[Document] = []
+        parts: List[str] = []
+        used = 0
+        for doc in passages:
+            cost = estimate_tokens(doc.page_content)
+            if used + cost > self.max_tokens:
+                text = _truncate(doc.page_content, self.max_tokens - used)
+                if text:
+                    parts.append(text)
+                    kept.append(doc)
+                    used += estimate_tokens(text)
+                break
+            parts.append(doc.page_content)
+            kept.append(doc)
+            used += cost
+        return BuiltContext(text="\n\n".join(parts), documents=kept, tokens=used)
+
+    @staticmethod
+    def merge(docs: List[Document]) -> List[Document]:
+        """
+        Stitch overlapping/adjacent chunks of the same source; the merged
+        passage takes the rank of its best-ranked chunk.
+        """
+        groups: dict = {}
+        loose: List[tuple] = []
+        for rank, doc in enumerate(docs):
+            start = doc.metadata.get("start_index")
+            if start is None:
+                loose.append((rank, doc))
+                continue
+            key = (doc.metadata.get("source"), doc.metadata.get("page"))
+            groups.setdefault(key, []).append((start, rank, doc))
+
+        merged: List[tuple] = list(loose)
+        for chunks in groups.values():
+            chunks.sort(key=lambda item: item[0])
+            start, rank, doc = chunks[0]
+            text, end = doc.page_content, start + len(doc.page_content)
+            for next_start, next_rank, next_doc in chunks[1:]:
+                next_end = next_start + len(next_doc.page_content)
+                if next_start <= end:
+                    text += next_doc.page_content[end - next_start :] if next_end > end else ""
+                elif next_start - end <= 2:
+                    # Adjacent: only the whitespace the splitter trimmed in between.
+                    text += " " + next_doc.page_content
+                else:
+                    merged.append((rank, _passage(doc, text, start)))
+                    start, rank, doc, text = next_start, next_rank, next_doc, next_doc.page_content
+                    end = next_end
+                    continue
+                rank = min(rank, next_rank)
+                end = max(end, next_end)
+            merged.append((rank, _passage(doc, text, start)))
+        merged.sort(key=lambda item: item[0])
+        return [doc for _, doc in merged]
+
+    def deduplicate(self, docs: List[Document]) -> List[Document]:
+        kept: List[Document] = []
+        seen: List[set] = []
+        for doc in docs:
+            words = set(_WORD.findall(doc.page_content.lower()))
+            if any(_containment(words, other) >= self.duplicate_threshold for other in seen):
+                continue
+            kept.append(doc)
+            seen.append(words)
+        return kept
+
+
+def _passage(doc: Document, text: str, start: int) -> Document:
+    return Document(page_content=text, metadata={**doc.metadata, "start_index": start})
+
+
+def _containment(words: set, other: set) -> float:
+    # Share of this passage's vocabulary already present in another passage.
+    return len(words & other) / len(words) if words else 1.0
+
+
+def _truncate(text: str, budget: int) -> Optional[str]:
+    if budget < 16:
+        return None
+    cut = text
+    while cut and estimate_tokens(cut) > budget:
+        cut = cut[: int(len(cut) * budget / estimate_tokens(cut))].rsplit(" ", 1)[0]
+    return cut.rstrip() or None
@@ -0,0 +1,166 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Optional
+
+from langchain.schema.embeddings import Embeddings
+from langchain_community.embeddings import HuggingFaceEmbeddings
+
+from app.config import Settings, get_settings
+from app.models.schemas import EmbeddingStats
+from app.rag.cache import normalize_question
+
+
+class EmbeddingService(Embeddings):
+    """
+    Process-wide query embedding front end shared by retrieval, the answer
+    cache and intent routing.
+
+    Query vectors are kept in a bounded LRU keyed by normalized text; the
+    model always embeds the text as asked (first spelling wins). Cache
+    misses that arrive within `batch_window_ms` of each other are coalesced
+    into a single `embed_documents` forward pass on a background thread.
+    Document embedding (ingestion) is passed straight through.
+    """
+
+    def __init__(
+        self,
+        model: Embeddings,
+        cache_size: int = 1024,
+        batch_window_ms: float = 5.0,
+        max_batch: int = 32,
+    ):
+        self.model = model
+        self.cache_size = cache_size
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[tuple[str, str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.batched_queries = 0
+        self.max_batch_seen = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = normalize_question(text) or text
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return vector
+            self.misses += 1
+        if self.batch_window <= 0:
+            vector = self.model.embed_query(text)
+            self._record_batch(1)
+            self._store(key, vector)
+            return vector
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((key, text, future))
+        return future.result()
+
+    def stats(self) -> EmbeddingStats:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return EmbeddingStats(
+                size=len(self._cache),
+                hits=self.hits,
+                misses=self.misses,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+                batches=self.batches,
+                mean_batch_size=self.batched_queries / self.batches if self.batches else 0.0,
+                max_batch_size=self.max_batch_seen,
+            )
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(
+                        target=self._run, name="embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._embed_batch(batch)
+
+    def _embed_batch(self, batch: List[tuple]) -> None:
+        # Questions with the same cache key share one slot in the forward pass.
+        texts = {}
+        for key, text, _ in batch:
+            texts.setdefault(key, text)
+        try:
+            vectors = dict(zip(texts, self.model.embed_documents(list(texts.values()))))
+        except Exception as exc:
+            for _, _, future in batch:
+                future.set_exception(exc)
+            return
+        self._record_batch(len(texts))
+        for key, vector in vectors.items():
+            self._store(key, vector)
+        for key, _, future in batch:
+            future.set_result(vectors[key])
+
+    def _record_batch(self, size: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_queries += size
+            self.max_batch_seen = max(self.max_batch_seen, size)
+
+    def _store(self, key: str, vector: List[float]) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def build_embeddings(settings: Optional[Settings] = None) -> EmbeddingService:
+    """
+    Return the process-wide embedding service, loading the model on first use.
+    """
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                settings = settings or get_settings()
+                # Small, CPU-friendly embedding model that works offline.
+                model = HuggingFaceEmbeddings(model_name=settings.rag.embedding_model)
+                _service = EmbeddingService(
+                    model,
+                    cache_size=settings.rag.embedding_cache_size,
+                    batch_window_ms=settings.rag.embedding_batch_window_ms,
+                    max_batch=settings.rag.embedding_max_batch,
+                )
+    return _service
+
+
+def loaded_embedding_service() -> Optional[EmbeddingService]:
+    # Does not load the model; None until something has called build_embeddings.
+    return _service
@@ -1,73 +1,336 @@
+import hashlib
+import json
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
+from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import DirectoryLoader, TextLoader
+from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders.pdf import PyPDFLoader
 from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
 
 from app.config import Settings
+from app.rag.embeddings import build_embeddings
+from app.rag.lexical import BM25Index
+from app.rag.numpy_store import NumpyVectorStore
 
 
-def _build_loader(path: Path) -> DirectoryLoader:
+VERSION_FILE = "STORE_VERSION"
+MANIFEST_FILE = "manifest.json"
+SUPPORTED_SUFFIXES = {".txt", ".md", ".pdf"}
+VECTOR_BACKENDS = ("chroma", "numpy")
+
+VectorStore = Union[Chroma, NumpyVectorStore]
+
+
+@dataclass
+class IngestReport:
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    chunks_added: int = 0
+    chunks_deleted: int = 0
+    documents_loaded: int = 0
+    elapsed_seconds: float = 0.0
+    full: bool = False
+    dry_run: bool = False
+    persist_directory: Optional[Path] = None
+    vectordb: Optional[VectorStore] = None
+    lexical_index: Optional[BM25Index] = None
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    @property
+    def docs_per_sec(self) -> float:
+        return self.documents_loaded / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def chunks_per_sec(self) -> float:
+        return self.chunks_added / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def store_version(persist_dir: Path) -> Optional[str]:
+    """
+    Identifier of the current vector store build; changes on every ingestion.
+    """
+    marker = Path(persist_dir) / VERSION_FILE
+    try:
+        return marker.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def _bump_store_version(persist_dir: Path) -> str:
+    version = uuid.uuid4().hex
+    (Path(persist_dir) / VERSION_FILE).write_text(version, encoding="utf-8")
+    return version
+
+
+def _manifest_path(persist_dir: Path, backend: str = "chroma") -> Path:
+    # Each backend tracks its own chunks, so switching backends re-ingests.
+    name = MANIFEST_FILE if backend == "chroma" else f"manifest.{backend}.json"
+    return Path(persist_dir) / name
+
+
+def load_manifest(persist_dir: Path, backend: str = "chroma") -> Optional[Dict[str, dict]]:
+    """
+    Per-file content hashes and chunk IDs from the previous ingestion run, or
+    None when the store was never ingested incrementally.
+    """
+    path = _manifest_path(persist_dir, backend)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(
+    persist_dir: Path, manifest: Dict[str, dict], backend: str = "chroma"
+) -> None:
+    path = _manifest_path(persist_dir, backend)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def scan_menu_dir(menu_dir: Path) -> Dict[str, str]:
+    """
+    Map of relative path -> content hash for every supported doc under `menu_dir`.
+    """
+    menu_dir = Path(menu_dir)
+    return {
+        path.relative_to(menu_dir).as_posix(): file_digest(path)
+        for path in sorted(menu_dir.rglob("*"))
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES
+    }
+
+
+def plan_ingest(
+    current: Dict[str, str], manifest: Dict[str, dict]
+) -> IngestReport:
+    report = IngestReport()
+    for rel_path, digest in current.items():
+        previous = manifest.get(rel_path)
+        if previous is None:
+            report.added.append(rel_path)
+        elif previous["hash"] != digest:
+            report.changed.append(rel_path)
+        else:
+            report.unchanged.append(rel_path)
+    report.removed = sorted(set(manifest) - set(current))
+    return report
+
+
+def load_document(path: Path) -> List[Document]:
     """
-    Loader that supports txt, md, pdf. PDFs use PyPDFLoader.
+    Load a single txt, md or pdf file. PDFs use PyPDFLoader.
     """
-    glob = "**/*"
-    loader_kwargs = {"loader_cls": TextLoader, "loader_kwargs": {"encoding": "utf-8"}}
-    return DirectoryLoader(str(path), glob=glob, show_progress=True, **loader_kwargs)
+    if path.suffix.lower() == ".pdf":
+        return PyPDFLoader(str(path)).load()
+    return TextLoader(str(path), encoding="utf-8").load()
 
 
-def _pdf_loader(path: Path) -> DirectoryLoader:
-    return DirectoryLoader(str(path), glob="**/*.pdf", loader_cls=PyPDFLoader)
+def chunk_ids(rel_path: str, digest: str, count: int) -> List[str]:
+    # Deterministic per file content, so re-running never duplicates chunks.
+    return [f"{rel_path}#{digest[:12]}#{index}" for index in range(count)]
 
 
 def get_splitter(settings: Settings) -> RecursiveCharacterTextSplitter:
+    return _splitter(settings.rag.chunk_size, settings.rag.chunk_overlap)
+
+
+def _splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
     return RecursiveCharacterTextSplitter(
-        chunk_size=settings.rag.chunk_size,
-        chunk_overlap=settings.rag.chunk_overlap,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
         add_start_index=True,
     )
 
 
-def build_embeddings() -> HuggingFaceEmbeddings:
-    # Small, CPU-friendly embedding model that works offline.
-    return HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
+# (rel_path, documents loaded, chunk texts, chunk metadatas)
+SplitResult = Tuple[str, int, List[str], List[dict]]
+
+
+def load_and_split(
+    path: str, rel_path: str, chunk_size: int, chunk_overlap: int
+) -> SplitResult:
+    """
+    Parse and split one file. Runs inside ingest worker processes, so it only
+    takes and returns plain picklable values.
+    """
+    docs = load_document(Path(path))
+    splits = _splitter(chunk_size, chunk_overlap).split_documents(docs)
+    return (
+        rel_path,
+        len(docs),
+        [chunk.page_content for chunk in splits],
+        [chunk.metadata for chunk in splits],
     )
 
 
-def ingest_menu(settings: Settings, persist_directory: Optional[Path] = None) -> Chroma:
+def iter_splits(
+    menu_dir: Path, rel_paths: List[str], settings: Settings
+) -> Iterator[SplitResult]:
+    """
+    Yield split files as they finish, parsing them in a process pool. At most
+    two files per worker are in flight so memory stays bounded.
     """
-    Ingest menu/FAQ docs into a persistent Chroma store.
+    args = [
+        (str(menu_dir / rel_path), rel_path, settings.rag.chunk_size, settings.rag.chunk_overlap)
+        for rel_path in rel_paths
+    ]
+    workers = min(settings.rag.ingest_workers, len(args))
+    if workers <= 1:
+        for arg in args:
+            yield load_and_split(*arg)
+        return
+
+    pending_args = iter(args)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for arg in pending_args:
+            in_flight.add(pool.submit(load_and_split, *arg))
+            if len(in_flight) >= workers * 2:
+                break
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_arg = next(pending_args, None)
+                if next_arg:
+                    in_flight.add(pool.submit(load_and_split, *next_arg))
+
+
+def open_vector_store(
+    settings: Settings, persist_dir: Path, embeddings=None
+) -> VectorStore:
+    backend = settings.rag.vector_backend.lower()
+    if backend not in VECTOR_BACKENDS:
+        raise ValueError(
+            f"Unknown vector backend '{backend}', expected one of {VECTOR_BACKENDS}"
+        )
+    embeddings = embeddings or build_embeddings(settings)
+    if backend == "numpy":
+        return NumpyVectorStore(
+            persist_directory=str(persist_dir), embedding_function=embeddings
+        )
+    return Chroma(persist_directory=str(persist_dir), embedding_function=embeddings)
+
+
+def ingest_menu(
+    settings: Settings,
+    persist_directory: Optional[Path] = None,
+    full: bool = False,
+    dry_run: bool = False,
+) -> IngestReport:
     """
-    menu_dir = settings.rag.menu_dir
+    Incrementally ingest menu/FAQ docs into the configured vector store.
+
+    Only files whose content hash differs from the manifest are re-split and
+    re-embedded; chunks of removed files are deleted. `full` rebuilds the
+    collection from scratch, `dry_run` only reports what would change.
+
+    Files are parsed and split in a process pool while the main process embeds
+    chunks in batches of `embed_batch_size` and streams them into the store.
+    A BM25 index over the same chunks is maintained alongside the vector store.
+    """
+    started = time.perf_counter()
+    menu_dir = Path(settings.rag.menu_dir)
     persist_dir = Path(persist_directory or settings.rag.vector_store_path)
+
+    backend = settings.rag.vector_backend.lower()
+    manifest = load_manifest(persist_dir, backend)
+    # Stores built before the manifest or BM25 index existed cannot be diffed safely.
+    full = full or manifest is None or not (persist_dir / BM25Index.FILE).exists()
+    current = scan_menu_dir(menu_dir)
+    report = plan_ingest(current, {} if full else manifest)
+    report.full = full
+    report.dry_run = dry_run
+    report.persist_directory = persist_dir
+    if dry_run:
+        return report
+
     persist_dir.mkdir(parents=True, exist_ok=True)
+    vectordb = open_vector_store(settings, persist_dir)
+    lexical_index = BM25Index() if full else BM25Index.load(persist_dir)
+    if full:
+        vectordb.delete_collection()
+        vectordb = open_vector_store(settings, persist_dir, vectordb.embeddings)
+        manifest = {}
+    report.vectordb = vectordb
+    report.lexical_index = lexical_index
 
-    text_loader = _build_loader(menu_dir)
-    pdf_loader = _pdf_loader(menu_dir)
-    docs = text_loader.load() + pdf_loader.load()
-
-    splitter = get_splitter(settings)
-    splits = splitter.split_documents(docs)
-    embeddings = build_embeddings()
-    vectordb = Chroma.from_documents(
-        documents=splits,
-        embedding=embeddings,
-        persist_directory=str(persist_dir),
-    )
-    vectordb.persist()
-    return vectordb
+    stale_ids = [
+        chunk_id
+        for rel_path in report.changed + report.removed
+        for chunk_id in manifest[rel_path]["chunk_ids"]
+    ]
+    if stale_ids:
+        vectordb.delete(ids=stale_ids)
+        lexical_index.delete(stale_ids)
+        report.chunks_deleted = len(stale_ids)
+    for rel_path in report.removed:
+        manifest.pop(rel_path)
+
+    batch_size = settings.rag.embed_batch_size
+    texts: List[str] = []
+    metadatas: List[dict] = []
+    ids: List[str] = []
 
+    def flush(limit: Optional[int] = None) -> None:
+        count = len(texts) if limit is None else limit
+        if count:
+            # One embedding forward pass per batch; Chroma upserts by ID.
+            vectordb.add_texts(texts[:count], metadatas=metadatas[:count], ids=ids[:count])
+            lexical_index.add_texts(texts[:count], metadatas=metadatas[:count], ids=ids[:count])
+            report.chunks_added += count
+            del texts[:count], metadatas[:count], ids[:count]
 
-def load_retriever(settings: Settings) -> Optional[Chroma]:
+    for rel_path, loaded, file_texts, file_metadatas in iter_splits(
+        menu_dir, report.added + report.changed, settings
+    ):
+        file_ids = chunk_ids(rel_path, current[rel_path], len(file_texts))
+        manifest[rel_path] = {"hash": current[rel_path], "chunk_ids": file_ids}
+        report.documents_loaded += loaded
+        texts.extend(file_texts)
+        metadatas.extend(file_metadatas)
+        ids.extend(file_ids)
+        while len(texts) >= batch_size:
+            flush(batch_size)
+    flush()
+    report.elapsed_seconds = time.perf_counter() - started
+
+    if report.has_changes or full:
+        vectordb.persist()
+        lexical_index.save(persist_dir)
+        save_manifest(persist_dir, manifest, backend)
+        # Lets running servers notice the rebuild and drop cached answers
+        _bump_store_version(persist_dir)
+    return report
+
+
+def load_retriever(settings: Settings) -> Optional[VectorStore]:
     persist_dir = Path(settings.rag.vector_store_path)
     if not persist_dir.exists():
         return None
-    embeddings = build_embeddings()
-    return Chroma(
-        persist_directory=str(persist_dir),
-        embedding_function=embeddings,
-    )
+    return open_vector_store(settings, persist_dir)
+
+
+def load_lexical_index(settings: Settings) -> Optional[BM25Index]:
+    if not settings.rag.lexical_enabled:
+        return None
+    return BM25Index.load(settings.rag.vector_store_path)
@@ -0,0 +1,158 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain.schema import Document
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a about all also an and any are as at be can could do does for from get have "
+    "how i in is it like made make me much my need of on or please serve served "
+    "should some tell that the there this to want what which with would you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase alphanumeric tokens without stopwords, with naive plural folding
+    so "allergens" matches "allergen".
+    """
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+@dataclass
+class LexicalHit:
+    document: Document
+    score: float
+    coverage: float
+
+
+class BM25Index:
+    """
+    Compact in-memory inverted index scored with Okapi BM25.
+
+    Built during ingestion and persisted next to the vector store, so a query
+    that names a dish or allergen can be answered without an embedding pass.
+    """
+
+    FILE = "bm25.json"
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, dict] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add_texts(
+        self, texts: List[str], metadatas: Optional[List[dict]] = None, ids: Optional[List[str]] = None
+    ) -> None:
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [f"chunk-{len(self._docs) + i}" for i in range(len(texts))]
+        self.delete(ids)
+        for chunk_id, text, metadata in zip(ids, texts, metadatas):
+            counts = Counter(tokenize(text))
+            length = sum(counts.values())
+            self._docs[chunk_id] = {"text": text, "metadata": metadata, "length": length}
+            self._total_length += length
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[chunk_id] = tf
+
+    def delete(self, ids: List[str]) -> None:
+        for chunk_id in ids:
+            doc = self._docs.pop(chunk_id, None)
+            if not doc:
+                continue
+            self._total_length -= doc["length"]
+            for term in set(tokenize(doc["text"])):
+                postings = self._postings.get(term)
+                if postings is not None:
+                    postings.pop(chunk_id, None)
+                    if not postings:
+                        del self._postings[term]
+
+    def idf(self, term: str) -> float:
+        n = len(self._docs)
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = 4) -> List[LexicalHit]:
+        """
+        Top-k chunks by BM25. `coverage` is the idf-weighted share of the query
+        terms found in the chunk; unknown terms count against it.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._docs:
+            return []
+        avg_length = self._total_length / len(self._docs)
+        weights = {term: self.idf(term) for term in terms}
+        total_weight = sum(weights.values())
+        scores: Dict[str, float] = {}
+        matched: Dict[str, float] = {}
+        for term, weight in weights.items():
+            for chunk_id, tf in self._postings.get(term, {}).items():
+                length = self._docs[chunk_id]["length"]
+                norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + weight * tf * (self.k1 + 1) / norm
+                matched[chunk_id] = matched.get(chunk_id, 0.0) + weight
+        ranked = sorted(scores, key=scores.get, reverse=True)[:k]
+        return [
+            LexicalHit(
+                document=Document(
+                    page_content=self._docs[chunk_id]["text"],
+                    metadata=self._docs[chunk_id]["metadata"],
+                ),
+                score=scores[chunk_id],
+                coverage=matched[chunk_id] / total_weight if total_weight else 0.0,
+            )
+            for chunk_id in ranked
+        ]
+
+    def save(self, directory: Path) -> None:
+        directory = Path(directory)
+        ids = list(self._docs)
+        position = {chunk_id: index for index, chunk_id in enumerate(ids)}
+        payload = {
+            "k1": self.k1,
+            "b": self.b,
+            "docs": [{"id": chunk_id, **self._docs[chunk_id]} for chunk_id in ids],
+            # Postings reference documents by position to keep the file compact.
+            "postings": {
+                term: [[position[chunk_id], tf] for chunk_id, tf in postings.items()]
+                for term, postings in self._postings.items()
+            },
+        }
+        tmp = directory / f".{self.FILE}.tmp"
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, directory / self.FILE)
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["BM25Index"]:
+        path = Path(directory) / cls.FILE
+        if not path.exists():
+            return None
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        index = cls(k1=payload["k1"], b=payload["b"])
+        ids = [doc.pop("id") for doc in payload["docs"]]
+        index._docs = dict(zip(ids, payload["docs"]))
+        index._total_length = sum(doc["length"] for doc in index._docs.values())
+        index._postings = {
+            term: {ids[position]: tf for position, tf in postings}
+            for term, postings in payload["postings"].items()
+        }
+        return index
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from langchain.schema import Document
+from langchain.schema.embeddings import Embeddings
+
+
+class NumpyVectorStore:
+    """
+    Exact top-k vector index backed by a memory-mapped `.npy` file.
+
+    Embeddings are L2-normalised float32 rows, so cosine similarity is a single
+    matrix-vector product; chunk text and metadata live in a JSON sidecar. The
+    matrix is opened with `mmap_mode="r"`, so every worker process on a host
+    shares the same page-cache pages instead of holding its own copy.
+
+    Writes (`add_texts`, `delete`) are buffered in memory and written atomically
+    by `persist()`. Readers pick up a new file on their next query.
+    """
+
+    EMBEDDINGS_FILE = "embeddings.npy"
+    METADATA_FILE = "chunks.json"
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings):
+        self._persist_directory = Path(persist_directory)
+        self._embedding_function = embedding_function
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._records: List[Dict] = []
+        self._loaded_stamp: Optional[tuple] = None
+        self._pending: List[np.ndarray] = []
+        self._dirty = False
+        self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding_function
+
+    def count(self) -> int:
+        return len(self._records)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        vector = self._embedding_function.embed_query(query)
+        return self.similarity_search_by_vector(vector, k=k)
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, **kwargs
+    ) -> List[Document]:
+        with self._lock:
+            self._refresh()
+            self._compact()
+            vectors, records = self._vectors, self._records
+        if not records:
+            return []
+        query = _normalize(np.asarray(embedding, dtype=np.float32))
+        scores = vectors @ query
+        k = min(k, len(records))
+        if k < len(records):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        else:
+            top = np.argsort(-scores)
+        return [
+            Document(page_content=records[i]["text"], metadata=records[i]["metadata"])
+            for i in top
+        ]
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [f"chunk-{len(self._records) + i}" for i in range(len(texts))]
+        vectors = np.asarray(self._embedding_function.embed_documents(texts), dtype=np.float32)
+        vectors = _normalize(vectors)
+        with self._lock:
+            self.delete(ids=ids)
+            # Appends are concatenated lazily so batched ingestion stays linear.
+            self._pending.append(vectors)
+            self._records.extend(
+                {"id": chunk_id, "text": text, "metadata": metadata}
+                for chunk_id, text, metadata in zip(ids, texts, metadatas)
+            )
+            self._dirty = True
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs) -> None:
+        if not ids:
+            return
+        doomed = set(ids)
+        with self._lock:
+            self._compact()
+            keep = [i for i, record in enumerate(self._records) if record["id"] not in doomed]
+            if len(keep) == len(self._records):
+                return
+            self._vectors = np.asarray(self._vectors)[keep]
+            self._records = [self._records[i] for i in keep]
+            self._dirty = True
+
+    def delete_collection(self) -> None:
+        with self._lock:
+            for name in (self.EMBEDDINGS_FILE, self.METADATA_FILE):
+                (self._persist_directory / name).unlink(missing_ok=True)
+            self._vectors = np.zeros((0, 0), dtype=np.float32)
+            self._records = []
+            self._pending = []
+            self._loaded_stamp = None
+            self._dirty = False
+
+    def persist(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self._compact()
+            self._persist_directory.mkdir(parents=True, exist_ok=True)
+            # Write both files next to the live ones, then swap them in, so
+            # readers never observe a half-written index.
+            matrix_tmp = self._persist_directory / f".{self.EMBEDDINGS_FILE}.tmp"
+            meta_tmp = self._persist_directory / f".{self.METADATA_FILE}.tmp"
+            with open(matrix_tmp, "wb") as handle:
+                np.save(handle, np.ascontiguousarray(self._vectors, dtype=np.float32))
+            meta_tmp.write_text(json.dumps(self._records), encoding="utf-8")
+            os.replace(meta_tmp, self._persist_directory / self.METADATA_FILE)
+            os.replace(matrix_tmp, self._persist_directory / self.EMBEDDINGS_FILE)
+            self._dirty = False
+            self._load()
+
+    def _load(self) -> None:
+        matrix_path = self._persist_directory / self.EMBEDDINGS_FILE
+        meta_path = self._persist_directory / self.METADATA_FILE
+        if not matrix_path.exists() or not meta_path.exists():
+            self._vectors = np.zeros((0, 0), dtype=np.float32)
+            self._records = []
+            self._loaded_stamp = None
+            return
+        stamp = _file_stamp(matrix_path)
+        vectors = np.load(matrix_path, mmap_mode="r")
+        records = json.loads(meta_path.read_text(encoding="utf-8"))
+        if len(records) != vectors.shape[0]:
+            # Caught a writer between its two renames; retry on the next query.
+            return
+        self._vectors, self._records, self._loaded_stamp = vectors, records, stamp
+
+    def _refresh(self) -> None:
+        if self._dirty:
+            return
+        if _file_stamp(self._persist_directory / self.EMBEDDINGS_FILE) != self._loaded_stamp:
+            self._load()
+
+    def _compact(self) -> None:
+        if not self._pending:
+            return
+        parts = ([np.asarray(self._vectors)] if self._vectors.size else []) + self._pending
+        self._vectors = np.concatenate(parts)
+        self._pending = []
+
+
+def _file_stamp(path: Path) -> Optional[tuple]:
+    # Atomic replaces change the inode even when mtime granularity is coarse.
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+
+from app.models.schemas import TTSCacheStats
+from app.speech.tts import SentenceChunker, TextToSpeech
+
+
+def tts_cache_key(text: str, voice: str, sample_rate: int) -> str:
+    """
+    Content address of a synthesized clip: same words, voice and rate give the
+    same audio, whichever process produced it.
+    """
+    payload = "\x00".join([voice, str(sample_rate), text.strip()])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def speakable_segments(texts: Iterable[str], min_chars: int = 12) -> list:
+    """
+    The texts themselves plus the sentences the streaming path would cut them
+    into, so both `/voice` and `/voice/stream` hit the cache.
+    """
+    segments = []
+    for text in texts:
+        chunker = SentenceChunker(min_chars=min_chars)
+        segments.extend([text, *chunker.feed(text), *chunker.flush()])
+    return list(dict.fromkeys(segment for segment in segments if segment.strip()))
+
+
+class CachedTTS(TextToSpeech):
+    """
+    Two-tier cache in front of a TTS backend.
+
+    Clips live in an in-memory LRU bounded by `memory_entries` and, when
+    `cache_dir` is set, as `<dir>/<key[:2]>/<key>.wav` files that survive
+    restarts and are shared by workers. The files are capped at `disk_bytes`
+    (0 disables the disk tier); once over it, the least recently read or
+    written files are deleted down to 90% of the cap. Only real audio
+    (RIFF/WAV) is cached; the text fallback a backend returns when synthesis
+    fails is not.
+    """
+
+    def __init__(
+        self,
+        backend: TextToSpeech,
+        voice: str = "",
+        sample_rate: int = 16000,
+        memory_entries: int = 512,
+        cache_dir: Optional[Path] = None,
+        disk_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.backend = backend
+        self.voice = voice or type(backend).__name__
+        self.sample_rate = sample_rate
+        self.memory_entries = memory_entries
+        self.cache_dir = Path(cache_dir) if cache_dir and disk_bytes > 0 else None
+        self.disk_bytes = disk_bytes
+        # Size of the disk tier as this process last saw it; other workers
+        # may write too, so pruning always re-scans the directory.
+        self._disk_used: Optional[int] = None
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.prewarmed = 0
+
+    def synthesize(self, text: str) -> bytes:
+        return self._synthesize(text, record=True)
+
+    def _synthesize(self, text: str, record: bool) -> bytes:
+        key = tts_cache_key(text, self.voice, self.sample_rate)
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += record
+                return audio
+
+        audio = self._read(key)
+        if audio is not None:
+            with self._lock:
+                self.disk_hits += record
+            self._remember(key, audio)
+            return audio
+
+        audio = self.backend.synthesize(text)
+        with self._lock:
+            self.misses += record
+        if audio.startswith(b"RIFF"):
+            self._remember(key, audio)
+            self._write(key, audio)
+        return audio
+
+    def prewarm(self, texts: Iterable[str]) -> int:
+        """
+        Synthesize (or load from disk) every text up front; returns how many
+        clips are now held in memory. Not counted in the hit rate.
+        """
+        for text in speakable_segments(texts):
+            self._synthesize(text, record=False)
+        with self._lock:
+            self.prewarmed = len(self._entries)
+            return self.prewarmed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> TTSCacheStats:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return TTSCacheStats(
+                size=len(self._entries),
+                bytes=sum(len(audio) for audio in self._entries.values()),
+                memory_hits=self.memory_hits,
+                disk_hits=self.disk_hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                disk_bytes=self._disk_used or 0,
+                disk_evictions=self.disk_evictions,
+                prewarmed=self.prewarmed,
+                hit_rate=(self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            )
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = audio
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.memory_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _path(self, key: str) -> Optional[Path]:
+        return self.cache_dir / key[:2] / f"{key}.wav" if self.cache_dir else None
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        if path is None:
+            return None
+        try:
+            audio = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            # The modification time doubles as the LRU clock for pruning.
+            os.utime(path)
+        except OSError:
+            pass
+        return audio
+
+    def _write(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so a concurrent reader never sees half a clip.
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(audio)
+            os.replace(tmp, path)
+        except OSError as exc:
+            print(f"[tts-cache] could not write {path}: {exc}")
+            return
+        with self._lock:
+            if self._disk_used is None:
+                self._disk_used = sum(size for _, size, _ in self._scan())
+            else:
+                self._disk_used += len(audio)
+            if self._disk_used > self.disk_bytes:
+                self._prune()
+
+    def _scan(self) -> list:
+        files = []
+        for path in self.cache_dir.glob("*/*.wav"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # pruned by another worker meanwhile
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _prune(self) -> None:
+        # Called under the lock: one pruning pass per process at a time.
+        files = sorted(self._scan(), key=lambda entry: entry[0])
+        used = sum(size for _, size, _ in files)
+        target = int(self.disk_bytes * 0.9)
+        for _, size, path in files:
+            if used <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            used -= size
+            self.disk_evictions += 1
+        self._disk_used = used
@@ -1,20 +1,50 @@
+from functools import partial
+
 from app.config import Settings
+from app.speech.cache import CachedTTS
+from app.speech.pool import SynthesisPool
 from app.speech.stt import DummySTT, SpeechToText, WhisperSTT
-from app.speech.tts import NullTTS, Pyttsx3TTS, TextToSpeech
+from app.speech.tts import NullTTS, Pyttsx3Engine, Pyttsx3TTS, TextToSpeech
 
 
 def build_stt(settings: Settings) -> SpeechToText:
     provider = settings.speech.stt_provider.lower()
     if provider == "whisper":
-        return WhisperSTT()
+        return WhisperSTT(
+            model_name=settings.speech.whisper_model,
+            sample_rate=settings.speech.sample_rate,
+            threads=settings.speech.whisper_threads,
+            compute_type=settings.speech.whisper_compute_type,
+            queue_size=settings.speech.stt_queue_size,
+        )
     return DummySTT()
 
 
 def build_tts(settings: Settings) -> TextToSpeech:
     provider = settings.speech.tts_provider.lower()
-    if provider == "pyttsx3":
-        try:
-            return Pyttsx3TTS()
-        except Exception:
-            return NullTTS()
-    return NullTTS()
+    if provider != "pyttsx3":
+        return NullTTS()
+    speech = settings.speech
+    try:
+        if speech.tts_workers > 0:
+            backend = SynthesisPool(
+                partial(Pyttsx3Engine, speech.tts_voice),
+                workers=speech.tts_workers,
+                queue_size=speech.tts_queue_size,
+                timeout=speech.tts_timeout_seconds,
+            )
+        else:
+            backend = Pyttsx3TTS(voice=speech.tts_voice)
+    except Exception as exc:
+        print(f"[tts] pyttsx3 unavailable, using NullTTS: {exc}")
+        return NullTTS()
+    if speech.tts_cache_size <= 0:
+        return backend
+    return CachedTTS(
+        backend,
+        voice=backend.voice,
+        sample_rate=speech.sample_rate,
+        memory_entries=speech.tts_cache_size,
+        cache_dir=speech.tts_cache_dir,
+        disk_bytes=int(speech.tts_cache_disk_mb * 1024 * 1024),
+    )
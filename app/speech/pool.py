@@ -0,0 +1,206 @@
+import multiprocessing
+import queue
+import threading
+from typing import Callable, List, Optional
+
+from app.models.schemas import TTSPoolStats
+from app.speech.tts import TextToSpeech
+
+EngineFactory = Callable[[], Callable[[str], bytes]]
+
+
+def _serve(conn, factory: EngineFactory) -> None:
+    """
+    Worker process loop: build the engine once, then synthesize one text per
+    message until told to stop (None) or the pipe closes.
+    """
+    try:
+        engine = factory()
+    except Exception as exc:
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+        return
+    conn.send(("ready", getattr(engine, "voice", None)))
+    while True:
+        try:
+            text = conn.recv()
+        except EOFError:
+            return
+        if text is None:
+            return
+        try:
+            conn.send(("ok", engine(text)))
+        except Exception as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+
+
+class _Worker:
+    def __init__(self, ctx, factory: EngineFactory, index: int):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_serve, args=(child, factory), name=f"tts-worker-{index}", daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def handshake(self, timeout: float) -> Optional[str]:
+        if not self.conn.poll(timeout):
+            self.stop()
+            raise RuntimeError("TTS worker did not start in time")
+        status, payload = self.conn.recv()
+        if status != "ready":
+            self.stop()
+            raise RuntimeError(f"TTS worker failed to start: {payload}")
+        return payload
+
+    def stop(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class SynthesisPool(TextToSpeech):
+    """
+    Pool of worker processes, each owning its own TTS engine, so concurrent
+    requests synthesize in parallel instead of sharing one engine that is
+    not safe to call from several threads.
+
+    Requests take the next idle worker in arrival order. At most `queue_size`
+    may wait; further ones, and ones that wait longer than `timeout`, get
+    ModelOverloadedError (a 503). A worker that fails to answer within
+    `timeout` is killed and replaced. Audio comes back over the worker's
+    pipe as bytes; nothing is written to disk by the pool.
+    """
+
+    def __init__(
+        self,
+        factory: EngineFactory,
+        workers: int = 2,
+        queue_size: int = 32,
+        timeout: float = 15.0,
+        start_timeout: float = 30.0,
+    ):
+        self.factory = factory
+        self.size = workers
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._admission = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._spawned = 0
+        self.waiting = 0
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+        # Start every process first so their engine loads overlap.
+        started: List[_Worker] = [self._spawn() for _ in range(workers)]
+        try:
+            voices = [worker.handshake(start_timeout) for worker in started]
+        except Exception:
+            for worker in started:
+                worker.stop()
+            raise
+        self.voice = voices[0] if voices and voices[0] else ""
+        for worker in started:
+            self._idle.put(worker)
+
+    def synthesize(self, text: str) -> bytes:
+        from app.orchestration.client import ModelOverloadedError
+
+        if not self._admission.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ModelOverloadedError("Text-to-speech queue full")
+        try:
+            with self._lock:
+                self.waiting += 1
+            try:
+                worker = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self.rejected += 1
+                raise ModelOverloadedError("No text-to-speech worker became free") from None
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            return self._run(worker, text)
+        finally:
+            self._admission.release()
+
+    def _run(self, worker: _Worker, text: str) -> bytes:
+        with self._lock:
+            self.busy += 1
+        healthy = False
+        try:
+            worker.conn.send(text)
+            if not worker.conn.poll(self.timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise TimeoutError(f"Text-to-speech took longer than {self.timeout:.0f}s")
+            status, payload = worker.conn.recv()
+            healthy = True
+            if status != "ok":
+                raise RuntimeError(f"Text-to-speech failed: {payload}")
+            with self._lock:
+                self.completed += 1
+            return payload
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.busy -= 1
+            if healthy:
+                self._idle.put(worker)
+            else:
+                self._replace(worker)
+
+    def _spawn(self) -> _Worker:
+        with self._lock:
+            index = self._spawned
+            self._spawned += 1
+        return _Worker(self._ctx, self.factory, index)
+
+    def _replace(self, worker: _Worker) -> None:
+        # A stuck or crashed engine is unrecoverable; swap in a fresh process.
+        worker.stop()
+        with self._lock:
+            self.restarts += 1
+        fresh = self._spawn()
+        try:
+            fresh.handshake(self.start_timeout)
+        except RuntimeError as exc:
+            print(f"[tts-pool] could not restart worker: {exc}")
+            return
+        self._idle.put(fresh)
+
+    def stats(self) -> TTSPoolStats:
+        with self._lock:
+            return TTSPoolStats(
+                workers=self.size,
+                busy=self.busy,
+                waiting=self.waiting,
+                completed=self.completed,
+                failed=self.failed,
+                rejected=self.rejected,
+                timeouts=self.timeouts,
+                restarts=self.restarts,
+            )
+
+    def close(self) -> None:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                worker.conn.send(None)
+                worker.process.join(timeout=1)
+            except OSError:
+                pass
+            worker.stop()
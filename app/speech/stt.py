@@ -1,5 +1,16 @@
 import base64
-from typing import Optional
+import io
+import queue
+import shutil
+import subprocess
+import threading
+import wave
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+WHISPER_SAMPLE_RATE = 16000
 
 
 class SpeechToText:
@@ -12,32 +23,181 @@ class DummySTT(SpeechToText):
         return ""
 
 
+class TranscriptionWorker:
+    """
+    Runs transcriptions one at a time on a dedicated thread that owns the
+    model, in arrival order. At most `queue_size` requests wait; further ones
+    are refused straight away so latency stays bounded under load.
+    """
+
+    def __init__(self, transcribe_fn: Callable[[np.ndarray], str], queue_size: int = 16):
+        self.transcribe_fn = transcribe_fn
+        self._queue: "queue.Queue[tuple[np.ndarray, Future]]" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="stt-worker", daemon=True)
+        self._thread.start()
+
+    def submit(self, audio: np.ndarray) -> Future:
+        from app.orchestration.client import ModelOverloadedError
+
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((audio, future))
+        except queue.Full:
+            raise ModelOverloadedError("Speech-to-text queue full") from None
+        return future
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self) -> None:
+        while True:
+            audio, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.transcribe_fn(audio))
+            except Exception as exc:
+                future.set_exception(exc)
+
+
 class WhisperSTT(SpeechToText):
     """
-    Optional offline STT using OpenAI Whisper. Requires the `openai-whisper` package
-    and an available audio backend.
+    Optional offline STT using Whisper. Uses `faster-whisper` when installed
+    (CTranslate2, honours `compute_type`), else the `openai-whisper` package.
+
+    The model is loaded once; audio is decoded in memory and transcribed on a
+    dedicated worker thread (see TranscriptionWorker).
     """
 
-    def __init__(self, model_name: str = "base"):
+    def __init__(
+        self,
+        model_name: str = "base",
+        sample_rate: int = WHISPER_SAMPLE_RATE,
+        threads: int = 4,
+        compute_type: str = "int8",
+        queue_size: int = 16,
+    ):
+        self.sample_rate = sample_rate
         try:
-            import whisper  # type: ignore
-        except Exception as exc:  # pragma: no cover - optional dependency
-            raise RuntimeError(
-                "Whisper is not installed. Install openai-whisper to enable STT."
-            ) from exc
-        self.model = whisper.load_model(model_name)
+            from faster_whisper import WhisperModel  # type: ignore
+
+            self.model = WhisperModel(
+                model_name, device="cpu", compute_type=compute_type, cpu_threads=threads
+            )
+            self._run_model = self._run_faster_whisper
+        except ImportError:
+            try:
+                import torch  # type: ignore
+                import whisper  # type: ignore
+            except Exception as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "Whisper is not installed. Install openai-whisper or faster-whisper to enable STT."
+                ) from exc
+            torch.set_num_threads(threads)
+            self.model = whisper.load_model(model_name)
+            self.fp16 = compute_type == "float16"
+            self._run_model = self._run_openai_whisper
+        self.worker = TranscriptionWorker(self._run_model, queue_size=queue_size)
 
     def transcribe(self, audio_bytes: bytes) -> str:
-        import tempfile
+        audio = pcm_from_bytes(audio_bytes, self.sample_rate)
+        if audio.size == 0:
+            return ""
+        if self.sample_rate != WHISPER_SAMPLE_RATE:
+            audio = resample(audio, self.sample_rate, WHISPER_SAMPLE_RATE)
+        return self.worker.submit(audio).result()
 
-        with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
-            tmp.write(audio_bytes)
-            tmp.flush()
-            result = self.model.transcribe(tmp.name)
+    def _run_openai_whisper(self, audio: np.ndarray) -> str:
+        result = self.model.transcribe(audio, fp16=self.fp16)
         return result.get("text", "").strip()
 
+    def _run_faster_whisper(self, audio: np.ndarray) -> str:
+        segments, _ = self.model.transcribe(audio, beam_size=1)
+        return "".join(segment.text for segment in segments).strip()
+
+
+def pcm_from_bytes(audio_bytes: bytes, sample_rate: int) -> np.ndarray:
+    """
+    Decode an audio payload to mono float32 in [-1, 1] at `sample_rate`,
+    without touching disk. WAV is parsed directly; other containers are piped
+    through ffmpeg when it is installed; anything ffmpeg cannot read is taken
+    as raw 16-bit little-endian mono PCM already at `sample_rate`.
+    """
+    if not audio_bytes:
+        return np.zeros(0, dtype=np.float32)
+    if audio_bytes[:4] == b"RIFF" and audio_bytes[8:12] == b"WAVE":
+        with wave.open(io.BytesIO(audio_bytes)) as wav:
+            width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+            frames = wav.readframes(wav.getnframes())
+        audio = pcm_to_float(frames, width)
+        if channels > 1:
+            audio = audio[: len(audio) - len(audio) % channels].reshape(-1, channels).mean(axis=1)
+        return resample(audio, rate, sample_rate)
+    if shutil.which("ffmpeg"):
+        decoded = subprocess.run(
+            [
+                "ffmpeg", "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+                "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1",
+            ],
+            input=audio_bytes,
+            capture_output=True,
+        )
+        if decoded.returncode == 0:
+            return pcm_to_float(decoded.stdout, 2)
+    return pcm_to_float(audio_bytes, 2)
+
+
+def pcm_to_float(frames: bytes, width: int) -> np.ndarray:
+    if width == 1:  # unsigned 8-bit
+        return (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128) / 128
+    if width == 3:  # packed 24-bit: widen to int32 via the top three bytes
+        raw = np.frombuffer(frames[: len(frames) - len(frames) % 3], dtype=np.uint8).reshape(-1, 3)
+        ints = raw.astype(np.int32) << np.array([8, 16, 24], dtype=np.int32)
+        return ints.sum(axis=1, dtype=np.int32).astype(np.float32) / 2**31
+    dtype = {2: np.int16, 4: np.int32}[width]
+    usable = len(frames) - len(frames) % width
+    return np.frombuffer(frames[:usable], dtype=dtype).astype(np.float32) / 2 ** (8 * width - 1)
+
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    # Linear interpolation; fine for speech going into an ASR model.
+    if source_rate == target_rate or audio.size == 0:
+        return audio.astype(np.float32, copy=False)
+    length = int(round(audio.size * target_rate / source_rate))
+    positions = np.linspace(0, audio.size - 1, num=length)
+    return np.interp(positions, np.arange(audio.size), audio).astype(np.float32)
+
 
 def decode_audio(audio_base64: Optional[str]) -> bytes:
     if not audio_base64:
         return b""
     return base64.b64decode(audio_base64)
+
+
+def wav_from_l16(body: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """
+    Wrap an `audio/L16` body (big-endian 16-bit PCM, RFC 3551) as WAV, so it
+    decodes like any other upload instead of as little-endian noise.
+    """
+    samples = np.frombuffer(body[: len(body) - len(body) % 2], dtype=">i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def silence_wav(seconds: float, sample_rate: int) -> bytes:
+    """
+    Mono 16-bit WAV of silence, used to warm up STT backends.
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x00\x00" * int(seconds * sample_rate))
+    return buffer.getvalue()
@@ -1,6 +1,14 @@
 import base64
 import io
-from typing import Optional
+import os
+import re
+import tempfile
+import wave
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.speech.stt import pcm_to_float, resample
 
 
 class TextToSpeech:
@@ -8,28 +16,50 @@ class TextToSpeech:
         raise NotImplementedError
 
 
-class Pyttsx3TTS(TextToSpeech):
+class Pyttsx3Engine:
     """
-    Offline-friendly TTS using pyttsx3. Falls back to raw bytes if the engine
-    cannot write audio (useful for CI or headless environments).
+    One pyttsx3 engine. pyttsx3 can only render to a file, so it renders to a
+    per-process scratch file, in shared memory (/dev/shm) where available,
+    and hands back the bytes.
     """
 
-    def __init__(self):
+    def __init__(self, voice: Optional[str] = None):
         try:
             import pyttsx3  # type: ignore
         except Exception as exc:  # pragma: no cover - optional dependency
             raise RuntimeError("pyttsx3 is required for TTS.") from exc
         self.engine = pyttsx3.init()
+        if voice:
+            self.engine.setProperty("voice", voice)
+        self.voice = voice or str(self.engine.getProperty("voice"))
+        scratch = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        self.path = os.path.join(scratch, f"tts-{os.getpid()}-{id(self)}.wav")
+
+    def __call__(self, text: str) -> bytes:
+        try:
+            self.engine.save_to_file(text, self.path)
+            self.engine.runAndWait()
+            with open(self.path, "rb") as handle:
+                return handle.read()
+        finally:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
 
-    def synthesize(self, text: str) -> bytes:
-        import tempfile
 
+class Pyttsx3TTS(TextToSpeech):
+    """
+    Offline-friendly TTS using pyttsx3 in-process. Falls back to raw bytes if
+    the engine cannot write audio (useful for CI or headless environments).
+    The engine is not thread-safe; use SynthesisPool under concurrent load.
+    """
+
+    def __init__(self, voice: Optional[str] = None):
+        self._engine = Pyttsx3Engine(voice)
+        self.voice = self._engine.voice
+
+    def synthesize(self, text: str) -> bytes:
         try:
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
-                self.engine.save_to_file(text, tmp.name)
-                self.engine.runAndWait()
-                tmp.seek(0)
-                return tmp.read()
+            return self._engine(text)
         except Exception:
             return text.encode("utf-8")
 
@@ -39,7 +69,75 @@ class NullTTS(TextToSpeech):
         return text.encode("utf-8")
 
 
+class SentenceChunker:
+    """
+    Accumulates streamed text and releases complete sentences, so TTS can start
+    on the first sentence while the LLM is still generating the rest.
+    """
+
+    _boundary = re.compile(r"(?<=[.!?])\s+")
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        parts = self._boundary.split(self._buffer)
+        # The last part has no terminating boundary yet; keep it buffered.
+        self._buffer = parts.pop()
+        sentences: List[str] = []
+        pending = ""
+        for part in parts:
+            pending = f"{pending} {part}".strip()
+            if len(pending) >= self.min_chars:
+                sentences.append(pending)
+                pending = ""
+        if pending:
+            self._buffer = f"{pending} {self._buffer}"
+        return sentences
+
+    def flush(self) -> List[str]:
+        remainder, self._buffer = self._buffer.strip(), ""
+        return [remainder] if remainder else []
+
+
 def encode_audio(audio_bytes: Optional[bytes]) -> Optional[str]:
     if not audio_bytes:
         return None
     return base64.b64encode(audio_bytes).decode("utf-8")
+
+
+def convert_audio(
+    audio_bytes: bytes, sample_rate: Optional[int] = None, pcm: bool = False
+) -> Tuple[bytes, str]:
+    """
+    Re-encode synthesized WAV for the wire: mono 16-bit at `sample_rate`
+    (source rate when unset), as WAV or as headerless big-endian PCM
+    (`audio/L16`, RFC 3551). Returns the bytes and their media type; WAV that needs no change is passed through as is.
+    Non-WAV payloads (e.g. NullTTS text) are returned untouched.
+    """
+    if audio_bytes[:4] != b"RIFF" or audio_bytes[8:12] != b"WAVE":
+        return audio_bytes, "application/octet-stream"
+    with wave.open(io.BytesIO(audio_bytes)) as wav:
+        width, channels, rate = wav.getsampwidth(), wav.getnchannels(), wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    target = sample_rate or rate
+    if not pcm and (width, channels, rate) == (2, 1, target):
+        return audio_bytes, "audio/wav"
+
+    audio = pcm_to_float(frames, width)
+    if channels > 1:
+        audio = audio[: len(audio) - len(audio) % channels].reshape(-1, channels).mean(axis=1)
+    audio = resample(audio, rate, target)
+    samples = np.clip(audio, -1.0, 1.0) * 32767
+    if pcm:
+        # L16 is network byte order; WAV below is little-endian.
+        return samples.astype(">i2").tobytes(), f"audio/L16;rate={target};channels=1"
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(target)
+        wav.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue(), "audio/wav"
@@ -0,0 +1,132 @@
+import io
+import wave
+from collections import deque
+from typing import List
+
+import numpy as np
+
+from app.speech.stt import pcm_to_float
+
+
+class SpeechSegmenter:
+    """
+    Energy-based voice activity detection and endpointing over a live stream
+    of 16-bit mono PCM.
+
+    Audio is cut into `frame_ms` frames; a frame is speech when its RMS is
+    above both `threshold` and `noise_ratio` times an adaptive noise floor.
+    An utterance opens on the first speech frame (with `preroll_ms` of audio
+    before it, so the first syllable is kept) and closes after `silence_ms`
+    of non-speech. Bursts shorter than `min_speech_ms` are dropped as noise.
+
+    `feed` returns events: "start", "partial" every `partial_interval_ms` of
+    new utterance audio, and "end" when the utterance is complete; each "end"
+    queues the utterance for `take_utterance`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        threshold: float = 0.01,
+        noise_ratio: float = 3.0,
+        silence_ms: int = 500,
+        min_speech_ms: int = 200,
+        partial_interval_ms: int = 700,
+        preroll_ms: int = 200,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.frame_ms = frame_ms
+        self.threshold = threshold
+        self.noise_ratio = noise_ratio
+        self.silence_ms = silence_ms
+        self.min_speech_ms = min_speech_ms
+        self.partial_interval_ms = partial_interval_ms
+        self.noise_floor = threshold / noise_ratio
+        self._pending = b""
+        self._preroll: deque = deque(maxlen=max(1, preroll_ms // frame_ms))
+        self._frames: List[bytes] = []
+        self._completed: deque = deque()
+        self.in_speech = False
+        self._speech_ms = 0
+        self._silence_run = 0
+        self._since_partial = 0
+
+    def feed(self, pcm: bytes) -> List[str]:
+        events: List[str] = []
+        data = self._pending + pcm
+        step = self.frame_size * 2
+        usable = len(data) - len(data) % step
+        self._pending = data[usable:]
+        for offset in range(0, usable, step):
+            events.extend(self._frame(data[offset : offset + step]))
+        return events
+
+    def flush(self) -> List[str]:
+        """
+        Close the current utterance now (client signalled end of speech).
+        """
+        if self.in_speech and self._speech_ms >= self.min_speech_ms:
+            self._complete()
+            return ["end"]
+        self._reset()
+        return []
+
+    def utterance_wav(self) -> bytes:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b"".join(self._frames))
+        return buffer.getvalue()
+
+    def take_utterance(self) -> bytes:
+        return self._completed.popleft()
+
+    def _frame(self, frame: bytes) -> List[str]:
+        samples = pcm_to_float(frame, 2)
+        rms = float(np.sqrt(np.mean(samples**2))) if samples.size else 0.0
+        is_speech = rms > max(self.threshold, self.noise_ratio * self.noise_floor)
+        if not self.in_speech:
+            if not is_speech:
+                # Track background level only while nobody is talking.
+                self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+                self._preroll.append(frame)
+                return []
+            self.in_speech = True
+            self._frames = list(self._preroll)
+            self._preroll.clear()
+            self._speech_ms = self._silence_run = self._since_partial = 0
+            events = ["start"]
+        else:
+            events = []
+
+        self._frames.append(frame)
+        self._since_partial += self.frame_ms
+        if is_speech:
+            self._speech_ms += self.frame_ms
+            self._silence_run = 0
+        else:
+            self._silence_run += self.frame_ms
+
+        if self._silence_run >= self.silence_ms:
+            if self._speech_ms >= self.min_speech_ms:
+                self._complete()
+                return events + ["end"]
+            self._reset()
+            return events
+        if self._since_partial >= self.partial_interval_ms and self._speech_ms >= self.min_speech_ms:
+            self._since_partial = 0
+            events.append("partial")
+        return events
+
+    def _complete(self) -> None:
+        self._completed.append(self.utterance_wav())
+        self._reset()
+
+    def _reset(self) -> None:
+        self.in_speech = False
+        self._frames = []
+        self._speech_ms = self._silence_run = self._since_partial = 0
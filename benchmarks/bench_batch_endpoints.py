@@ -0,0 +1,84 @@
+"""
+Items/second through /order and /reservation one at a time against the
+/order/batch and /reservation/batch endpoints.
+
+Runs the app in-process (FastAPI TestClient) against a throwaway reservation
+database and order journal, with fsync on, so the numbers include request
+handling, validation and durable commits but not network latency.
+
+    python -m benchmarks.bench_batch_endpoints --items 500 --batch-sizes 10 50 250
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+TMP = tempfile.mkdtemp(prefix="bench-batch-")
+os.environ["RESERVATIONS__DB_PATH"] = str(Path(TMP) / "reservations.db")
+os.environ["ORDERS__JOURNAL_PATH"] = str(Path(TMP) / "orders" / "orders.log")
+os.environ.setdefault("API__MAX_BATCH_ITEMS", "10000")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api import app  # noqa: E402
+
+
+def orders(count: int, offset: int) -> List[dict]:
+    return [
+        {"table": str((offset + i) % 20), "items": [{"item": "Margherita", "quantity": 1 + i % 3}]}
+        for i in range(count)
+    ]
+
+
+def reservations(count: int, offset: int) -> List[dict]:
+    return [
+        {
+            "name": f"guest-{offset + i}",
+            "date": f"2031-{1 + (offset + i) // 280 % 12:02d}-{1 + (offset + i) // 10 % 28:02d}",
+            "time": f"{12 + (offset + i) % 10}:00",
+            "guests": 2,
+        }
+        for i in range(count)
+    ]
+
+
+def single(client: TestClient, path: str, items: List[dict]) -> float:
+    started = time.perf_counter()
+    for item in items:
+        client.post(path, json=item).raise_for_status()
+    return len(items) / (time.perf_counter() - started)
+
+
+def batched(client: TestClient, path: str, items: List[dict], size: int) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(items), size):
+        body = client.post(f"{path}/batch", json=items[start : start + size])
+        body.raise_for_status()
+        assert body.json()["failed"] == 0, body.json()
+    return len(items) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[10, 50, 250])
+    args = parser.parse_args()
+
+    with TestClient(app) as client:
+        print(f"{'endpoint':<13} {'batch':>6} {'items/s':>9}")
+        offset = 0
+        for path, make in (("/order", orders), ("/reservation", reservations)):
+            rate = single(client, path, make(args.items, offset))
+            offset += args.items
+            print(f"{path:<13} {1:>6} {rate:>9.0f}")
+            for size in args.batch_sizes:
+                rate = batched(client, path, make(args.items, offset), size)
+                offset += args.items
+                print(f"{path:<13} {size:>6} {rate:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Routing latency and accuracy: the previous substring + LLM router against the
+word-boundary matcher + embedding classifier.
+
+Accuracy is measured with k-fold cross-validation over the labeled examples,
+so the classifier is never scored on utterances it was fitted on. The LLM is
+an oracle stub (always right) whose cost is accounted as `--llm-latency-ms` per
+call, which makes the baseline's numbers an upper bound on accuracy.
+
+    python -m benchmarks.bench_intent_router --embeddings hf
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+
+from langchain.schema import AIMessage
+from langchain.schema.embeddings import Embeddings
+
+from app.config import get_settings
+from app.orchestration.classifier import CentroidIntentClassifier, load_examples
+from app.orchestration.router import INTENTS, IntentResult, IntentRouter
+
+
+class OracleModel:
+    """
+    Stands in for the chat model: answers with the true label, counts calls.
+    """
+
+    def __init__(self, labels: Dict[str, str]):
+        self.labels = labels
+        self.calls = 0
+
+    def invoke(self, prompt: str) -> AIMessage:
+        self.calls += 1
+        text = prompt.split("User: ", 1)[1].split("\n", 1)[0]
+        return AIMessage(content=self.labels[text])
+
+
+class LegacyIntentRouter(IntentRouter):
+    """
+    The router as it was before the compiled matcher and classifier.
+    """
+
+    def heuristic_route(self, text: str) -> IntentResult:
+        lower = text.lower()
+        scores = {intent: 0 for intent in INTENTS}
+        for intent, keywords in self.keyword_map.items():
+            for kw in keywords:
+                if kw in lower:
+                    scores[intent] += 1
+        best_intent = max(scores, key=scores.get)
+        if scores[best_intent] == 0:
+            return IntentResult(intent="fallback", score=0, reason="no keyword hit")
+        return IntentResult(intent=best_intent, score=scores[best_intent], reason="keyword match")
+
+    def route(self, text: str) -> IntentResult:
+        heuristic = self.heuristic_route(text)
+        if heuristic.intent != "fallback":
+            return heuristic
+        return self.llm_route(text) or heuristic
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Dependency-free bag-of-words hashing, for boxes without sentence-transformers.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for word in text.lower().split():
+            vector[hash(word.strip("?!.,'")) % self.dim] += 1.0
+        return vector
+
+
+def evaluate(
+    router: IntentRouter, model: OracleModel, test: List[Tuple[str, str]], llm_ms: float
+) -> Tuple[int, List[float], int]:
+    correct, latencies = 0, []
+    for text, label in test:
+        calls_before = model.calls
+        started = time.perf_counter()
+        intent = router.route(text).intent
+        elapsed = (time.perf_counter() - started) * 1000
+        latencies.append(elapsed + (model.calls - calls_before) * llm_ms)
+        correct += intent == label
+    return correct, latencies, model.calls
+
+
+def build_embeddings(kind: str) -> Embeddings:
+    if kind == "hashing":
+        return HashingEmbeddings()
+    from app.rag.embeddings import build_embeddings as build_service
+
+    service = build_service(get_settings())
+    service.cache_size = 0  # measure real forward passes, not cache hits
+    return service
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark intent routing.")
+    parser.add_argument("--embeddings", choices=["hf", "hashing"], default="hf")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--min-confidence", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    examples = load_examples(settings.router.examples_path)
+    random.Random(7).shuffle(examples)
+    labels = dict(examples)
+    embeddings = build_embeddings(args.embeddings)
+    min_confidence = args.min_confidence or settings.router.min_confidence
+
+    results = {"legacy": [0, [], 0], "classifier": [0, [], 0]}
+    for fold in range(args.folds):
+        test = examples[fold :: args.folds]
+        train = [ex for i, ex in enumerate(examples) if i % args.folds != fold]
+        classifier = CentroidIntentClassifier(embeddings).fit(train)
+
+        for name, router_cls, kwargs in (
+            ("legacy", LegacyIntentRouter, {}),
+            ("classifier", IntentRouter, {"classifier": classifier, "min_confidence": min_confidence}),
+        ):
+            model = OracleModel(labels)
+            correct, latencies, calls = evaluate(
+                router_cls(model, **kwargs), model, test, args.llm_latency_ms
+            )
+            results[name][0] += correct
+            results[name][1].extend(latencies)
+            results[name][2] += calls
+
+    total = len(examples)
+    print(f"{len(examples)} examples, {args.folds}-fold CV, LLM stub at {args.llm_latency_ms:.0f} ms/call")
+    print(f"{'router':<11} {'accuracy':>9} {'llm calls':>10} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+    for name, (correct, latencies, calls) in results.items():
+        latencies.sort()
+        print(
+            f"{name:<11} {correct / total:>9.1%} {calls:>10} "
+            f"{statistics.median(latencies):>8.2f} {latencies[int(total * 0.95) - 1]:>8.2f} "
+            f"{statistics.fmean(latencies):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+End-to-end load test of the API with deterministic stub backends.
+
+The FastAPI app runs in-process (httpx ASGI transport, no sockets) with the
+real routing, agents, executors, reservation store and order journal, but
+with stub STT, LLM, TTS and retriever that sleep for a configurable latency
+instead of loading models. Each endpoint is driven by `--concurrency` client
+tasks; throughput and p50/p95/p99 latency are reported per endpoint and
+concurrency level. Needs no network, models or audio devices.
+
+    python -m benchmarks.bench_load --concurrency 1 8 32 --requests 200 --save baseline.json
+    python -m benchmarks.bench_load --compare baseline.json --tolerance 0.15
+
+`--compare` exits with status 1 when throughput drops or p95 latency grows by
+more than the tolerance against the baseline.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+import httpx
+from langchain.schema import AIMessage, Document
+
+from app.api import app, get_services
+from app.orchestration.agents import (
+    AssistantOrchestrator,
+    GeneralInfoTool,
+    MenuQATool,
+    OrderAgent,
+    ReservationAgent,
+)
+from app.orchestration.client import GuardedChatModel
+from app.orchestration.orders import OrderJournal
+from app.orchestration.reservations import ReservationStore
+from app.orchestration.router import IntentRouter
+from app.speech.stt import SpeechToText, silence_wav
+from app.speech.tts import TextToSpeech
+
+ENDPOINTS = ("/voice", "/menu/qa", "/order", "/reservation", "/info")
+
+# One utterance per intent, so /voice exercises every agent.
+UTTERANCES = [
+    "What allergens are in the risotto on the menu?",
+    "I want to book a table for four tonight at 8pm",
+    "Can I order two margherita pizzas for delivery?",
+    "What are your opening hours?",
+    "Tell me something nice",
+]
+QUESTIONS = [
+    "Is the risotto gluten free?",
+    "Which desserts do you have?",
+    "Do you have vegan dishes?",
+    "How spicy is the arrabbiata?",
+]
+MENU = [
+    "Mushroom risotto with parmesan. Contains dairy. Gluten free.",
+    "Tiramisu, panna cotta and lemon sorbet are our desserts.",
+    "Vegan options: minestrone, grilled vegetables, arrabbiata.",
+    "Penne arrabbiata is made with fresh chili and is medium spicy.",
+]
+# Stub audio for utterance j is (j + 1) * 10 ms of 16 kHz silence.
+FRAME_BYTES = 320
+
+
+class StubChatModel:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def invoke(self, prompt, **kwargs) -> AIMessage:
+        time.sleep(self.latency)
+        return AIMessage(content="Certainly, happy to help with that.")
+
+    def stream(self, prompt, **kwargs) -> Iterator[AIMessage]:
+        time.sleep(self.latency)
+        for word in ("Certainly, ", "happy ", "to ", "help."):
+            yield AIMessage(content=word)
+
+
+class StubRetriever:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        time.sleep(self.latency)
+        return [
+            Document(page_content=text, metadata={"source": f"menu-{i}"}) for i, text in enumerate(MENU[:k])
+        ]
+
+
+class StubSTT(SpeechToText):
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        time.sleep(self.latency)
+        index = round((len(audio_bytes) - 44) / FRAME_BYTES) - 1
+        return UTTERANCES[index % len(UTTERANCES)]
+
+
+class StubTTS(TextToSpeech):
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.audio = silence_wav(0.25, 16000)
+
+    def synthesize(self, text: str) -> bytes:
+        time.sleep(self.latency)
+        return self.audio
+
+
+def build_services(args: argparse.Namespace, data_dir: Path) -> tuple:
+    model = GuardedChatModel(
+        StubChatModel(args.llm_ms / 1000),
+        max_concurrency=args.llm_concurrency,
+        max_queue=10_000,
+        queue_timeout=600,
+        provider="stub",
+    )
+    reservation_agent = ReservationAgent(ReservationStore(data_dir / "reservations.db"))
+    order_agent = OrderAgent(OrderJournal(data_dir / "orders" / "orders.log", fsync=args.fsync))
+    general_tool = GeneralInfoTool()
+    orchestrator = AssistantOrchestrator(
+        router=IntentRouter(model=model),
+        model=model,
+        menu_tool=MenuQATool(StubRetriever(args.retriever_ms / 1000), model),
+        reservation_agent=reservation_agent,
+        order_agent=order_agent,
+        general_tool=general_tool,
+    )
+    stt, tts = StubSTT(args.stt_ms / 1000), StubTTS(args.tts_ms / 1000)
+    return (orchestrator, reservation_agent, order_agent, general_tool, stt, tts, model)
+
+
+def payload(endpoint: str, i: int) -> dict:
+    if endpoint == "/voice":
+        utterance = i % len(UTTERANCES)
+        audio = silence_wav((utterance + 1) * FRAME_BYTES / 2 / 16000, 16000)
+        return {"audio_base64": base64.b64encode(audio).decode("ascii")}
+    if endpoint == "/menu/qa":
+        return {"question": QUESTIONS[i % len(QUESTIONS)]}
+    if endpoint == "/order":
+        return {"table": str(i % 20), "items": [{"item": "Margherita", "quantity": 1 + i % 3}]}
+    if endpoint == "/reservation":
+        # A new date every 10 bookings keeps slots under capacity.
+        return {
+            "name": f"guest-{i}",
+            "date": f"2032-{1 + i // 280 % 12:02d}-{1 + i // 10 % 28:02d}",
+            "time": f"{12 + i % 10}:00",
+            "guests": 2,
+        }
+    return {"question": "What are your opening hours?"}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    # Nearest rank.
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+async def drive(
+    client: httpx.AsyncClient, endpoint: str, concurrency: int, requests: int, offset: int
+) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal errors, next_index
+        while next_index < requests:
+            i = offset + next_index
+            next_index += 1
+            started = time.perf_counter()
+            response = await client.post(endpoint, json=payload(endpoint, i))
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "throughput": round(requests / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+async def run(args: argparse.Namespace, on_result: Callable[[dict], None]) -> List[dict]:
+    data_dir = Path(tempfile.mkdtemp(prefix="bench-load-"))
+    services = build_services(args, data_dir)
+    app.dependency_overrides[get_services] = lambda: services
+    results = []
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            offset = 0
+            for endpoint in args.endpoints:
+                for concurrency in args.concurrency:
+                    for i in range(args.warmup):
+                        await client.post(endpoint, json=payload(endpoint, offset + i))
+                    offset += args.warmup
+                    result = await drive(client, endpoint, concurrency, args.requests, offset)
+                    offset += args.requests
+                    results.append(result)
+                    on_result(result)
+    finally:
+        app.dependency_overrides.pop(get_services, None)
+        services[2].journal.close()
+    return results
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float, noise_ms: float = 2.0) -> List[dict]:
+    """
+    Annotate each result with its change against the matching baseline
+    entry; `regression` is set when throughput fell or p95 rose by more than
+    `tolerance` (a fraction), or more requests failed. A p95 increase under
+    `noise_ms` is jitter on fast endpoints and never counts.
+    """
+    previous = {(entry["endpoint"], entry["concurrency"]): entry for entry in baseline}
+    compared = []
+    for result in results:
+        base = previous.get((result["endpoint"], result["concurrency"]))
+        if base is None:
+            compared.append({**result, "regression": False})
+            continue
+        throughput_change = result["throughput"] / base["throughput"] - 1 if base["throughput"] else 0.0
+        p95_change = result["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        compared.append(
+            {
+                **result,
+                "throughput_change": round(throughput_change, 4),
+                "p95_change": round(p95_change, 4),
+                "regression": throughput_change < -tolerance
+                or (p95_change > tolerance and result["p95_ms"] - base["p95_ms"] > noise_ms)
+                or result["errors"] > base["errors"],
+            }
+        )
+    return compared
+
+
+def _row(result: dict) -> str:
+    row = (
+        f"{result['endpoint']:<13} {result['concurrency']:>5} {result['throughput']:>9.1f} "
+        f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>6}"
+    )
+    if "throughput_change" in result:
+        row += f" {result['throughput_change']:>+8.1%} {result['p95_change']:>+8.1%}"
+        row += "  REGRESSION" if result["regression"] else ""
+    return row
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS), choices=ENDPOINTS)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint and level")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests before each run")
+    parser.add_argument("--stt-ms", type=float, default=50)
+    parser.add_argument("--llm-ms", type=float, default=200)
+    parser.add_argument("--tts-ms", type=float, default=30)
+    parser.add_argument("--retriever-ms", type=float, default=10)
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="In-flight calls the stub LLM allows")
+    parser.add_argument("--no-fsync", dest="fsync", action="store_false", help="Do not fsync the order journal")
+    parser.add_argument("--save", type=Path, help="Write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--noise-ms", type=float, default=2.0, help="Ignore p95 increases smaller than this")
+    args = parser.parse_args(argv)
+
+    header = f"{'endpoint':<13} {'conc':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>6}"
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"] if args.compare else None
+    print(header)
+    results = asyncio.run(run(args, lambda result: print(_row(result), flush=True)))
+
+    regressions = 0
+    if baseline is not None:
+        compared = compare(results, baseline, args.tolerance, args.noise_ms)
+        regressions = sum(result["regression"] for result in compared)
+        print(f"\nAgainst {args.compare} (tolerance {args.tolerance:.0%}):")
+        print(f"{header} {'req/s Δ':>8} {'p95 Δ':>8}")
+        for result in compared:
+            print(_row(result))
+        print(f"{regressions} regression(s)")
+
+    if args.save:
+        config = {key: value for key, value in vars(args).items() if key not in ("save", "compare")}
+        meta = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "config": config,
+        }
+        args.save.write_text(json.dumps({"meta": meta, "results": results}, indent=2), encoding="utf-8")
+        print(f"Saved {args.save}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
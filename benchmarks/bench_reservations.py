@@ -0,0 +1,111 @@
+"""
+Booking throughput of the SQLite reservation store under concurrent writers.
+
+Writers are threads sharing one store (one API worker) or separate processes
+each opening the same database file (several API workers). Bookings spread
+over a week of dates and dinner slots with ample capacity, so every write
+commits and the numbers measure the store, not refusals. Availability
+lookups are timed against the filled table.
+
+    python -m benchmarks.bench_reservations --writers 1 2 4 8 --bookings 2000
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+from app.models.schemas import ReservationRequest
+from app.orchestration.reservations import ReservationStore
+
+SLOTS = [f"{hour:02d}:{minute:02d}" for hour in range(17, 22) for minute in (0, 30)]
+DATES = [f"2030-06-{day:02d}" for day in range(1, 8)]
+
+
+def _requests(start: int, count: int) -> List[ReservationRequest]:
+    return [
+        ReservationRequest(
+            name=f"guest-{i}",
+            date=DATES[i % len(DATES)],
+            time=SLOTS[i % len(SLOTS)],
+            guests=1 + i % 6,
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def _open(path: str) -> ReservationStore:
+    return ReservationStore(path, seats_per_slot=1_000_000)
+
+
+def _book_all(path: str, start: int, count: int, start_at: float) -> tuple:
+    store = _open(path)
+    requests = _requests(start, count)
+    # Every process starts writing at the same moment, after interpreter start-up.
+    time.sleep(max(0.0, start_at - time.time()))
+    confirmed = sum(store.book(request).confirmed for request in requests)
+    return confirmed, time.time()
+
+
+def run(mode: str, writers: int, bookings: int) -> dict:
+    per_writer = bookings // writers
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "reservations.db")
+        store = _open(path)
+        if mode == "threads":
+            chunks = [_requests(i * per_writer, per_writer) for i in range(writers)]
+            started = time.time()
+            with ThreadPoolExecutor(max_workers=writers) as pool:
+                confirmed = sum(
+                    pool.map(lambda chunk: sum(store.book(r).confirmed for r in chunk), chunks)
+                )
+            elapsed = time.time() - started
+        else:
+            ctx = multiprocessing.get_context("spawn")
+            started = time.time() + 1.0 + 0.5 * writers
+            with ProcessPoolExecutor(max_workers=writers, mp_context=ctx) as pool:
+                futures = [
+                    pool.submit(_book_all, path, i * per_writer, per_writer, started)
+                    for i in range(writers)
+                ]
+                results = [future.result() for future in futures]
+            confirmed = sum(count for count, _ in results)
+            elapsed = max(finished for _, finished in results) - started
+
+        latencies = []
+        for i in range(1000):
+            begin = time.perf_counter()
+            store.availability(DATES[i % len(DATES)], SLOTS[i % len(SLOTS)], 6)
+            latencies.append((time.perf_counter() - begin) * 1_000_000)
+        assert confirmed == store.count() == per_writer * writers
+    return {
+        "mode": mode,
+        "writers": writers,
+        "bookings_per_s": confirmed / elapsed,
+        "lookup_p50_us": statistics.median(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--modes", nargs="+", default=["threads", "processes"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'writers':>7} {'bookings/s':>11} {'lookup p50 us':>14}")
+    for mode in args.modes:
+        for writers in args.writers:
+            row = run(mode, writers, args.bookings)
+            print(
+                f"{row['mode']:<10} {row['writers']:>7} {row['bookings_per_s']:>11.0f} "
+                f"{row['lookup_p50_us']:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Compare query latency and per-reader memory of the NumPy and Chroma backends.
+
+Uses synthetic unit vectors so the embedding model is not part of the
+measurement. Chroma is skipped when chromadb is not installed.
+
+    python -m benchmarks.bench_vector_store --sizes 1000 10000 100000
+"""
+
+import argparse
+import gc
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+from langchain.schema.embeddings import Embeddings
+
+from app.rag.numpy_store import NumpyVectorStore
+
+
+class LookupEmbeddings(Embeddings):
+    """
+    Returns precomputed vectors keyed by text, so both backends index and query
+    identical data at zero embedding cost.
+    """
+
+    def __init__(self, vectors: Dict[str, np.ndarray]):
+        self.vectors = vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.vectors[text].tolist() for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.vectors[text].tolist()
+
+
+def anonymous_kb() -> int:
+    # Anonymous memory is what every worker pays for itself; file-backed mmap
+    # pages of the index live in the page cache and are shared between workers.
+    with open("/proc/self/smaps_rollup", encoding="utf-8") as handle:
+        for line in handle:
+            if line.startswith("Anonymous:"):
+                return int(line.split()[1])
+    return 0
+
+
+def build(store, texts: List[str], batch_size: int = 5000) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start : start + batch_size]
+        store.add_texts(batch, metadatas=[{"source": "bench"}] * len(batch), ids=batch)
+    if hasattr(store, "persist"):
+        store.persist()
+    return time.perf_counter() - started
+
+
+def measure(open_store, queries: List[str], k: int) -> dict:
+    gc.collect()
+    before = anonymous_kb()
+    store = open_store()
+    store.similarity_search(queries[0], k=k)
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        store.similarity_search(query, k=k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "anon_mb": (anonymous_kb() - before) / 1024,
+    }
+
+
+def run(size: int, dim: int, n_queries: int, k: int) -> List[dict]:
+    rng = np.random.default_rng(size)
+    matrix = rng.standard_normal((size + n_queries, dim)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    texts = [f"chunk-{i}" for i in range(size)]
+    queries = [f"query-{i}" for i in range(n_queries)]
+    embeddings = LookupEmbeddings(dict(zip(texts + queries, matrix)))
+    rows = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "numpy"
+        build_s = build(NumpyVectorStore(str(path), embeddings), texts)
+        stats = measure(lambda: NumpyVectorStore(str(path), embeddings), queries, k)
+        rows.append({"backend": "numpy", "size": size, "build_s": build_s, **stats})
+
+        try:
+            from langchain_community.vectorstores import Chroma
+            import chromadb  # noqa: F401
+        except ImportError:
+            print("chromadb not installed; skipping Chroma")
+            return rows
+        path = Path(tmp) / "chroma"
+        build_s = build(Chroma(persist_directory=str(path), embedding_function=embeddings), texts)
+        stats = measure(
+            lambda: Chroma(persist_directory=str(path), embedding_function=embeddings),
+            queries,
+            k,
+        )
+        rows.append({"backend": "chroma", "size": size, "build_s": build_s, **stats})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384, help="all-MiniLM-L6-v2 width")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'chunks':>8} {'build s':>9} {'p50 ms':>8} {'p95 ms':>8} {'anon MB':>8}")
+    for size in args.sizes:
+        for row in run(size, args.dim, args.queries, args.k):
+            print(
+                f"{row['backend']:<8} {row['size']:>8} {row['build_s']:>9.2f} "
+                f"{row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f} {row['anon_mb']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
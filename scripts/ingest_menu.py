@@ -1,5 +1,8 @@
 """
 Ingest menu and FAQ documents into a local Chroma vector store.
+
+Runs incrementally by default: only added or changed files are embedded and
+chunks of deleted files are removed.
 """
 
 import argparse
@@ -16,13 +19,44 @@ def main():
         default=None,
         help="Override persistence directory for vector store.",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Drop the existing collection and re-embed every document.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report which files would be added, re-embedded or removed.",
+    )
     args = parser.parse_args()
 
     settings = get_settings()
-    vectordb = ingest_menu(settings, args.persist_dir)
+    report = ingest_menu(
+        settings, args.persist_dir, full=args.full, dry_run=args.dry_run
+    )
+    prefix = "[dry-run] " if report.dry_run else ""
+    for label, paths in (
+        ("added", report.added),
+        ("changed", report.changed),
+        ("removed", report.removed),
+    ):
+        for path in paths:
+            print(f"{prefix}{label}: {path}")
     print(
-        f"Ingested documents from {settings.rag.menu_dir} into {vectordb._persist_directory}"
+        f"{prefix}{len(report.added)} added, {len(report.changed)} changed, "
+        f"{len(report.removed)} removed, {len(report.unchanged)} unchanged"
+        f"{' (full rebuild)' if report.full else ''}"
     )
+    if not report.dry_run:
+        print(
+            f"Embedded {report.chunks_added} chunks and deleted {report.chunks_deleted} "
+            f"from {settings.rag.menu_dir} into {report.persist_directory}"
+        )
+        print(
+            f"Throughput: {report.docs_per_sec:.1f} docs/sec, "
+            f"{report.chunks_per_sec:.1f} chunks/sec ({report.elapsed_seconds:.2f}s)"
+        )
 
 
 if __name__ == "__main__":
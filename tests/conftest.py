@@ -0,0 +1,23 @@
+import pytest
+from langchain.schema.embeddings import Embeddings
+
+VOCAB = ["risotto", "tiramisu", "espresso", "vegan", "gluten"]
+
+
+class KeywordEmbeddings(Embeddings):
+    """
+    Offline embedding stub: one dimension per menu keyword, so similarity
+    follows shared words.
+    """
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(term)) + 0.01 for term in VOCAB]
+
+
+@pytest.fixture
+def keyword_embeddings():
+    return KeywordEmbeddings()
@@ -0,0 +1,107 @@
+from langchain.schema.embeddings import Embeddings
+
+from app.models.schemas import MenuAnswer
+from app.rag.cache import AnswerCache, normalize_question
+from app.rag.embeddings import EmbeddingService
+
+VOCAB = ["risotto", "vegetarian", "vegan", "tiramisu", "gluten", "is", "the"]
+
+
+def bag_of_words(text: str):
+    words = normalize_question(text).split()
+    return [float(words.count(term)) for term in VOCAB]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalize_question():
+    assert normalize_question("  Is the Risotto vegetarian?? ") == "is the risotto vegetarian"
+
+
+def test_exact_and_semantic_hits():
+    cache = AnswerCache(embed_fn=bag_of_words, similarity_threshold=0.9)
+    answer = MenuAnswer(answer="Yes, it is.", sources=["menu.txt"])
+    cache.put("Is the risotto vegetarian?", answer)
+
+    assert cache.get("is the RISOTTO vegetarian") == answer
+    assert cache.get("the risotto is vegetarian") == answer
+    assert cache.get("is the tiramisu gluten free") is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.semantic_hits, stats.misses) == (1, 1, 1)
+
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = AnswerCache(max_entries=2, ttl_seconds=10, clock=clock)
+    for question in ("a", "b", "c"):
+        cache.put(question, MenuAnswer(answer=question))
+    assert cache.get("a") is None
+    assert cache.get("c").answer == "c"
+    assert cache.stats().evictions == 1
+
+    clock.now = 11
+    assert cache.get("c") is None
+
+
+def test_invalidated_when_store_version_changes():
+    clock = FakeClock()
+    reads = []
+    version = {"value": "v1"}
+
+    def version_fn():
+        reads.append(clock.now)
+        return version["value"]
+
+    cache = AnswerCache(version_fn=version_fn, version_check_seconds=1.0, clock=clock)
+    cache.put("hours?", MenuAnswer(answer="11-22"))
+    for _ in range(5):
+        assert cache.get("hours?") is not None
+    assert len(reads) == 2  # construction and the put, not every lookup
+
+    version["value"] = "v2"
+    assert cache.get("hours?") is not None  # not due for a check yet
+    clock.now = 1.5
+    assert cache.get("hours?") is None
+    assert cache.stats().invalidations == 1
+
+
+def test_answer_from_before_a_reingest_is_not_stored():
+    version = {"value": "v1"}
+    cache = AnswerCache(version_fn=lambda: version["value"], version_check_seconds=60)
+    assert cache.get("hours?") is None
+    version["value"] = "v2"  # re-ingested while the answer was generated
+    cache.put("hours?", MenuAnswer(answer="stale"))
+    assert cache.get("hours?") is None
+
+    cache.put("hours?", MenuAnswer(answer="11-22"))
+    assert cache.get("hours?").answer == "11-22"
+
+
+class RecordingEmbeddings(Embeddings):
+    def __init__(self):
+        self.seen = []
+
+    def embed_documents(self, texts):
+        self.seen.extend(texts)
+        return [bag_of_words(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_shared_embedding_service_only_sees_original_questions():
+    model = RecordingEmbeddings()
+    service = EmbeddingService(model, batch_window_ms=0)
+    cache = AnswerCache(embed_fn=service.embed_query, similarity_threshold=0.9)
+    cache.put("Is the Risotto vegan?", MenuAnswer(answer="Yes.", sources=[]))
+    assert cache.get("The risotto: is it vegan?").answer == "Yes."
+    service.embed_query("Is the Risotto vegan?")  # what retrieval asks for next
+
+    assert model.seen == ["Is the Risotto vegan?", "The risotto: is it vegan?"]
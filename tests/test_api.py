@@ -1,6 +1,16 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Bookings and orders made by these tests must not land in (or depend on) data/.
+os.environ.setdefault("RESERVATIONS__DB_PATH", ":memory:")
+os.environ.setdefault("ORDERS__JOURNAL_PATH", os.path.join(tempfile.mkdtemp(), "orders.log"))
+
 from fastapi.testclient import TestClient
 
-from app.api import app
+from app.api import app, state
 
 client = TestClient(app)
 
@@ -36,3 +46,291 @@ def test_order_endpoint():
     body = resp.json()
     assert body["confirmed"] is True
     assert body["total_items"] == 3
+
+    queue = client.get("/kitchen/queue").json()
+    assert queue[-1]["reference"] == body["reference"]
+    assert client.get("/kitchen/dishes").json()["pasta"] >= 2
+    assert client.get("/kitchen/tables").json()["12"] >= 3
+    assert client.post(f"/kitchen/{body['reference']}/done").status_code == 200
+    assert client.post(f"/kitchen/{body['reference']}/done").status_code == 404
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_voice_stream_endpoint():
+    resp = client.post("/voice/stream", json={"text": "What are your opening hours?"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(resp.text)
+    names = [name for name, _ in events]
+    assert names[0] == "intent" and names[-1] == "done"
+    assert "token" in names and "audio" in names
+    done = events[-1][1]
+    assert done["intent"] == "general"
+    assert done["llm_calls"] == 0
+    assert done["text"] == "".join(data["text"] for name, data in events if name == "token")
+
+
+def test_ready_reports_503_until_bootstrapped():
+    state.reset()
+    resp = client.get("/ready")
+    assert resp.status_code == 503
+    assert resp.json()["ready"] is False
+
+
+def test_ready_after_lifespan_warmup():
+    from app.config import Settings, get_settings
+
+    state.reset()
+    # No Ollama here, so the LLM warmup fails; it must not be required.
+    app.dependency_overrides[get_settings] = lambda: Settings(api={"required_components": ["stt", "tts"]})
+    try:
+        with TestClient(app) as warm_client:
+            resp = warm_client.get("/ready")
+    finally:
+        app.dependency_overrides.clear()
+    assert resp.status_code == 200
+    components = resp.json()["components"]
+    assert {"llm", "retriever", "stt", "tts"} <= set(components)
+    assert components["tts"]["warmup_seconds"] is not None
+
+
+def test_ready_is_503_while_a_required_component_failed():
+    from app.lifecycle import ServiceState
+
+    service_state = ServiceState()
+    service_state.services, service_state.warmed = (), True
+    with service_state.timed("reservations"):
+        raise OSError("disk full")
+    assert service_state.readiness(["llm", "stt"]).ready
+    with service_state.timed("llm", "warmup"):
+        raise ConnectionError("ollama down")
+    readiness = service_state.readiness(["llm", "stt"])
+    assert not readiness.ready
+    assert readiness.components["llm"].detail == "warmup failed: ollama down"
+
+
+def _voice_audio_services():
+    from app.orchestration.agents import (
+        AssistantOrchestrator,
+        GeneralInfoTool,
+        OrderAgent,
+        ReservationAgent,
+    )
+    from app.orchestration.router import IntentRouter
+    from app.speech.stt import SpeechToText, silence_wav
+    from app.speech.tts import TextToSpeech
+
+    class HoursSTT(SpeechToText):
+        def transcribe(self, audio_bytes):
+            assert audio_bytes.startswith(b"RIFF")
+            return "What are your opening hours?"
+
+    class StereoTTS(TextToSpeech):
+        def synthesize(self, text):
+            # 0.5 s of 22.05 kHz stereo, like pyttsx3's output on some drivers
+            return _wav(np.zeros((11025, 2), dtype=np.int16), 22050)
+
+    orchestrator = AssistantOrchestrator(
+        router=IntentRouter(),
+        model=None,
+        menu_tool=None,
+        reservation_agent=ReservationAgent(),
+        order_agent=OrderAgent(),
+        general_tool=GeneralInfoTool(),
+    )
+    return lambda: (orchestrator, None, None, None, HoursSTT(), StereoTTS(), None), silence_wav(0.2, 16000)
+
+
+def _wav(samples, rate):
+    import io
+    import wave
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(samples.shape[1] if samples.ndim > 1 else 1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def test_voice_audio_takes_and_returns_raw_bytes():
+    from urllib.parse import unquote
+
+    from app.api import get_services
+    from app.orchestration.agents import GeneralInfoTool
+
+    services, recording = _voice_audio_services()
+    app.dependency_overrides[get_services] = services
+    try:
+        wav = client.post("/voice/audio", content=recording, headers={"Content-Type": "audio/wav"})
+        pcm = client.post(
+            "/voice/audio?format=pcm&sample_rate=8000",
+            content=recording,
+            headers={"Content-Type": "audio/wav"},
+        )
+        unsupported = client.post("/voice/audio", json={"text": "hi"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert wav.status_code == 200 and wav.headers["content-type"] == "audio/wav"
+    assert unquote(wav.headers["x-transcript"]) == "What are your opening hours?"
+    assert wav.headers["x-intent"] == "general" and wav.headers["x-llm-calls"] == "0"
+    assert unquote(wav.headers["x-reply-text"]) == GeneralInfoTool().info_map["hours"]
+    assert wav.content[:4] == b"RIFF"
+    # Downmixed to 16-bit mono at the source rate: 0.5 s * 22050 * 2 bytes + header
+    assert len(wav.content) == 44 + 22050
+
+    assert pcm.headers["content-type"].startswith("audio/L16;rate=8000")
+    assert len(pcm.content) == 4000 * 2
+
+    assert unsupported.status_code == 415
+
+
+def test_failing_tts_degrades_to_text_only():
+    from app.api import get_services
+    from app.speech.tts import TextToSpeech
+
+    class CrashingTTS(TextToSpeech):
+        def synthesize(self, text):
+            raise TimeoutError("Text-to-speech took longer than 30s")
+
+    services, recording = _voice_audio_services()
+    services = (*services()[:5], CrashingTTS(), None)
+    app.dependency_overrides[get_services] = lambda: services
+    try:
+        voice = client.post("/voice", json={"text": "What are your opening hours?"})
+        audio = client.post("/voice/audio", content=recording, headers={"Content-Type": "audio/wav"})
+        stream = client.post("/voice/stream", json={"text": "What are your opening hours?"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert voice.status_code == 200
+    assert voice.json()["text"] and voice.json()["audio_base64"] is None
+    assert audio.status_code == 200 and audio.content == b""
+    assert audio.headers["X-Reply-Text"]
+    events = _parse_sse(stream.text)
+    assert events[-1][0] == "done" and events[-1][1]["text"]
+    audio_events = [data for name, data in events if name == "audio"]
+    assert audio_events and all(data["audio_base64"] is None for data in audio_events)
+
+
+def test_pcm_output_is_big_endian_l16():
+    from app.speech.tts import convert_audio
+
+    source = np.array([16384, -2, 300], dtype=np.int16)
+    body, media_type = convert_audio(_wav(source, 16000), pcm=True)
+    assert media_type == "audio/L16;rate=16000;channels=1"
+    assert np.abs(np.frombuffer(body, dtype=">i2").astype(int) - source).max() <= 1
+    wav, _ = convert_audio(_wav(np.stack([source, source], axis=1), 16000))
+    assert np.abs(np.frombuffer(wav[44:], dtype="<i2").astype(int) - source).max() <= 1
+
+
+def test_l16_upload_is_decoded_as_big_endian():
+    from app.api import get_services
+    from app.speech.stt import SpeechToText, pcm_from_bytes
+
+    received = []
+
+    class RecordingSTT(SpeechToText):
+        def transcribe(self, audio_bytes):
+            received.append(pcm_from_bytes(audio_bytes, 16000))
+            return "What are your opening hours?"
+
+    services, _ = _voice_audio_services()
+    services = (*services()[:4], RecordingSTT(), None, None)
+    source = np.array([16384, -2, 300, -16384], dtype=np.int16)
+    app.dependency_overrides[get_services] = lambda: services
+    try:
+        ok = client.post(
+            "/voice/audio",
+            content=source.astype(">i2").tobytes(),
+            headers={"Content-Type": "audio/L16; rate=16000"},
+        )
+        no_rate = client.post("/voice/audio", content=b"\x00\x01", headers={"Content-Type": "audio/L16"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert ok.status_code == 200
+    assert np.abs(received[0] * 32768 - source).max() <= 1
+    assert no_rate.status_code == 415
+
+
+def test_batch_endpoints_report_partial_failures():
+    orders = client.post(
+        "/order/batch",
+        json=[
+            {"table": "3", "items": [{"item": "Soup", "quantity": 2}]},
+            {"table": "3", "items": [{"item": "Soup", "quantity": 0}]},
+            {"table": "5", "items": [{"item": "Salad"}]},
+        ],
+    ).json()
+    assert (orders["succeeded"], orders["failed"]) == (2, 1)
+    assert [result["ok"] for result in orders["results"]] == [True, False, True]
+    assert "quantity" in orders["results"][1]["error"]
+    assert orders["results"][0]["result"]["reference"].startswith("ORD-")
+
+    booking = {"name": "POS", "date": "2031-01-10", "time": "18:00"}
+    reservations = client.post(
+        "/reservation/batch",
+        json=[
+            {**booking, "guests": 30},
+            {**booking, "guests": 20},
+            {**booking, "guests": "many"},
+            {**booking, "time": "6pm", "guests": 2},
+        ],
+    ).json()
+    assert [result["ok"] for result in reservations["results"]] == [True, False, False, False]
+    assert reservations["results"][1]["result"]["reference"] == "RSV-FULL"
+    assert reservations["results"][2]["result"] is None
+    assert reservations["results"][3]["result"]["reference"] == "RSV-INVALID"
+
+
+def test_voice_timings_debug_and_metrics():
+    from app.api import get_services
+    from app.config import Settings, get_settings
+
+    services, recording = _voice_audio_services()
+    app.dependency_overrides[get_services] = services
+    app.dependency_overrides[get_settings] = lambda: Settings(api={"timing_debug": True})
+    try:
+        resp = client.post("/voice", json={"text": "What are your opening hours?"})
+    finally:
+        app.dependency_overrides.clear()
+
+    body = resp.json()
+    assert set(body["timings_ms"]) == {"route", "tts"}
+    assert resp.headers["server-timing"].startswith("route;dur=")
+
+    metrics = client.get("/metrics")
+    assert metrics.headers["content-type"].startswith("text/plain")
+    assert 'assistant_stage_seconds_count{stage="route",intent="general",provider="",path="heuristic"}' in metrics.text
+    assert 'assistant_request_seconds_bucket{endpoint="/voice",intent="general",le="+Inf"}' in metrics.text
+
+
+def test_bootstrap_survives_unopenable_storage():
+    from app.api import bootstrap
+    from app.config import Settings
+    from app.lifecycle import ServiceState
+    from app.models.schemas import OrderRequest, ReservationRequest
+
+    service_state = ServiceState()
+    settings = Settings(
+        reservations={"db_path": "/proc/nonexistent/reservations.db"},
+        orders={"journal_path": "/proc/nonexistent/orders/orders.log"},
+        router={"classifier_enabled": False},
+    )
+    _, reservation_agent, order_agent, _, _, _, _ = bootstrap(settings, service_state)
+
+    booking = ReservationRequest(name="x", date="2031-02-01", time="19:00", guests=2)
+    assert reservation_agent.book(booking).confirmed
+    order = OrderRequest(table="1", items=[{"item": "Soup"}])
+    assert order_agent.place_order(order).confirmed
+    assert {"reservations", "order_journal"} <= set(service_state.errors)
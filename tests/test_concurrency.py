@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import httpx
+
+from app.api import app, get_executor, get_services
+from app.concurrency import StageExecutor
+from app.config import Settings
+from app.orchestration.agents import GeneralInfoTool, OrderAgent, ReservationAgent
+from app.speech.tts import NullTTS
+
+SLOW_SECONDS = 0.5
+
+
+class SlowOrchestrator:
+    menu_tool = None
+
+    def handle(self, text: str) -> tuple[str, str]:
+        time.sleep(SLOW_SECONDS)  # simulates a blocking Ollama call
+        return f"echo: {text}", "fallback"
+
+
+def _services():
+    return (
+        SlowOrchestrator(),
+        ReservationAgent(),
+        OrderAgent(),
+        GeneralInfoTool(),
+        None,
+        NullTTS(),
+        None,
+    )
+
+
+async def _exercise():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        voice_calls = [
+            asyncio.create_task(client.post("/voice", json={"text": f"hello {i}"}))
+            for i in range(4)
+        ]
+        await asyncio.sleep(0.05)
+
+        start = time.perf_counter()
+        health = await client.get("/health")
+        health_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reservation = await client.post(
+            "/reservation",
+            json={"name": "Ana", "date": "2025-12-24", "time": "20:00", "guests": 2},
+        )
+        reservation_elapsed = time.perf_counter() - start
+
+        pending = sum(not task.done() for task in voice_calls)
+        voices = await asyncio.gather(*voice_calls)
+    return health, health_elapsed, reservation, reservation_elapsed, pending, voices
+
+
+def test_voice_does_not_block_event_loop():
+    executor = StageExecutor(Settings(workers={"llm_workers": 2}))
+    app.dependency_overrides[get_services] = _services
+    app.dependency_overrides[get_executor] = lambda: executor
+    try:
+        health, health_elapsed, reservation, reservation_elapsed, pending, voices = (
+            asyncio.run(_exercise())
+        )
+    finally:
+        app.dependency_overrides.clear()
+        executor.shutdown()
+
+    assert pending == 4
+    assert health.status_code == 200
+    assert reservation.status_code == 200
+    assert health_elapsed < SLOW_SECONDS / 5
+    assert reservation_elapsed < SLOW_SECONDS / 5
+    assert [v.json()["text"] for v in voices] == [f"echo: hello {i}" for i in range(4)]
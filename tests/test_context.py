@@ -0,0 +1,66 @@
+from langchain.schema import Document
+from langchain_community.chat_models.fake import FakeListChatModel
+
+from app.models.schemas import MenuQuery
+from app.orchestration.agents import MenuQATool
+from app.rag.context import MENU_QA_PREFIX, ContextBuilder, estimate_tokens
+from app.rag.ingest import _splitter
+
+MENU = " ".join(
+    f"Dish {i}: grilled {name} with herbs, lemon and a side of seasonal greens."
+    for i, name in enumerate(["sea bass", "chicken", "halloumi", "lamb", "tofu", "prawns"] * 6)
+)
+
+
+def _chunks():
+    doc = Document(page_content=MENU, metadata={"source": "menu.txt"})
+    return _splitter(200, 50).split_documents([doc])
+
+
+def test_overlapping_chunks_are_stitched_back_together():
+    chunks = _chunks()
+    merged = ContextBuilder.merge([chunks[3], chunks[1], chunks[2], chunks[8]])
+    assert [doc.metadata["start_index"] for doc in merged] == [
+        chunks[1].metadata["start_index"],
+        chunks[8].metadata["start_index"],
+    ]
+    start = chunks[1].metadata["start_index"]
+    end = chunks[3].metadata["start_index"] + len(chunks[3].page_content)
+    assert merged[0].page_content == MENU[start:end]
+
+
+def test_near_duplicates_are_dropped():
+    docs = [
+        Document(page_content="Tiramisu: mascarpone, espresso, cocoa.", metadata={"source": "a"}),
+        Document(page_content="Tiramisu - mascarpone, espresso and cocoa.", metadata={"source": "b"}),
+        Document(page_content="Panna cotta with berries.", metadata={"source": "c"}),
+    ]
+    kept = ContextBuilder(duplicate_threshold=0.8).deduplicate(docs)
+    assert [doc.metadata["source"] for doc in kept] == ["a", "c"]
+
+
+def test_context_respects_token_budget():
+    chunks = _chunks()
+    built = ContextBuilder(max_tokens=120).build(chunks[::3])
+    assert built.tokens <= 120
+    assert estimate_tokens(built.text) <= 120 + len(built.documents)
+    assert built.text.startswith(chunks[0].page_content)
+
+
+def test_menu_prompt_keeps_static_prefix_and_reports_tokens():
+    class Retriever:
+        def similarity_search(self, question, k=4):
+            return _chunks()[:k]
+
+    tool = MenuQATool(
+        Retriever(),
+        FakeListChatModel(responses=["ok"] * 2),
+        context_builder=ContextBuilder(max_tokens=100),
+    )
+    first, _, _, tokens = tool.build_prompt(MenuQuery(question="Is the lamb grilled?"))
+    second, _, _, _ = tool.build_prompt(MenuQuery(question="Any tofu?"))
+    assert first.startswith(MENU_QA_PREFIX) and second.startswith(MENU_QA_PREFIX)
+    assert tokens == estimate_tokens(first) < estimate_tokens(MENU_QA_PREFIX) + 130
+    answer = tool.answer(MenuQuery(question="Is the lamb grilled?"))
+    assert answer.prompt_tokens == tokens
+    assert answer.sources == ["menu.txt"]
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from langchain.schema.embeddings import Embeddings
+
+from app.rag.embeddings import EmbeddingService
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        time.sleep(self.delay)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_query_vectors_are_cached_by_normalized_text():
+    model = CountingEmbeddings()
+    service = EmbeddingService(model, batch_window_ms=0)
+    first = service.embed_query("Is the risotto vegan?")
+    assert service.embed_query("is the RISOTTO vegan") == first
+    assert model.calls == [["Is the risotto vegan?"]]  # the model sees the text as asked
+    stats = service.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_concurrent_queries_share_one_forward_pass():
+    model = CountingEmbeddings(delay=0.01)
+    service = EmbeddingService(model, batch_window_ms=50, max_batch=16)
+    questions = [f"question {i}" for i in range(8)] + ["question 0"]
+    results = {}
+
+    def ask(question):
+        results[question] = service.embed_query(question)
+
+    threads = [threading.Thread(target=ask, args=(q,)) for q in questions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results["question 3"] == [10.0, 1.0]
+    assert sum(len(call) for call in model.calls) <= 8
+    assert len(model.calls) < 8
+    assert service.stats().max_batch_size > 1
+
+
+def test_batched_queries_embed_the_original_text():
+    model = CountingEmbeddings()
+    service = EmbeddingService(model, batch_window_ms=20)
+    assert service.embed_query("Gluten-free PASTA?") == [float(len("Gluten-free PASTA?")), 1.0]
+    assert model.calls == [["Gluten-free PASTA?"]]
@@ -0,0 +1,103 @@
+from app.config import Settings
+from app.rag import ingest
+from app.rag.lexical import BM25Index
+from app.rag.ingest import (
+    chunk_ids,
+    ingest_menu,
+    iter_splits,
+    load_retriever,
+    plan_ingest,
+    save_manifest,
+    scan_menu_dir,
+)
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_plan_detects_added_changed_removed(tmp_path):
+    _write(tmp_path / "menu.txt", "Risotto 18 EUR")
+    _write(tmp_path / "faq" / "hours.md", "Open 11-22")
+    _write(tmp_path / "ignored.csv", "not a menu doc")
+    current = scan_menu_dir(tmp_path)
+    assert sorted(current) == ["faq/hours.md", "menu.txt"]
+
+    manifest = {
+        "menu.txt": {"hash": "stale", "chunk_ids": ["a"]},
+        "faq/hours.md": {"hash": current["faq/hours.md"], "chunk_ids": ["b"]},
+        "old.txt": {"hash": "gone", "chunk_ids": ["c"]},
+    }
+    _write(tmp_path / "drinks.txt", "Espresso 2 EUR")
+    report = plan_ingest(scan_menu_dir(tmp_path), manifest)
+    assert report.added == ["drinks.txt"]
+    assert report.changed == ["menu.txt"]
+    assert report.removed == ["old.txt"]
+    assert report.unchanged == ["faq/hours.md"]
+
+
+def test_chunk_ids_are_deterministic():
+    assert chunk_ids("menu.txt", "abcdef0123456789", 2) == [
+        "menu.txt#abcdef012345#0",
+        "menu.txt#abcdef012345#1",
+    ]
+
+
+def test_dry_run_uses_manifest_without_touching_store(tmp_path):
+    menu_dir, store = tmp_path / "menu", tmp_path / "store"
+    _write(menu_dir / "menu.txt", "Risotto 18 EUR")
+    store.mkdir()
+    save_manifest(store, {"menu.txt": {"hash": "old", "chunk_ids": ["x"]}})
+    BM25Index().save(store)
+    settings = Settings(rag={"menu_dir": menu_dir, "vector_store_path": store})
+
+    report = ingest_menu(settings, dry_run=True)
+    assert report.dry_run and not report.full
+    assert report.changed == ["menu.txt"]
+    assert report.vectordb is None
+    assert sorted(p.name for p in store.iterdir()) == ["bm25.json", "manifest.json"]
+
+
+def test_iter_splits_parallel_matches_serial(tmp_path):
+    for index in range(4):
+        _write(tmp_path / f"menu{index}.txt", f"Dish {index} costs {index} EUR. " * 40)
+    rel_paths = sorted(scan_menu_dir(tmp_path))
+
+    def collect(workers):
+        settings = Settings(rag={"chunk_size": 200, "chunk_overlap": 20, "ingest_workers": workers})
+        return {result[0]: result[1:] for result in iter_splits(tmp_path, rel_paths, settings)}
+
+    parallel = collect(2)
+    assert parallel == collect(1)
+    assert all(loaded == 1 and len(texts) > 1 for loaded, texts, _ in parallel.values())
+
+
+def test_incremental_ingest_with_numpy_backend(tmp_path, monkeypatch, keyword_embeddings):
+    monkeypatch.setattr(ingest, "build_embeddings", lambda settings=None: keyword_embeddings)
+    menu_dir, store = tmp_path / "menu", tmp_path / "store"
+    _write(menu_dir / "mains.txt", "risotto 18 EUR")
+    _write(menu_dir / "desserts.txt", "tiramisu 7 EUR")
+    settings = Settings(
+        rag={"menu_dir": menu_dir, "vector_store_path": store, "vector_backend": "numpy"}
+    )
+
+    first = ingest_menu(settings)
+    assert first.full and first.chunks_added == 2
+
+    _write(menu_dir / "desserts.txt", "tiramisu 8 EUR")
+    (menu_dir / "mains.txt").unlink()
+    second = ingest_menu(settings)
+    assert not second.full
+    assert (second.changed, second.removed) == (["desserts.txt"], ["mains.txt"])
+    assert (second.chunks_added, second.chunks_deleted) == (1, 2)
+
+    retriever = load_retriever(settings)
+    assert [doc.page_content for doc in retriever.similarity_search("tiramisu")] == [
+        "tiramisu 8 EUR"
+    ]
+    lexical = BM25Index.load(store)
+    assert [hit.document.page_content for hit in lexical.search("tiramisu")] == [
+        "tiramisu 8 EUR"
+    ]
+    assert lexical.search("risotto") == []
@@ -1,4 +1,18 @@
-from app.orchestration.router import IntentRouter
+from pathlib import Path
+
+from langchain.schema import AIMessage
+from langchain.schema.embeddings import Embeddings
+from langchain_community.chat_models.fake import FakeListChatModel
+
+from app.orchestration.agents import (
+    AssistantOrchestrator,
+    GeneralInfoTool,
+    OrderAgent,
+    ReservationAgent,
+)
+from app.orchestration.classifier import CentroidIntentClassifier, load_examples
+from app.orchestration.llm import LLMCallCounter, count_llm_calls
+from app.orchestration.router import INTENTS, IntentRouter, parse_route_reply
 
 
 def test_intent_router_heuristics():
@@ -13,3 +27,104 @@ def test_intent_router_fallback():
     router = IntentRouter()
     result = router.route("Hello there")
     assert result.intent in {"general", "fallback"}
+
+
+def test_heuristic_matches_word_starts_only():
+    router = IntentRouter()
+    assert router.route("Any bookings left for tonight?").intent == "reservation"
+    assert router.heuristic_route("I saw you on facebook").intent == "fallback"
+
+
+class StubClassifier:
+    def __init__(self, scores):
+        self.scores = scores
+
+    def predict(self, text):
+        return self.scores
+
+
+class StubModel:
+    def __init__(self, label):
+        self.label = label
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return AIMessage(content=self.label)
+
+
+def test_confident_classifier_skips_llm():
+    model = StubModel("order")
+    router = IntentRouter(model, classifier=StubClassifier({"general": 0.9, "menu": 0.1}))
+    result = router.route("Can I bring my dog?")
+    assert (result.intent, result.reason) == ("general", "embedding classifier")
+    assert result.scores == {"general": 0.9, "menu": 0.1}
+    assert model.calls == 0
+
+
+def test_low_confidence_classifier_falls_back_to_llm():
+    model = StubModel("order")
+    router = IntentRouter(
+        model, classifier=StubClassifier({"general": 0.4, "menu": 0.6}), min_confidence=0.7
+    )
+    assert router.route("Something vague").intent == "order"
+    assert model.calls == 1
+
+
+class HashingEmbeddings(Embeddings):
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        vector = [0.0] * 64
+        for word in text.lower().split():
+            vector[sum(map(ord, word.strip("?!.,"))) % 64] += 1.0
+        return vector
+
+
+def test_centroid_classifier_scores_are_probabilities():
+    examples = load_examples(Path("data/intents/examples.jsonl"))
+    assert {label for _, label in examples} == set(INTENTS)
+    classifier = CentroidIntentClassifier(HashingEmbeddings()).fit(examples)
+    scores = classifier.predict("I'd like to book a table for four tonight")
+    assert set(scores) == set(INTENTS)
+    assert abs(sum(scores.values()) - 1.0) < 1e-6
+    assert max(scores, key=scores.get) == "reservation"
+
+
+def test_parse_route_reply_is_lenient():
+    assert parse_route_reply('{"intent": "order", "reply": "Two pizzas, coming up."}') == (
+        "order",
+        "Two pizzas, coming up.",
+    )
+    fenced = '```json\n{"intent": "Fallback", "reply": "Hi there!"}\n```'
+    assert parse_route_reply(fenced) == ("fallback", "Hi there!")
+    assert parse_route_reply('{"intent": "reservation", "reply": "Booked for') == ("reservation", None)
+    assert parse_route_reply("menu") == ("menu", None)
+    assert parse_route_reply("no idea") == ("fallback", None)
+
+
+def _orchestrator(responses, combined):
+    model = FakeListChatModel(responses=responses, callbacks=[LLMCallCounter()])
+    return AssistantOrchestrator(
+        router=IntentRouter(model, combined=combined),
+        model=model,
+        menu_tool=None,
+        reservation_agent=ReservationAgent(),
+        order_agent=OrderAgent(),
+        general_tool=GeneralInfoTool(),
+    )
+
+
+def test_combined_routing_answers_fallback_in_one_call():
+    orchestrator = _orchestrator(['{"intent": "fallback", "reply": "Hi! How can I help?"}'], True)
+    with count_llm_calls() as usage:
+        reply, intent = orchestrator.handle("Hello there")
+    assert (reply, intent, usage.calls) == ("Hi! How can I help?", "fallback", 1)
+
+
+def test_unusable_combined_reply_falls_back_to_second_call():
+    orchestrator = _orchestrator(["fallback", "Hello from the assistant."], True)
+    with count_llm_calls() as usage:
+        reply, intent = orchestrator.handle("Hello there")
+    assert (reply, intent, usage.calls) == ("Hello from the assistant.", "fallback", 2)
@@ -0,0 +1,88 @@
+from langchain_community.chat_models.fake import FakeListChatModel
+
+from app.models.schemas import MenuQuery
+from app.orchestration.agents import MenuQATool
+from app.rag.cache import AnswerCache
+from app.rag.lexical import BM25Index, tokenize
+
+CHUNKS = [
+    "Truffle mushroom risotto with parmesan. Vegetarian.",
+    "Tiramisu with mascarpone and espresso. Contains eggs and dairy.",
+    "Margherita pizza with tomato, mozzarella and basil.",
+]
+
+
+class CountingRetriever:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = 0
+
+    def similarity_search(self, query, k=4):
+        self.calls += 1
+        return self.docs[:k]
+
+
+def _index():
+    index = BM25Index()
+    index.add_texts(CHUNKS, metadatas=[{"source": f"menu{i}"} for i in range(3)], ids=["a", "b", "c"])
+    return index
+
+
+def test_tokenize_drops_stopwords_and_folds_plurals():
+    assert tokenize("What allergens are in the Tiramisu?") == ["allergen", "tiramisu"]
+
+
+def test_bm25_ranking_coverage_and_roundtrip(tmp_path):
+    index = _index()
+    hits = index.search("is the tiramisu made with espresso")
+    assert hits[0].document.metadata == {"source": "menu1"}
+    assert hits[0].coverage == 1.0
+
+    index.save(tmp_path)
+    loaded = BM25Index.load(tmp_path)
+    assert [h.document.page_content for h in loaded.search("mozzarella")] == [CHUNKS[2]]
+
+    loaded.delete(["c"])
+    assert loaded.search("mozzarella") == []
+    assert len(loaded) == 2
+
+
+def test_menu_tool_reports_retrieval_path():
+    retriever = CountingRetriever([])
+    tool = MenuQATool(
+        retriever,
+        FakeListChatModel(responses=["ok"] * 3),
+        lexical_index=_index(),
+        lexical_min_coverage=0.75,
+    )
+    assert tool.answer(MenuQuery(question="Is the risotto vegetarian?")).retrieval == "lexical"
+    assert retriever.calls == 0
+    assert tool.answer(MenuQuery(question="Is the risotto spicy?")).retrieval == "hybrid"
+    assert tool.answer(MenuQuery(question="Any gluten free options?")).retrieval == "dense"
+    assert retriever.calls == 2
+    assert tool.retrieval_counts == {"lexical": 1, "hybrid": 1, "dense": 1}
+
+
+def test_lexical_hits_never_embed_with_answer_cache_on():
+    embedded = []
+
+    def embed_query(text):
+        embedded.append(text)
+        return [1.0, 0.0]
+
+    tool = MenuQATool(
+        CountingRetriever([]),
+        FakeListChatModel(responses=["ok"] * 3),
+        cache=AnswerCache(embed_fn=embed_query),
+        lexical_index=_index(),
+        lexical_min_coverage=0.75,
+    )
+    tool.answer(MenuQuery(question="Is the risotto vegetarian?"))
+    tool.answer(MenuQuery(question="Is the tiramisu made with espresso?"))  # miss, cache non-empty
+    assert "".join(tool.stream_answer(MenuQuery(question="Margherita with basil?"))) == "ok"
+    assert tool.answer(MenuQuery(question="is the risotto vegetarian")).retrieval == "cache"
+    assert embedded == []
+
+    # Dense retrieval embeds anyway; lookup and store reuse its vector via EmbeddingService.
+    tool.answer(MenuQuery(question="Any gluten free options?"))
+    assert embedded == ["Any gluten free options?"] * 2
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.schema import AIMessage
+
+from app.api import app, get_services
+from app.orchestration.agents import GeneralInfoTool, OrderAgent, ReservationAgent
+from app.orchestration.client import GuardedChatModel, ModelOverloadedError
+from app.orchestration.scheduler import LLMScheduler
+
+
+class BlockingModel:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def invoke(self, prompt):
+        self.release.wait(2)
+        return AIMessage(content="done")
+
+
+def _start(fn, *args):
+    thread = threading.Thread(target=fn, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_full_queue_fails_fast():
+    model = BlockingModel()
+    guarded = GuardedChatModel(model, max_concurrency=1, max_queue=1, queue_timeout=5, retry_after=3)
+    running = _start(guarded.invoke, "first")
+    time.sleep(0.05)
+    waiting = _start(guarded.invoke, "second")
+    time.sleep(0.05)
+
+    started = time.perf_counter()
+    with pytest.raises(ModelOverloadedError) as excinfo:
+        guarded.invoke("third")
+    assert time.perf_counter() - started < 0.5
+    assert excinfo.value.retry_after == 3
+
+    model.release.set()
+    running.join(1)
+    waiting.join(1)
+    assert guarded.invoke("fourth").content == "done"
+    assert guarded.rejected == 1
+
+
+def test_slot_wait_times_out():
+    model = BlockingModel()
+    guarded = GuardedChatModel(model, max_concurrency=1, max_queue=4, queue_timeout=0.1)
+    running = _start(guarded.invoke, "first")
+    time.sleep(0.05)
+    with pytest.raises(ModelOverloadedError, match="No LLM slot"):
+        guarded.invoke("second")
+    model.release.set()
+    running.join(1)
+
+
+def test_scheduler_backlog_is_bounded():
+    model = BlockingModel()
+    scheduler = LLMScheduler(model, max_parallel=1, max_queue=1)
+    threads = [_start(scheduler.invoke, "a")]
+    time.sleep(0.05)
+    threads.append(_start(scheduler.invoke, "b"))
+    time.sleep(0.05)
+    with pytest.raises(ModelOverloadedError):
+        scheduler.invoke("c")
+    model.release.set()
+    for thread in threads:
+        thread.join(1)
+    assert scheduler.stats().rejected == 1
+
+
+class OverloadedOrchestrator:
+    menu_tool = None
+
+    def handle(self, text):
+        raise ModelOverloadedError("LLM queue full (32 waiting)", retry_after=4)
+
+    def stream(self, text):
+        raise ModelOverloadedError("LLM queue full (32 waiting)", retry_after=4)
+
+
+def test_overload_maps_to_503_with_retry_after():
+    app.dependency_overrides[get_services] = lambda: (
+        OverloadedOrchestrator(),
+        ReservationAgent(),
+        OrderAgent(),
+        GeneralInfoTool(),
+        None,
+        None,
+        None,
+    )
+    try:
+        resp = TestClient(app).post("/voice", json={"text": "hello"})
+        stream = TestClient(app).post("/voice/stream", json={"text": "hello"})
+    finally:
+        app.dependency_overrides.clear()
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "4"
+    assert "queue full" in resp.json()["detail"]
+    # The SSE response has already started, so overload arrives as an event.
+    assert stream.text.startswith("event: error\n")
+    assert '"retry_after": 4' in stream.text
@@ -0,0 +1,125 @@
+import random
+import time
+
+import pytest
+from langchain.schema import AIMessage
+
+from app.orchestration.providers import ModelBackend, ModelRouter
+
+
+class LatencyModel:
+    """
+    Offline stand-in for a provider: latency drawn from `base` seconds with a
+    `stall` of `stall_seconds` at probability `stall_rate`.
+    """
+
+    def __init__(self, name, base=0.01, stall_rate=0.0, stall_seconds=1.0, fail=False, seed=0):
+        self.name = name
+        self.base = base
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.fail = fail
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def invoke(self, prompt):
+        self.calls += 1
+        stalled = self._random.random() < self.stall_rate
+        time.sleep(self.stall_seconds if stalled else self.base)
+        if self.fail:
+            raise ConnectionError(f"{self.name} unavailable")
+        return AIMessage(content=self.name)
+
+    def stream(self, prompt):
+        yield self.invoke(prompt)
+
+
+def _seed(backend, seconds, n=25):
+    for _ in range(n):
+        backend.record(seconds, True)
+
+
+def test_routes_to_fastest_healthy_backend():
+    slow = ModelBackend("ollama", LatencyModel("ollama"))
+    fast = ModelBackend("google", LatencyModel("google"))
+    router = ModelRouter([slow, fast])
+    # Unmeasured backends keep configuration order.
+    assert router.invoke("hi").content == "ollama"
+    _seed(slow, 0.8)
+    _seed(fast, 0.2)
+    assert [b.name for b in router.ranked()] == ["google", "ollama"]
+    assert router.invoke("hi").content == "google"
+
+
+def test_fails_over_and_marks_backend_unhealthy():
+    broken = ModelBackend("ollama", LatencyModel("ollama", fail=True))
+    backup = ModelBackend("google", LatencyModel("google"))
+    router = ModelRouter([broken, backup], cooldown_seconds=60)
+    assert router.invoke("hi").content == "google"
+    assert "".join(chunk.content for chunk in router.stream("hi")) == "google"
+    assert broken.error_rate == 1.0
+    assert [b.name for b in router.ranked()] == ["google", "ollama"]
+    stats = {s.name: s for s in router.stats()}
+    assert not stats["ollama"].healthy and stats["google"].healthy
+
+
+def test_all_backends_failing_raises_last_error():
+    router = ModelRouter(
+        [ModelBackend(name, LatencyModel(name, fail=True)) for name in ("ollama", "google")]
+    )
+    with pytest.raises(ConnectionError, match="google"):
+        router.invoke("hi")
+
+
+def test_hedge_beats_a_stalled_primary():
+    stalling = LatencyModel("ollama", base=0.01, stall_rate=1.0, stall_seconds=0.5)
+    primary = ModelBackend("ollama", stalling)
+    backup = ModelBackend("google", LatencyModel("google", base=0.02))
+    router = ModelRouter([primary, backup], hedge=True, hedge_min_delay_ms=20)
+    _seed(primary, 0.01)
+    _seed(backup, 0.05)
+
+    started = time.perf_counter()
+    assert router.invoke("hi").content == "google"
+    assert time.perf_counter() - started < 0.3
+    assert router.hedged == 1 and backup.hedges_won == 1
+
+
+def test_hedging_cuts_tail_latency():
+    # Primary stalls 10% of the time; p95 with hedging should stay far below
+    # the stall while most calls still go to the primary alone.
+    def run(hedge):
+        primary = ModelBackend(
+            "ollama", LatencyModel("ollama", base=0.005, stall_rate=0.1, stall_seconds=0.3, seed=3)
+        )
+        backup = ModelBackend("google", LatencyModel("google", base=0.02, seed=4))
+        router = ModelRouter([primary, backup], hedge=hedge, hedge_percentile=80, hedge_min_delay_ms=10)
+        _seed(primary, 0.005)
+        _seed(backup, 0.05)
+        latencies = []
+        for _ in range(40):
+            started = time.perf_counter()
+            router.invoke("hi")
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        return latencies[int(0.95 * (len(latencies) - 1))], router.hedged
+
+    baseline_p95, _ = run(hedge=False)
+    hedged_p95, hedges = run(hedge=True)
+    assert baseline_p95 >= 0.3
+    assert hedged_p95 < 0.1
+    assert hedges < 20
+
+
+def test_hedge_skips_unhealthy_runner_up():
+    primary = ModelBackend("ollama", LatencyModel("ollama", stall_rate=1.0, stall_seconds=0.1))
+    broken = ModelBackend("google", LatencyModel("google", fail=True))
+    router = ModelRouter([primary, broken], hedge=True, hedge_min_delay_ms=20, cooldown_seconds=60)
+    _seed(primary, 0.01)
+    _seed(broken, 0.005)
+    for _ in range(30):
+        broken.record(0.005, False)
+
+    # The only runner-up is failing, so the call is simply not hedged.
+    assert router.invoke("hi").content == "ollama"
+    assert router.hedged == 0 and broken.model.calls == 0
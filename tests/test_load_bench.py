@@ -0,0 +1,26 @@
+import json
+
+from benchmarks.bench_load import compare, main
+
+
+def test_load_harness_runs_offline_and_flags_regressions(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    args = ["--concurrency", "1", "4", "--requests", "10", "--warmup", "1", "--no-fsync"]
+    args += ["--stt-ms", "0", "--llm-ms", "1", "--tts-ms", "0", "--retriever-ms", "0"]
+    assert main([*args, "--save", str(baseline)]) == 0
+
+    saved = json.loads(baseline.read_text())
+    results = saved["results"]
+    assert saved["meta"]["config"]["llm_ms"] == 1
+    assert {(r["endpoint"], r["concurrency"]) for r in results} == {
+        (endpoint, level)
+        for endpoint in ("/voice", "/menu/qa", "/order", "/reservation", "/info")
+        for level in (1, 4)
+    }
+    assert all(r["errors"] == 0 and r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"] for r in results)
+
+    slower = [{**r, "throughput": r["throughput"] / 2, "p95_ms": r["p95_ms"] + 50} for r in results]
+    assert all(r["regression"] for r in compare(slower, results, tolerance=0.15))
+    fast = {"endpoint": "/info", "concurrency": 1, "errors": 0, "throughput": 1000.0, "p95_ms": 0.8}
+    jitter = {**fast, "p95_ms": 1.2}  # +50%, but well under the noise floor
+    assert compare([jitter], [fast], tolerance=0.15)[0]["regression"] is False
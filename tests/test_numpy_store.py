@@ -0,0 +1,37 @@
+from app.rag.numpy_store import NumpyVectorStore
+
+
+def test_add_search_delete_and_persist(tmp_path, keyword_embeddings):
+    store = NumpyVectorStore(str(tmp_path), keyword_embeddings)
+    store.add_texts(
+        ["risotto with mushrooms", "tiramisu dessert", "espresso coffee"],
+        metadatas=[{"source": "mains"}, {"source": "desserts"}, {"source": "drinks"}],
+        ids=["a", "b", "c"],
+    )
+    assert store.similarity_search("tiramisu please", k=1)[0].metadata == {"source": "desserts"}
+
+    store.persist()
+    reader = NumpyVectorStore(str(tmp_path), keyword_embeddings)
+    results = reader.similarity_search("espresso", k=2)
+    assert [doc.page_content for doc in results][0] == "espresso coffee"
+    assert len(results) == 2
+
+    store.delete(ids=["c"])
+    store.add_texts(["vegan risotto"], ids=["a"])
+    store.persist()
+    # The reader notices the rewritten file on its next query.
+    assert reader.count() == 3
+    assert [doc.page_content for doc in reader.similarity_search("espresso", k=5)] == [
+        "vegan risotto",
+        "tiramisu dessert",
+    ]
+
+
+def test_delete_collection(tmp_path, keyword_embeddings):
+    store = NumpyVectorStore(str(tmp_path), keyword_embeddings)
+    store.add_texts(["risotto"], ids=["a"])
+    store.persist()
+    store.delete_collection()
+    assert store.count() == 0
+    assert store.similarity_search("risotto") == []
+    assert list(tmp_path.iterdir()) == []
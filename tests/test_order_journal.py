@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.models.schemas import OrderItem
+from app.orchestration.orders import OrderJournal
+
+
+def _items(*pairs):
+    return [OrderItem(item=name, quantity=quantity) for name, quantity in pairs]
+
+
+def test_aggregates_follow_placed_and_done_orders():
+    journal = OrderJournal()
+    first = journal.place("4", _items(("Margherita", 2), ("Tiramisu", 1)))
+    journal.place("7", _items(("margherita ", 1)))
+    assert journal.open_by_dish() == {"margherita": 3, "tiramisu": 1}
+    assert journal.open_by_table() == {"4": 3, "7": 1}
+
+    assert journal.complete(first.reference).table == "4"
+    assert journal.complete(first.reference) is None
+    assert journal.open_by_dish() == {"margherita": 1}
+    assert [ticket.table for ticket in journal.queue()] == ["7"]
+
+
+def test_concurrent_orders_share_fsyncs(tmp_path):
+    journal = OrderJournal(tmp_path / "orders.log", commit_window_ms=5)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        tickets = list(pool.map(lambda i: journal.place(str(i % 4), _items(("soup", 1))), range(64)))
+    stats = journal.stats()
+    journal.close()
+    assert len({ticket.reference for ticket in tickets}) == 64
+    assert stats.records == 64 and stats.open_orders == 64
+    assert stats.fsyncs < 32  # grouped, not one per order
+    assert len((tmp_path / "orders.log").read_bytes().splitlines()) == 64
+
+
+def test_recovery_replays_log_tail_after_snapshot(tmp_path):
+    path = tmp_path / "orders.log"
+    journal = OrderJournal(path, snapshot_every=10, commit_window_ms=0)
+    tickets = [journal.place("1", _items(("pasta", 1))) for _ in range(25)]
+    for ticket in tickets[:5]:
+        journal.complete(ticket.reference)
+    journal.close()
+
+    recovered = OrderJournal(path, snapshot_every=10, commit_window_ms=0)
+    stats = recovered.stats()
+    assert stats.snapshot_seq == 30
+    assert stats.recovered_records == 0  # the last snapshot covers the whole log
+    assert recovered.open_by_dish() == {"pasta": 20}
+    assert recovered.place("1", []).reference == "ORD-0026"
+    recovered.close()
+
+    with open(path, "ab") as handle:  # crash mid-write
+        handle.write(b'{"type":"placed","tic')
+    again = OrderJournal(path, snapshot_every=10, commit_window_ms=0)
+    assert again.stats().recovered_records == 1
+    assert len(again.queue()) == 21
+    again.place("2", _items(("salad", 1)))
+    again.close()
+    assert len(OrderJournal(path).queue()) == 22
+
+
+def test_failed_write_is_cut_off_the_log(tmp_path, monkeypatch):
+    import app.orchestration.orders as orders
+
+    path = tmp_path / "orders.log"
+    journal = OrderJournal(path, commit_window_ms=0)
+    journal.place("1", _items(("soup", 1)))
+
+    def broken_fsync(fd):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(orders.os, "fsync", broken_fsync)
+        with pytest.raises(OSError):
+            journal.place("2", _items(("pasta", 1)))  # written and flushed, never acknowledged
+    journal.place("3", _items(("salad", 1)))
+    journal.close()
+
+    recovered = OrderJournal(path)
+    assert [ticket.table for ticket in recovered.queue()] == ["1", "3"]
+    assert recovered.stats().recovered_records == 2
+    recovered.close()
+
+
+def test_concurrent_completes_journal_one_done(tmp_path):
+    journal = OrderJournal(tmp_path / "orders.log", commit_window_ms=20)
+    reference = journal.place("4", _items(("soup", 1))).reference
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: journal.complete(reference), range(8)))
+    journal.close()
+    assert sum(result is not None for result in results) == 1
+    records = (tmp_path / "orders.log").read_bytes().splitlines()
+    assert sum(b'"type":"done"' in line for line in records) == 1
+
+
+def test_failed_snapshot_keeps_the_writer_running(tmp_path, monkeypatch):
+    path = tmp_path / "orders.log"
+    journal = OrderJournal(path, snapshot_every=1, commit_window_ms=0)
+
+    def broken_snapshot(seq):
+        raise OSError("no space left on device")
+
+    monkeypatch.setattr(journal, "_snapshot", broken_snapshot)
+    journal.place("1", _items(("soup", 1)))
+    assert journal.place("2", _items(("pasta", 1))).reference == "ORD-0002"
+    journal.close()
+    assert len(OrderJournal(path).queue()) == 2
+
+
+def test_dead_writer_fails_waiting_callers(tmp_path, monkeypatch):
+    journal = OrderJournal(tmp_path / "orders.log", commit_window_ms=0)
+
+    def crash(batch):
+        raise SystemError("writer bug")
+
+    monkeypatch.setattr(journal, "_commit", crash)
+    with pytest.raises(SystemError):
+        journal.place("1", _items(("soup", 1)))
+    with pytest.raises(RuntimeError, match="unwritable"):
+        journal.place("2", _items(("soup", 1)))
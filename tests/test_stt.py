@@ -0,0 +1,57 @@
+import io
+import threading
+import time
+import wave
+
+import numpy as np
+import pytest
+
+from app.orchestration.client import ModelOverloadedError
+from app.speech.stt import TranscriptionWorker, pcm_from_bytes, silence_wav
+
+
+def _wav(samples: np.ndarray, rate: int, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes((samples * 32767).astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+def test_wav_is_decoded_in_memory_to_mono_float32():
+    tone = np.sin(np.linspace(0, 40, 8000)).astype(np.float32) * 0.5
+    stereo = np.repeat(tone, 2)  # interleaved L/R
+    audio = pcm_from_bytes(_wav(stereo, 8000, channels=2), 16000)
+    assert audio.dtype == np.float32
+    assert audio.size == 16000
+    assert np.abs(audio[::2] - tone).max() < 0.01
+    assert pcm_from_bytes(silence_wav(0.5, 16000), 16000).size == 8000
+
+
+def test_headerless_bytes_are_raw_pcm():
+    raw = (np.array([0.0, 0.5, -0.5]) * 32768).astype(np.int16).tobytes()
+    assert pcm_from_bytes(raw, 16000).tolist() == [0.0, 0.5, -0.5]
+    assert pcm_from_bytes(b"", 16000).size == 0
+
+
+def test_worker_serves_in_order_and_refuses_when_full():
+    release = threading.Event()
+    order = []
+
+    def transcribe(audio):
+        release.wait(2)
+        order.append(int(audio[0]))
+        return f"utterance {int(audio[0])}"
+
+    worker = TranscriptionWorker(transcribe, queue_size=2)
+    futures = [worker.submit(np.array([0.0]))]
+    while worker.queue_depth:  # first one picked up by the worker
+        time.sleep(0.005)
+    futures += [worker.submit(np.array([float(i)])) for i in (1, 2)]
+    with pytest.raises(ModelOverloadedError):
+        worker.submit(np.array([3.0]))
+    release.set()
+    assert [f.result(2) for f in futures] == ["utterance 0", "utterance 1", "utterance 2"]
+    assert order == [0, 1, 2]
@@ -0,0 +1,118 @@
+import os
+import time
+
+from app.orchestration.agents import (
+    FALLBACK_REPLY,
+    AssistantOrchestrator,
+    GeneralInfoTool,
+    OrderAgent,
+    ReservationAgent,
+)
+from app.orchestration.router import IntentRouter
+from app.speech.cache import CachedTTS, tts_cache_key
+from app.speech.stt import silence_wav
+from app.speech.tts import TextToSpeech
+
+
+class SlowTTS(TextToSpeech):
+    """
+    Stand-in for pyttsx3: every synthesis takes `seconds` and returns a WAV.
+    """
+
+    def __init__(self, seconds=0.02):
+        self.seconds = seconds
+        self.calls = []
+
+    def synthesize(self, text):
+        self.calls.append(text)
+        time.sleep(self.seconds)
+        return silence_wav(0.1, 16000)
+
+
+def _orchestrator():
+    return AssistantOrchestrator(
+        router=IntentRouter(),
+        model=None,
+        menu_tool=None,
+        reservation_agent=ReservationAgent(),
+        order_agent=OrderAgent(),
+        general_tool=GeneralInfoTool(),
+    )
+
+
+def test_key_depends_on_text_voice_and_rate():
+    key = tts_cache_key("Hello.", "en", 16000)
+    assert key == tts_cache_key(" Hello. ", "en", 16000)
+    assert key != tts_cache_key("Hello.", "fr", 16000)
+    assert key != tts_cache_key("Hello.", "en", 22050)
+
+
+def test_memory_tier_serves_repeats_and_evicts_lru():
+    backend = SlowTTS()
+    tts = CachedTTS(backend, voice="en", memory_entries=2)
+    first = tts.synthesize("One.")
+    assert tts.synthesize("One.") == first
+    tts.synthesize("Two.")
+    tts.synthesize("Three.")
+    tts.synthesize("One.")
+    assert backend.calls == ["One.", "Two.", "Three.", "One."]
+    stats = tts.stats()
+    assert (stats.memory_hits, stats.misses, stats.evictions, stats.size) == (1, 4, 2, 2)
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    tts = CachedTTS(SlowTTS(), voice="en", cache_dir=tmp_path)
+    audio = tts.synthesize(FALLBACK_REPLY)
+    assert len(list(tmp_path.rglob("*.wav"))) == 1
+
+    backend = SlowTTS()
+    restarted = CachedTTS(backend, voice="en", cache_dir=tmp_path)
+    assert restarted.synthesize(FALLBACK_REPLY) == audio
+    assert backend.calls == [] and restarted.stats().disk_hits == 1
+
+
+def test_disk_tier_prunes_least_recently_used_clips(tmp_path):
+    clip = len(silence_wav(0.1, 16000))
+    tts = CachedTTS(SlowTTS(), voice="en", memory_entries=0, cache_dir=tmp_path, disk_bytes=int(clip * 2.3))
+    tts.synthesize("One.")
+    tts.synthesize("Two.")
+    for path in tmp_path.rglob("*.wav"):
+        os.utime(path, (time.time() - 60, time.time() - 60))
+    tts.synthesize("One.")  # a disk hit refreshes the clip
+    tts.synthesize("Three.")
+
+    def cached(text):
+        return tts._path(tts_cache_key(text, "en", 16000)).exists()
+
+    assert (cached("One."), cached("Two."), cached("Three.")) == (True, False, True)
+    stats = tts.stats()
+    assert (stats.disk_hits, stats.disk_evictions, stats.disk_bytes) == (1, 1, 2 * clip)
+
+
+def test_text_fallback_is_not_cached(tmp_path):
+    class BrokenTTS(TextToSpeech):
+        def synthesize(self, text):
+            return text.encode("utf-8")
+
+    tts = CachedTTS(BrokenTTS(), cache_dir=tmp_path)
+    tts.synthesize("Hello.")
+    tts.synthesize("Hello.")
+    assert tts.stats().misses == 2 and not list(tmp_path.rglob("*.wav"))
+
+
+def test_prewarmed_static_replies_skip_synthesis():
+    orchestrator = _orchestrator()
+    backend = SlowTTS(seconds=0.05)
+    tts = CachedTTS(backend, voice="en")
+    assert tts.prewarm(orchestrator.static_replies()) >= len(orchestrator.static_replies())
+    warmed = len(backend.calls)
+
+    reply, intent = orchestrator.handle("hello there")
+    assert (reply, intent) == (FALLBACK_REPLY, "fallback")
+    started = time.perf_counter()
+    tts.synthesize(reply)
+    assert time.perf_counter() - started < 0.01
+    hours = orchestrator.general_tool.info_map["hours"]
+    assert tts.synthesize(hours)
+    assert len(backend.calls) == warmed
+    assert tts.stats().hit_rate == 1.0
@@ -0,0 +1,90 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+
+from app.speech.pool import SynthesisPool
+
+
+class SleepEngine:
+    """
+    Stand-in for a pyttsx3 engine (built inside each worker process): takes
+    `seconds` per text, like runAndWait() blocking on the speech driver.
+    """
+
+    voice = "test-voice"
+
+    def __init__(self, seconds=0.1, fail_on=None):
+        self.seconds = seconds
+        self.fail_on = fail_on
+
+    def __call__(self, text):
+        if text == self.fail_on:
+            raise ValueError("cannot say that")
+        if text == "hang":
+            time.sleep(60)
+        time.sleep(self.seconds)
+        return b"RIFF" + f"{os.getpid()}:{text}".encode()
+
+
+def _throughput(workers, requests=16, seconds=0.1):
+    pool = SynthesisPool(partial(SleepEngine, seconds), workers=workers, queue_size=requests)
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=requests) as clients:
+            results = list(clients.map(pool.synthesize, [f"line {i}" for i in range(requests)]))
+        elapsed = time.perf_counter() - started
+        pids = {result.split(b":")[0] for result in results}
+        return requests / elapsed, len(pids), pool.stats()
+    finally:
+        pool.close()
+
+
+def test_throughput_scales_with_worker_count():
+    single, single_pids, _ = _throughput(1)
+    quad, quad_pids, stats = _throughput(4)
+    assert (single_pids, quad_pids) == (1, 4)
+    assert quad > 2.5 * single
+    assert stats.completed == 16 and stats.busy == stats.waiting == 0
+
+
+def test_audio_comes_back_in_memory_with_engine_voice():
+    pool = SynthesisPool(SleepEngine, workers=1)
+    try:
+        assert pool.voice == "test-voice"
+        assert pool.synthesize("hello").endswith(b":hello")
+    finally:
+        pool.close()
+
+
+def test_full_queue_is_rejected():
+    # Imported here: worker processes import this module and should stay light.
+    from app.orchestration.client import ModelOverloadedError
+
+    pool = SynthesisPool(partial(SleepEngine, 0.3), workers=1, queue_size=0)
+    try:
+        with ThreadPoolExecutor(max_workers=2) as clients:
+            first = clients.submit(pool.synthesize, "one")
+            time.sleep(0.1)
+            with pytest.raises(ModelOverloadedError):
+                pool.synthesize("two")
+            assert first.result()
+        assert pool.stats().rejected == 1
+    finally:
+        pool.close()
+
+
+def test_engine_errors_surface_and_hung_workers_are_replaced():
+    pool = SynthesisPool(partial(SleepEngine, 0.0, "boom"), workers=1, timeout=0.5)
+    try:
+        with pytest.raises(RuntimeError, match="cannot say that"):
+            pool.synthesize("boom")
+        with pytest.raises(TimeoutError):
+            pool.synthesize("hang")
+        assert pool.synthesize("after").endswith(b":after")
+        stats = pool.stats()
+        assert (stats.failed, stats.timeouts, stats.restarts) == (2, 1, 1)
+    finally:
+        pool.close()
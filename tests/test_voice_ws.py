@@ -0,0 +1,191 @@
+import asyncio
+import gc
+import io
+import time
+import wave
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import _finish_utterance, app, get_services, voice_ws
+from app.concurrency import StageExecutor
+from app.config import Settings
+from app.orchestration.agents import (
+    AssistantOrchestrator,
+    GeneralInfoTool,
+    OrderAgent,
+    ReservationAgent,
+)
+from app.orchestration.router import IntentRouter
+from app.speech.stt import SpeechToText, pcm_from_bytes
+from app.speech.tts import NullTTS
+from app.speech.vad import SpeechSegmenter
+
+RATE = 16000
+SENTENCE = "I would like to book a table for two tonight".split()
+
+
+@pytest.fixture
+def utterance_wav(tmp_path):
+    """
+    Recorded-style fixture: room noise, 1.6 s of voiced audio, then silence.
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(1.6 * RATE)) / RATE
+    voiced = 0.3 * np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    signal = np.concatenate([np.zeros(int(0.5 * RATE)), voiced, np.zeros(int(0.9 * RATE))])
+    signal += rng.normal(0, 0.002, signal.size)
+    path = tmp_path / "utterance.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes((signal * 32767).astype(np.int16).tobytes())
+    return path
+
+
+def _pcm_chunks(path, chunk_ms=100):
+    with wave.open(str(path)) as wav:
+        frames = wav.readframes(wav.getnframes())
+    step = RATE * chunk_ms // 1000 * 2
+    return [frames[i : i + step] for i in range(0, len(frames), step)]
+
+
+class ProgressiveSTT(SpeechToText):
+    """
+    Stub recognizer: reveals one more word of SENTENCE per 150 ms of audio.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        self.calls += 1
+        seconds = pcm_from_bytes(audio_bytes, RATE).size / RATE
+        return " ".join(SENTENCE[: int(seconds / 0.15)])
+
+
+def test_segmenter_endpoints_the_fixture(utterance_wav):
+    segmenter = SpeechSegmenter(sample_rate=RATE)
+    events = []
+    for chunk in _pcm_chunks(utterance_wav):
+        events.extend(segmenter.feed(chunk))
+    assert events[0] == "start" and events[-1] == "end"
+    assert events.count("end") == 1 and "partial" in events
+    seconds = pcm_from_bytes(segmenter.take_utterance(), RATE).size / RATE
+    assert 1.6 < seconds < 2.4  # speech plus preroll and trailing silence
+
+
+def test_short_clicks_are_not_utterances():
+    segmenter = SpeechSegmenter(sample_rate=RATE)
+    click = (np.full(int(0.06 * RATE), 0.5) * 32767).astype(np.int16).tobytes()
+    silence = bytes(2 * RATE)
+    assert segmenter.feed(click + silence) == ["start"]
+    assert segmenter.flush() == []
+
+
+def test_voice_websocket_streams_partials_then_reply(utterance_wav):
+    stt = ProgressiveSTT()
+    orchestrator = AssistantOrchestrator(
+        router=IntentRouter(),
+        model=None,
+        menu_tool=None,
+        reservation_agent=ReservationAgent(),
+        order_agent=OrderAgent(),
+        general_tool=GeneralInfoTool(),
+    )
+    app.dependency_overrides[get_services] = lambda: (
+        orchestrator,
+        ReservationAgent(),
+        OrderAgent(),
+        GeneralInfoTool(),
+        stt,
+        NullTTS(),
+        None,
+    )
+    messages = []
+    try:
+        with TestClient(app).websocket_connect("/voice/ws") as ws:
+            for chunk in _pcm_chunks(utterance_wav):
+                ws.send_bytes(chunk)
+                time.sleep(0.01)  # real-time-ish pacing lets partials run
+            while not messages or messages[-1].get("type") != "reply":
+                messages.append(ws.receive_json())
+            audio = ws.receive_bytes()
+    finally:
+        app.dependency_overrides.clear()
+
+    types = [message["type"] for message in messages]
+    assert types[0] == "speech_start"
+    assert "partial" in types
+    assert types[-2:] == ["final", "reply"]
+    final, reply = messages[-2], messages[-1]
+    assert final["text"] == " ".join(SENTENCE)
+    assert reply["intent"] == "reservation"
+    assert reply["speculative_route"] is True
+    assert reply["llm_calls"] == 0
+    assert audio == reply["text"].encode("utf-8")
+
+
+def test_unused_speculative_route_is_not_orphaned(utterance_wav):
+    class FailingRouter:
+        def route(self, text):
+            raise RuntimeError("router down")
+
+    class Orchestrator:
+        router = FailingRouter()
+
+    class SilentSTT(SpeechToText):
+        def transcribe(self, audio_bytes):
+            time.sleep(0.05)  # the speculative route fails meanwhile
+            return ""
+
+    class Socket:
+        async def send_json(self, data):
+            pass
+
+    async def utterance():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context["message"]))
+        executor = StageExecutor(Settings())
+        await _finish_utterance(Socket(), b"", "book a table", Orchestrator(), SilentSTT(), None, executor)
+        await asyncio.sleep(0.05)
+        gc.collect()
+        return errors
+
+    assert asyncio.run(utterance()) == []
+
+    class FailingSTT(SpeechToText):
+        def transcribe(self, audio_bytes):
+            time.sleep(0.05)  # still running when the client hangs up
+            raise RuntimeError("stt down")
+
+    class HangingUpSocket:
+        def __init__(self):
+            # Enough speech for a partial pass, then a disconnect mid-utterance.
+            chunks = _pcm_chunks(utterance_wav)[:12]
+            self.messages = [{"type": "websocket.receive", "bytes": chunk} for chunk in chunks]
+            self.messages.append({"type": "websocket.disconnect"})
+
+        async def accept(self):
+            pass
+
+        async def receive(self):
+            await asyncio.sleep(0.005)
+            return self.messages.pop(0)
+
+        async def send_json(self, data):
+            pass
+
+    async def hang_up():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context["message"]))
+        executor = StageExecutor(Settings())
+        services = (Orchestrator(), None, None, None, FailingSTT(), None, None)
+        await voice_ws(HangingUpSocket(), Settings(), services, executor)
+        await asyncio.sleep(0.1)
+        gc.collect()
+        return errors
+
+    assert asyncio.run(hang_up()) == []
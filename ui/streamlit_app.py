@@ -1,6 +1,7 @@
 import base64
 import json
 import os
+from urllib.parse import unquote
 from datetime import date, time
 
 import requests
@@ -18,6 +19,37 @@ def call_api(path: str, payload: dict):
     return resp.json()
 
 
+def stream_api(path: str, payload: dict):
+    """
+    Yield (event, data) pairs from a server-sent events endpoint.
+    """
+    url = f"{BACKEND_URL}{path}"
+    with requests.post(url, json=payload, stream=True, timeout=60) as resp:
+        resp.raise_for_status()
+        event = None
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: ") and event:
+                yield event, json.loads(line[len("data: "):])
+                event = None
+
+
+def post_audio(path: str, audio_bytes: bytes):
+    """
+    Send raw WAV bytes; the reply audio is the response body and the text
+    comes back in headers.
+    """
+    url = f"{BACKEND_URL}{path}"
+    resp = requests.post(url, data=audio_bytes, headers={"Content-Type": "audio/wav"}, timeout=60)
+    resp.raise_for_status()
+    meta = {
+        key: unquote(resp.headers.get(key, ""))
+        for key in ("X-Transcript", "X-Reply-Text", "X-Intent")
+    }
+    return meta, resp.content
+
+
 def render_audio(audio_base64: str):
     if not audio_base64:
         return
@@ -39,19 +71,39 @@ with col_voice:
     if "history" not in st.session_state:
         st.session_state.history = []
 
-    if st.button("Send", use_container_width=True):
-        audio_b64 = None
-        if audio_file:
-            audio_b64 = base64.b64encode(audio_file.read()).decode("utf-8")
-        payload = {"text": text_input, "audio_base64": audio_b64}
+    send = st.button("Send", use_container_width=True)
+    if send and audio_file:
+        try:
+            meta, audio_bytes = post_audio("/voice/audio", audio_file.read())
+            st.success(f"Intent: {meta['X-Intent']}")
+            st.write(meta["X-Reply-Text"])
+            if audio_bytes.startswith(b"RIFF"):
+                st.audio(audio_bytes, format="audio/wav")
+            st.session_state.history.append(
+                {"user": meta["X-Transcript"] or "voice message", "assistant": meta["X-Reply-Text"]}
+            )
+        except Exception as exc:
+            st.error(f"Voice request failed: {exc}")
+    elif send:
+        payload = {"text": text_input}
         try:
-            data = call_api("/voice", payload)
+            intent_box = st.empty()
+            reply_box = st.empty()
+            reply = ""
+            for event, data in stream_api("/voice/stream", payload):
+                if event == "intent":
+                    intent_box.success(f"Intent: {data.get('intent')}")
+                elif event == "token":
+                    reply += data["text"]
+                    reply_box.write(reply)
+                elif event == "audio":
+                    render_audio(data.get("audio_base64"))
+                elif event == "done":
+                    reply = data["text"]
+                    reply_box.write(reply)
             st.session_state.history.append(
-                {"user": text_input or "voice message", "assistant": data["text"]}
+                {"user": text_input or "voice message", "assistant": reply}
             )
-            st.success(f"Intent: {data.get('intent')}")
-            st.write(data["text"])
-            render_audio(data.get("audio_base64"))
         except Exception as exc:
             st.error(f"Voice request failed: {exc}")
 